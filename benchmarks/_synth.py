@@ -0,0 +1,195 @@
+"""Generates synthetic nextjs pages for the benchmarks, like
+`njsparser.testing.synth` (from which it is copied), without importing
+njsparser, so that the benchmarks can run at any commit.
+"""
+
+from typing import Any
+import random
+import base64
+import orjson
+
+_default_mix: dict[str, float] = {
+    "Module": 30,
+    "HintPreload": 8,
+    "Text": 2,
+    "Error": 1,
+    "Data": 15,
+    "DataContainer": 15,
+    "DataParent": 10,
+    "HTMLElement": 15,
+    "SpecialData": 2,
+    "EmptyData": 1,
+    "URLQuery": 1,
+}
+_value_classes = {"Module": "I", "HintPreload": "HL", "Text": "T", "Error": "E"}
+# The classes that can be nested in containers and parents.
+_nested = ("HTMLElement", "Data", "DataParent", "DataContainer", "SpecialData", "EmptyData", "URLQuery")
+_leaves = ("HTMLElement", "Data", "SpecialData", "EmptyData", "URLQuery")
+_words = (
+    "next", "react", "page", "layout", "user", "profile", "server", "client",
+    "static", "chunk", "data", "flight", "stream", "props", "title", "link",
+)
+_unicode_words = (
+    "café", "naïve", "Straße", "Жизнь", "Ελληνικά", "中文字符", "日本語",
+    "한국어", "עברית", "العربية", "🙂", "🚀✨", "👩‍💻",
+)
+_tags = ("div", "span", "a", "p", "section", "li", "ul", "img", "button", "h2")
+_specials = ("$Sreact.suspense", "$Sreact.fragment", "$undefined", "$@1", "$D2024-01-01")
+
+class _Generator:
+    def __init__(self, rng: random.Random, unicode: float):
+        self.rng = rng
+        self.unicode = unicode
+
+    def word(self) -> str:
+        if self.unicode and self.rng.random() < self.unicode:
+            return self.rng.choice(_unicode_words)
+        return self.rng.choice(_words)
+
+    def text(self, words: int) -> str:
+        return " ".join(self.word() for _ in range(words))
+
+    def hash(self, length: int = 16) -> str:
+        return "%0*x" % (length, self.rng.getrandbits(length * 4))
+
+    def ref(self) -> str:
+        return f"$L{self.rng.randrange(1, 0x1000):x}"
+
+    def props(self) -> dict[str, Any]:
+        props = {"className": self.text(2)}
+        if self.rng.random() < .5:
+            props["children"] = self.text(self.rng.randrange(1, 12))
+        if self.rng.random() < .3:
+            props["href"] = f"/{self.word()}/{self.hash(8)}"
+        return props
+
+    def value(self, cls: str, depth: int) -> Any:
+        "Gives a value that resolves to the given class."
+        rng = self.rng
+        if cls == "Module":
+            chunks = []
+            for _ in range(rng.randrange(1, 4)):
+                chunks += [str(rng.randrange(100, 99999)), f"static/chunks/{rng.randrange(100, 9999)}-{self.hash()}.js"]
+            if rng.random() < .5:
+                return [rng.randrange(1, 99999), chunks, rng.choice(("default", "", "*"))]
+            return {
+                "id": str(rng.randrange(1, 99999)),
+                "chunks": [f"{chunks[x]}:{chunks[x + 1]}" for x in range(0, len(chunks), 2)],
+                "name": rng.choice(("default", "", "*")),
+                "async": rng.random() < .5,
+            }
+        elif cls == "HintPreload":
+            if rng.random() < .5:
+                return [f"/_next/static/css/{self.hash()}.css", "style"]
+            return [
+                f"/_next/static/media/{self.hash()}-s.p.woff2",
+                "font",
+                {"crossOrigin": "", "type": "font/woff2"},
+            ]
+        elif cls == "Text":
+            # Texts can contain anything, including html and newlines followed
+            # by something looking like the start of a row.
+            lines = [self.text(rng.randrange(1, 40)) for _ in range(rng.randrange(1, 6))]
+            if rng.random() < .3:
+                lines.append(f"<p>{self.text(8)}</p></script>")
+            if rng.random() < .3:
+                lines.append(f'{rng.randrange(1, 0x100):x}:["$","div",null,{{}}]')
+            return "\n".join(lines)
+        elif cls == "Error":
+            return {"digest": rng.choice(("NEXT_NOT_FOUND", str(rng.randrange(10 ** 9))))}
+        elif cls == "Data":
+            if rng.random() < .1:
+                return ["$", self.ref(), None, None]
+            return ["$", self.ref(), None, self.props()]
+        elif cls == "HTMLElement":
+            key = None if rng.random() < .7 else self.hash(4)
+            props = self.props()
+            if depth > 0 and rng.random() < .5:
+                props["children"] = [
+                    self.value("HTMLElement", depth - 1)
+                    for _ in range(rng.randrange(1, 4))
+                ]
+            return ["$", rng.choice(_tags), key, props]
+        elif cls == "DataParent":
+            return ["$", self.ref(), None, {"children": self.nested(depth - 1)}]
+        elif cls == "DataContainer":
+            return [self.nested(depth - 1) for _ in range(rng.randrange(1, 5))]
+        elif cls == "SpecialData":
+            return rng.choice(_specials)
+        elif cls == "EmptyData":
+            return None
+        elif cls == "URLQuery":
+            return [self.word(), self.hash(8), "d"]
+        else:
+            raise ValueError(f"Cannot generate a row giving a `{cls}`.")
+
+    def nested(self, depth: int) -> Any:
+        return self.value(self.rng.choice(_nested if depth > 0 else _leaves), depth)
+
+def _script(segment: list) -> str:
+    # Like react does, `<` is escaped so that the script cannot be closed by
+    # its content.
+    payload = orjson.dumps(segment).decode().replace("<", "\\u003c")
+    return f"<script>self.__next_f.push({payload})</script>"
+
+def generate(
+    *,
+    size: int,
+    seed: int | None = None,
+    depth: int = 3,
+    binary: float = 0.,
+    unicode: float = 0.,
+    chunk_size: int = 2048,
+) -> str:
+    """Generates the html of a nextjs page of about `size` characters, whose
+    flight data has its payload at index 0, followed by rows of the default
+    mix (see `njsparser.testing.synth.generate`)."""
+    rng = random.Random(seed)
+    generator = _Generator(rng=rng, unicode=unicode)
+    population, weights = list(_default_mix), list(_default_mix.values())
+
+    build_id = generator.hash(21)
+    head = (
+        '<!DOCTYPE html><html lang="en"><head><meta charSet="utf-8"/>'
+        f'<link rel="stylesheet" href="/_next/static/css/{generator.hash()}.css"/>'
+        f'<script src="/_next/static/chunks/webpack-{generator.hash()}.js" async=""></script>'
+        f'<script src="/_next/static/chunks/main-app-{generator.hash()}.js" async=""></script>'
+        '</head><body><div id="__next"></div>'
+    )
+    payload = {
+        "P": None,
+        "b": build_id,
+        "p": "",
+        "c": ["", ""],
+        "i": False,
+        "f": [[["", {"children": ["__PAGE__", {}]}, "$undefined", "$undefined", True]]],
+        "m": "$undefined",
+        "G": ["$5", []],
+        "s": False,
+        "S": True,
+    }
+    flight_data = ["0:" + orjson.dumps(payload).decode() + "\n"]
+    length, index = len(head) + len(flight_data[0]), 1
+    while length < size:
+        cls = rng.choices(population, weights)[0]
+        value = generator.value(cls, depth)
+        if cls == "Text":
+            row = f"{index:x}:T{len(value.encode()):x},{value}"
+        else:
+            row = f"{index:x}:{_value_classes.get(cls, '')}{orjson.dumps(value).decode()}\n"
+        flight_data.append(row)
+        length += len(row)
+        index += 1
+    flight_data = "".join(flight_data)
+
+    html = [head, "<script>(self.__next_f=self.__next_f||[]).push([0])</script>"]
+    # Rows are split across the scripts, like in real pages (3 and 1 are
+    # `Segment.is_binary` and `Segment.is_not_bootstrap`).
+    for start in range(0, len(flight_data), chunk_size):
+        chunk = flight_data[start:start + chunk_size]
+        if binary and rng.random() < binary:
+            html.append(_script([3, base64.b64encode(chunk.encode()).decode()]))
+        else:
+            html.append(_script([1, chunk]))
+    html.append("</body></html>")
+    return "".join(html)
@@ -0,0 +1,76 @@
+"""Benchmarks the construction of flight data elements: how many elements
+per second `resolve_type` makes, and how many bytes each of them takes.
+
+```
+$ python benchmarks/bench_elements.py
+```
+"""
+
+from pathlib import Path
+import time
+import tracemalloc
+import logging
+import orjson
+
+from njsparser.parser.flight_data import (
+    get_raw_flight_data,
+    decode_raw_flight_data,
+    _tokenize,
+)
+from njsparser.parser.types import resolve_type, DataContainer, DataParent
+
+logging.getLogger("njsparser").setLevel(logging.ERROR)
+_src = Path(__file__).parent.parent / "test" / "src"
+
+def load_rows() -> list[tuple[bytes, str | None, int | None]]:
+    """Returns the raw rows (raw value, class, index) of every html fixture."""
+    rows = []
+    for path in sorted(_src.glob("*.html")):
+        if (raw := get_raw_flight_data(value=path.read_bytes(), backend="scan")) is None:
+            continue
+        buffer = "".join(decode_raw_flight_data(raw)).encode()
+        for index, value_class, start, end in _tokenize(buffer):
+            rows.append((buffer[start:end], value_class, index))
+    return rows
+
+def decode(rows) -> list[tuple]:
+    return [
+        (raw.decode() if value_class == "T" else orjson.loads(raw), value_class, index)
+        for raw, value_class, index in rows
+    ]
+
+def count(elements) -> int:
+    "Counts the elements, including the ones nested in containers and parents."
+    result = 0
+    for element in elements:
+        result += 1
+        if type(element) is DataContainer:
+            result += count(element.value)
+        elif type(element) is DataParent:
+            result += count([element.children])
+    return result
+
+def main(rounds: int = 200):
+    rows = load_rows()
+    # Elements resolution changes some of the values (`DataParent`), so each
+    # round needs its own copy of them.
+    values = [decode(rows) for _ in range(rounds)]
+    start = time.perf_counter()
+    for round_values in values:
+        elements = [resolve_type(value=v, value_class=c, index=i) for v, c, i in round_values]
+    duration = time.perf_counter() - start
+    n = count(elements)
+
+    round_values = decode(rows)
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    elements = [resolve_type(value=v, value_class=c, index=i) for v, c, i in round_values]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"rows: {len(rows)}, elements: {n}")
+    print(f"elements/s: {n * rounds / duration:,.0f}")
+    print(f"bytes/element: {(after - before) / n:,.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""Measures how much parsing a single page's flight data over several
+processes could gain, over pages generated by `_synth`.
+
+The rows would be split in the current process, and made into elements by
+the workers, which then send the elements back. Splitting the rows, and
+unpickling the elements sent back, stay in the current process whatever the
+number of workers: the time of a serial parse divided by theirs is the most
+a pool of any size can gain (before starting the processes and sending them
+the rows). With `--workers`, the rows are also parsed by a pool of processes.
+
+```
+$ python benchmarks/bench_parallel.py --sizes 10MB,50MB --workers 8
+```
+"""
+
+from argparse import ArgumentParser
+from dataclasses import dataclass, asdict
+from pathlib import Path
+import logging
+import multiprocessing
+import os
+import pickle
+import orjson
+
+from njsparser.parser.flight_data import (
+    get_raw_flight_data,
+    _decode_to_buffer,
+    parse_decoded_raw_flight_data,
+    _tokenize,
+)
+
+from _synth import generate
+from bench_pickle import _default_dumps, _dumps
+from bench_pipeline import measure, metadata
+
+logging.getLogger("njsparser").setLevel(logging.ERROR)
+_sizes = {
+    "1MB": 1_000_000,
+    "10MB": 10_000_000,
+    "50MB": 50_000_000,
+}
+
+@dataclass
+class Result:
+    input: str
+    "The name of the input."
+    flight_data_bytes: int
+    "The size of the flight data."
+    rows: int
+    "How many rows it has."
+    serial_s: float
+    "The fastest time to parse it in the current process, in seconds."
+    split_s: float
+    "The fastest time to split its rows, in seconds."
+    receive_s: float
+    """The fastest time to unpickle its elements, in seconds (with the
+    quickest of the default pickling and the pickling as rows)."""
+    workers: int
+    "How many processes parsed it in `parallel_s` (0 if it wasn't)."
+    parallel_s: float | None
+    "The fastest time to parse it over the processes, in seconds."
+
+    @property
+    def max_speedup(self) -> float:
+        "The most parsing over processes can gain, with any number of them."
+        return self.serial_s / (self.split_s + self.receive_s)
+
+def _chunks(buffer: bytes, count: int) -> list[bytes]:
+    "Splits the flight data into about `count` chunks of whole rows."
+    rows = _tokenize(buffer)
+    # (A row ends with its value, and the new line after it unless it's a text.)
+    ends = [end + (value_class != "T") for _, value_class, _, end in rows]
+    step, chunks, start = max(1, len(buffer) // count), [], 0
+    for end in ends:
+        if end - start >= step or end == ends[-1]:
+            chunks.append(buffer[start:end])
+            start = end
+    return chunks
+
+def _parse_chunk(chunk: bytes) -> list:
+    return list(parse_decoded_raw_flight_data(chunk).items())
+
+def _parse_in_pool(pool, chunks: list[bytes]) -> dict:
+    flight_data = {}
+    # (The chunks are merged in order, so are the rows without index.)
+    for items in pool.imap(_parse_chunk, chunks):
+        for index, element in items:
+            if index is None:
+                flight_data.setdefault(None, []).extend(element)
+            else:
+                flight_data[index] = element
+    return flight_data
+
+def bench_page(name: str, page: str, workers: int) -> Result:
+    buffer = bytes(_decode_to_buffer(get_raw_flight_data(page, backend="scan")))
+    elements = list(parse_decoded_raw_flight_data(buffer).items())
+    receive = []
+    for dumps in (_default_dumps, _dumps):
+        data = dumps(elements)
+        receive.append(min(measure(lambda: pickle.loads(data), max_rounds=5)))
+    parallel = None
+    if workers:
+        chunks = _chunks(buffer, workers * 4)
+        # (The processes are started before the timing.)
+        with multiprocessing.Pool(processes=workers) as pool:
+            assert _parse_in_pool(pool, chunks).keys() == dict(elements).keys()
+            parallel = min(measure(lambda: _parse_in_pool(pool, chunks), max_rounds=5))
+    return Result(
+        input=name,
+        flight_data_bytes=len(buffer),
+        rows=len(_tokenize(buffer)),
+        serial_s=min(measure(lambda: parse_decoded_raw_flight_data(buffer), max_rounds=5)),
+        split_s=min(measure(lambda: _tokenize(buffer), max_rounds=5)),
+        receive_s=min(receive),
+        workers=workers,
+        parallel_s=parallel,
+    )
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", type=Path, help="where to write the json results")
+    parser.add_argument(
+        "--sizes",
+        default="10MB",
+        help=f"the sizes of the generated pages, among {', '.join(_sizes)}",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() if (os.cpu_count() or 1) > 1 else 0,
+        help="how many processes to parse the pages over, 0 for none "
+             "(defaults to the number of cpus, if more than one)",
+    )
+    args = parser.parse_args()
+
+    results = [
+        bench_page(f"generated-{size}", generate(size=_sizes[size], seed=0, unicode=.1, binary=.05), args.workers)
+        for size in filter(None, args.sizes.split(","))
+    ]
+    print( f"{'input':<16} {'bytes':>10} {'rows':>8} {'serial ms':>10} {'split ms':>9} "
+           f"{'receive ms':>11} {'max x':>6} {'workers':>8} {'parallel ms':>12}" )
+    for result in results:
+        parallel = "-" if result.parallel_s is None else f"{result.parallel_s * 1e3:.1f}"
+        print( f"{result.input:<16} {result.flight_data_bytes:>10} {result.rows:>8} "
+               f"{result.serial_s * 1e3:>10.1f} {result.split_s * 1e3:>9.1f} "
+               f"{result.receive_s * 1e3:>11.1f} {result.max_speedup:>6.2f} "
+               f"{result.workers:>8} {parallel:>12}" )
+    if args.output is not None:
+        args.output.write_bytes(orjson.dumps(
+            {
+                "metadata": metadata() | {"cpus": os.cpu_count()},
+                "results": [asdict(result) | {"max_speedup": result.max_speedup} for result in results],
+            },
+            option=orjson.OPT_INDENT_2,
+        ))
+
+if __name__ == "__main__":
+    main()
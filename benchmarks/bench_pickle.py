@@ -0,0 +1,123 @@
+"""Compares the pickling of flight data (a `BeautifulFD`, and the list of its
+elements) as encoded rows, to the default pickling of their fields, over the
+html fixtures of `test/src` and pages generated with `njsparser.testing.synth`.
+
+```
+$ python benchmarks/bench_pickle.py --sizes 1MB,10MB
+```
+"""
+
+from argparse import ArgumentParser
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any
+import io
+import logging
+import pickle
+import orjson
+
+from njsparser import BeautifulFD
+from njsparser.parser.types import Element
+from njsparser.testing.synth import generate
+
+from bench_pipeline import measure, metadata
+
+logging.getLogger("njsparser").setLevel(logging.ERROR)
+_src = Path(__file__).parent.parent / "test" / "src"
+_sizes = {
+    "100KB": 100_000,
+    "1MB": 1_000_000,
+    "10MB": 10_000_000,
+}
+
+@dataclass
+class Result:
+    input: str
+    "The name of the input."
+    object: str
+    "What was pickled (`BeautifulFD` or `elements`)."
+    format: str
+    "How it was pickled (`default` or `rows`)."
+    pickle_bytes: int
+    "The size of the pickle."
+    dumps_s: float
+    "The fastest time to pickle it, in seconds."
+    loads_s: float
+    "The fastest time to unpickle it, in seconds."
+    access_s: float
+    "The fastest time to unpickle it and access every element, in seconds."
+
+class _DefaultPickler(pickle.Pickler):
+    "Pickles the elements and `BeautifulFD` with their fields, as before."
+
+    def reducer_override(self, obj: Any):
+        if isinstance(obj, (Element, BeautifulFD)):
+            return object.__reduce_ex__(obj, pickle.HIGHEST_PROTOCOL)
+        return NotImplemented
+
+def _default_dumps(obj: Any) -> bytes:
+    file = io.BytesIO()
+    _DefaultPickler(file, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return file.getvalue()
+
+def _dumps(obj: Any) -> bytes:
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _access(obj: BeautifulFD | list[Element]):
+    "Accesses every element (and the value of the texts, decoded lazily)."
+    for item in obj.as_list() if isinstance(obj, BeautifulFD) else obj:
+        for element in item if isinstance(item, list) else (item,):
+            element.value
+
+def bench_page(name: str, page: bytes) -> list[Result]:
+    fd = BeautifulFD(page)
+    if not fd:
+        return []
+    results = []
+    for object_name, obj in (("BeautifulFD", fd), ("elements", fd.as_list())):
+        for format, dumps in (("default", _default_dumps), ("rows", _dumps)):
+            data = dumps(obj)
+            results.append(Result(
+                input=name,
+                object=object_name,
+                format=format,
+                pickle_bytes=len(data),
+                dumps_s=min(measure(lambda: dumps(obj))),
+                loads_s=min(measure(lambda: pickle.loads(data))),
+                access_s=min(measure(lambda: _access(pickle.loads(data)))),
+            ))
+    return results
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", type=Path, help="where to write the json results")
+    parser.add_argument(
+        "--sizes",
+        default="1MB",
+        help=f"the sizes of the generated pages, among {', '.join(_sizes)} "
+             "(empty for none)",
+    )
+    args = parser.parse_args()
+
+    inputs = [(path.name, path.read_bytes()) for path in sorted(_src.glob("*.html"))]
+    for size in filter(None, args.sizes.split(",")):
+        page = generate(rows=None, size=_sizes[size], seed=0, unicode=.1, binary=.05)
+        inputs.append((f"generated-{size}", page.html.encode()))
+    results = []
+    for name, page in inputs:
+        results += bench_page(name, page)
+
+    print( f"{'input':<22} {'object':<12} {'format':<8} {'bytes':>10} "
+           f"{'dumps ms':>9} {'loads ms':>9} {'access ms':>10}" )
+    for result in results:
+        print( f"{result.input:<22} {result.object:<12} {result.format:<8} "
+               f"{result.pickle_bytes:>10} {result.dumps_s * 1e3:>9.3f} "
+               f"{result.loads_s * 1e3:>9.3f} {result.access_s * 1e3:>10.3f}" )
+    if args.output is not None:
+        args.output.write_bytes(orjson.dumps(
+            {"metadata": metadata(), "results": [asdict(result) for result in results]},
+            option=orjson.OPT_INDENT_2,
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Benchmarks each stage of the parsing pipeline, over the html and build
+manifest fixtures of `test/src`, and over pages from 10KB to 50MB generated
+by `_synth` (a copy of `njsparser.testing.synth`).
+The results are written as JSON, so that they can be compared between
+commits. Only the public functions of njsparser are timed, so that it runs
+at any commit.
+
+```
+$ python benchmarks/bench_pipeline.py -o before.json
+$ git checkout ...
+$ python benchmarks/bench_pipeline.py -o after.json --compare before.json
+```
+"""
+
+from argparse import ArgumentParser
+from dataclasses import dataclass, asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from statistics import median
+from typing import Any, Callable
+import importlib.metadata
+import inspect
+import importlib.util
+import logging
+import platform
+import subprocess
+import time
+import orjson
+
+from njsparser import (
+    make_tree,
+    get_next_data,
+    get_flight_data,
+    find_build_id,
+    parse_buildmanifest,
+    BeautifulFD,
+)
+from njsparser.parser.flight_data import (
+    get_raw_flight_data,
+    decode_raw_flight_data,
+    parse_decoded_raw_flight_data,
+)
+
+from _synth import generate
+
+logging.getLogger("njsparser").setLevel(logging.ERROR)
+_src = Path(__file__).parent.parent / "test" / "src"
+_sizes = {
+    "10KB": 10_000,
+    "100KB": 100_000,
+    "1MB": 1_000_000,
+    "10MB": 10_000_000,
+    "50MB": 50_000_000,
+}
+
+@dataclass
+class Result:
+    input: str
+    "The name of the input."
+    stage: str
+    "The name of the stage."
+    input_bytes: int
+    "The size of the input of the page (or build manifest)."
+    rounds: int
+    "How many times the stage was timed."
+    min_s: float
+    "The fastest time of the stage, in seconds."
+    median_s: float
+    "The median time of the stage, in seconds."
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.input_bytes / self.min_s / 1e6 if self.min_s else float("inf")
+
+def measure(
+    func: Callable,
+    setup: Callable[[], tuple] = tuple,
+    min_time: float = .2,
+    max_rounds: int = 20,
+) -> list[float]:
+    """Times `func` until it ran for `min_time` seconds, or `max_rounds`
+    times (at least once).
+
+    Args:
+        func (Callable): The function to time.
+        setup (Callable[[], tuple], optional): Gives the arguments of `func`
+            for each round, it is not timed. Defaults to `tuple`.
+        min_time (float, optional): How long to run for. Defaults to .2.
+        max_rounds (int, optional): The maximum number of rounds. Defaults to 20.
+
+    Returns:
+        list[float]: The duration of each round.
+    """
+    durations = []
+    while len(durations) < max_rounds and (not durations or sum(durations) < min_time):
+        args = setup()
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+def bench_page(name: str, page: bytes) -> list[Result]:
+    """Times every stage of the parsing of the html page.
+
+    Args:
+        name (str): The name of the page in the results.
+        page (bytes): The page.
+
+    Returns:
+        list[Result]: The results of each stage.
+    """
+    tree = make_tree(page)
+    raw = get_raw_flight_data(tree)
+    decoded = decode_raw_flight_data(raw) if raw is not None else []
+    fd = BeautifulFD(tree)
+    # (Each round gets a new tree, as the trees of some commits keep what
+    # was found in them.)
+    stages = {
+        "make_tree": (lambda: make_tree(page), tuple),
+        "get_raw_flight_data": (get_raw_flight_data, lambda: (make_tree(page),)),
+        "decode_raw_flight_data": (lambda: decode_raw_flight_data(raw), tuple),
+        "parse_decoded_raw_flight_data": (lambda: parse_decoded_raw_flight_data(decoded), tuple),
+        "get_flight_data": (lambda: get_flight_data(page), tuple),
+        "BeautifulFD": (lambda: BeautifulFD(page), tuple),
+        "BeautifulFD.find_all": (lambda: fd.find_all(), tuple),
+        "find_build_id": (lambda: find_build_id(page), tuple),
+        "get_next_data": (get_next_data, lambda: (make_tree(page),)),
+    }
+    if "backend" in inspect.signature(get_raw_flight_data).parameters:
+        stages["get_raw_flight_data[scan]"] = (lambda: get_raw_flight_data(page, backend="scan"), tuple)
+    results = []
+    for stage, (func, setup) in stages.items():
+        if raw is None and stage not in ("make_tree", "find_build_id", "get_next_data"):
+            continue
+        durations = measure(func, setup)
+        results.append(Result(
+            input=name,
+            stage=stage,
+            input_bytes=len(page),
+            rounds=len(durations),
+            min_s=min(durations),
+            median_s=median(durations),
+        ))
+    return results
+
+def bench_build_manifest(name: str, script: str) -> list[Result]:
+    stages = {"parse_buildmanifest": {}}
+    if (
+        "backend" in inspect.signature(parse_buildmanifest).parameters
+        and importlib.util.find_spec("pythonmonkey") is not None
+    ):
+        stages["parse_buildmanifest[pythonmonkey]"] = {"backend": "pythonmonkey"}
+    results = []
+    for stage, kwargs in stages.items():
+        durations = measure(lambda: parse_buildmanifest(script, **kwargs))
+        results.append(Result(
+            input=name,
+            stage=stage,
+            input_bytes=len(script.encode()),
+            rounds=len(durations),
+            min_s=min(durations),
+            median_s=median(durations),
+        ))
+    return results
+
+def metadata() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+        ).stdout.strip() or None
+    except OSError:
+        commit = None
+    try:
+        version = importlib.metadata.version("njsparser")
+    except importlib.metadata.PackageNotFoundError:
+        version = None
+    return {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "njsparser": version,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+
+def compare(results: list[Result], path: Path):
+    "Prints how faster (or slower) each stage is than in the results at `path`."
+    before = {
+        (item["input"], item["stage"]): item["min_s"]
+        for item in orjson.loads(path.read_bytes())["results"]
+    }
+    print(f"\n{'input':<24} {'stage':<32} {'speedup':>8}")
+    for result in results:
+        if (previous := before.get((result.input, result.stage))) is not None:
+            print(f"{result.input:<24} {result.stage:<32} {previous / result.min_s:>7.2f}x")
+
+def main():
+    parser = ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("-o", "--output", type=Path, help="where to write the json results")
+    parser.add_argument(
+        "--sizes",
+        default=",".join(_sizes),
+        help=f"the sizes of the generated pages, among {', '.join(_sizes)} "
+             "(empty for none)",
+    )
+    parser.add_argument("--compare", type=Path, help="json results to compare to")
+    args = parser.parse_args()
+
+    inputs = [(path.name, path.read_bytes()) for path in sorted(_src.glob("*.html"))]
+    for size in filter(None, args.sizes.split(",")):
+        page = generate(size=_sizes[size], seed=0, unicode=.1, binary=.05)
+        inputs.append((f"generated-{size}", page.encode()))
+    results = []
+    for name, page in inputs:
+        results += bench_page(name, page)
+    for path in sorted(_src.glob("*_buildManifest.js")):
+        results += bench_build_manifest(path.name, path.read_text())
+
+    print(f"{'input':<24} {'stage':<32} {'bytes':>10} {'rounds':>6} {'min ms':>10} {'MB/s':>8}")
+    for result in results:
+        print( f"{result.input:<24} {result.stage:<32} {result.input_bytes:>10} "
+               f"{result.rounds:>6} {result.min_s * 1e3:>10.3f} {result.mb_per_s:>8.1f}" )
+    if args.output is not None:
+        args.output.write_bytes(orjson.dumps(
+            {"metadata": metadata(), "results": [asdict(result) for result in results]},
+            option=orjson.OPT_INDENT_2,
+        ))
+    if args.compare is not None:
+        compare(results, args.compare)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""Micro-benchmark of `resolve_type` over the rows of the html fixtures of
+`test/src`: the time it takes per call, for each kind of row (its class, and
+the type of its value). The fastest round is kept, so that the results are
+not much affected by the noise of the machine. The validation level can be
+given (use `off` to only time the type resolution).
+
+```
+$ python benchmarks/bench_resolve_type.py [off|fast|strict]
+```
+"""
+
+from collections import defaultdict
+import sys
+import time
+
+from bench_elements import load_rows, decode
+from njsparser.parser.types import resolve_type
+
+def main(rounds: int = 200, validate: str | None = None):
+    rows = load_rows()
+    values = [decode(rows) for _ in range(rounds)]
+    timings = {}
+    counts = defaultdict(int)
+    for value, value_class, index in values[0]:
+        counts[(value_class, type(value).__name__)] += 1
+    for round_values in values:
+        round_timings = defaultdict(float)
+        for value, value_class, index in round_values:
+            start = time.perf_counter()
+            resolve_type(value=value, value_class=value_class, index=index, validate=validate)
+            round_timings[(value_class, type(value).__name__)] += time.perf_counter() - start
+        for kind, duration in round_timings.items():
+            timings[kind] = min(timings.get(kind, duration), duration)
+
+    print(f"{'class':<6} {'type':<8} {'rows':>6} {'ns/call':>10}")
+    for kind in sorted(timings, key=lambda kind: -timings[kind]):
+        value_class, type_name = kind
+        print( f"{value_class or '-':<6} {type_name:<8} {counts[kind]:>6} "
+               f"{timings[kind] / counts[kind] * 1e9:>10,.0f}" )
+    print(f"total: {sum(timings.values()) * 1e3:.3f} ms per round of {len(rows)} rows")
+
+if __name__ == "__main__":
+    main(validate=sys.argv[1] if len(sys.argv) > 1 else None)
@@ -1,3 +1,5 @@
 from .parser import *
-from .utils import make_tree
-from .tools import *
\ No newline at end of file
+from .utils import make_tree, Page
+from .stats import ParseStats
+from .tools import *
+from .batch import parse_many, ParseResult
\ No newline at end of file
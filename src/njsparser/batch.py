@@ -0,0 +1,149 @@
+"""Parses many pages at once, over a pool of processes."""
+
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Iterable, Iterator, Literal
+import traceback
+import mmap
+import os
+
+from .utils import Page, _backend, _map_file
+from .parser.next_data import get_next_data
+from .parser.flight_data import get_flight_data, _only, FD
+from .parser.types import Validation, _get_classes
+from .tools import find_build_id
+
+__all__ = (
+    "ParseResult",
+    "parse_many",
+)
+
+_field = Literal["build_id", "next_data", "flight_data"]
+_fields = ("build_id", "next_data", "flight_data")
+
+@dataclass
+class ParseResult:
+    "What was found in one of the pages given to `parse_many`."
+    index: int
+    "The position of the page in the inputs."
+    path: str | None = None
+    "The path of the page, if it was given as one."
+    error: str | None = None
+    "The exception raised while parsing the page (its type and message), if one was."
+    build_id: str | None = None
+    "The build id of the page, if asked for."
+    next_data: dict[str, Any] | None = None
+    "The content of the `__NEXT_DATA__` script of the page, if asked for."
+    flight_data: FD | None = None
+    "The flight data of the page (only the classes asked for), if asked for."
+
+def _parse_one(
+    item: tuple[int, str | bytes | os.PathLike],
+    fields: tuple[_field, ...],
+    only: _only,
+    validate: Validation | None,
+) -> ParseResult:
+    index, value = item
+    result = ParseResult(index=index)
+    try:
+        # The worker maps the file itself, so the page is neither sent to it
+        # nor read whole: the scripts are found in the mapped file.
+        if isinstance(value, os.PathLike):
+            result.path = os.fspath(value)
+            with _map_file(path=value) as mapped:
+                _parse_page(result, mapped, "scan", fields, only, validate)
+        else:
+            _parse_page(result, value, None, fields, only, validate)
+    except Exception as error:
+        result.error = "".join(traceback.format_exception_only(type(error), error)).strip()
+    return result
+
+def _parse_page(
+    result: ParseResult,
+    value: str | bytes | mmap.mmap,
+    backend: _backend | None,
+    fields: tuple[_field, ...],
+    only: _only,
+    validate: Validation | None,
+):
+    "Finds the fields in the page. With a backend, only the build id is searched in its tree."
+    page = Page(value=value)
+    if "build_id" in fields:
+        result.build_id = find_build_id(value=page)
+    source = page if backend is None else value
+    if "next_data" in fields:
+        result.next_data = get_next_data(value=source, backend=backend)
+    if "flight_data" in fields:
+        result.flight_data = get_flight_data(value=source, backend=backend, only=only, validate=validate)
+
+def parse_many(
+    inputs: Iterable[str | bytes | os.PathLike],
+    *,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = False,
+    fields: Iterable[_field] = ("build_id",),
+    only: _only = None,
+    validate: Validation | None = None,
+) -> Iterator[ParseResult]:
+    """Parses the pages over a pool of processes, and yields what was found
+    in each of them as soon as it is. A page that fails gives a result with
+    its `error`, the others are still parsed.
+
+    ```py
+    >>> for result in parse_many(Path("pages").glob("*.html"), fields=["build_id"]):
+    ...     print(result.path, result.build_id or result.error)
+    ```
+
+    Args:
+        inputs (Iterable[str | bytes | os.PathLike]): The html pages, or
+            their paths (as `pathlib.Path`, a str is an html page). Paths are
+            mapped in memory by the workers, so the pages are never sent to
+            them, nor read whole.
+        workers (int | None, optional): How many processes to use, 0 to parse
+            in the current one. Defaults to None (as many as cpus).
+        chunksize (int, optional): How many pages are sent to a worker at
+            once. Defaults to 1.
+        ordered (bool, optional): If `True`, the results are yielded in the
+            order of the inputs. Defaults to `False`.
+        fields (Iterable[_field], optional): What to find in the pages (and
+            send back): `"build_id"`, `"next_data"` and `"flight_data"`.
+            Defaults to `("build_id",)`.
+        only (_only, optional): The element classes (or their names) to
+            keep in the flight data. Defaults to None (every element).
+        validate (Validation, optional): How much the elements are checked,
+            see `njsparser.parser.types.Validation`. Defaults to
+            `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+
+    Raises:
+        ValueError: Unknown field.
+        KeyError: Unknown class in `only`.
+
+    Returns:
+        Iterator[ParseResult]: The result of each page.
+    """
+    fields = tuple(fields)
+    for field in fields:
+        if field not in _fields:
+            raise ValueError(f"Unknown field {field!r}, use {', '.join(map(repr, _fields))}.")
+    if only is not None:
+        # Checked here, rather than failing in every worker.
+        only = list(only)
+        _get_classes(only)
+    parse_one = partial(_parse_one, fields=fields, only=only, validate=validate)
+    if workers == 0:
+        return map(parse_one, enumerate(inputs))
+    return _parse_in_pool(parse_one, enumerate(inputs), workers, chunksize, ordered)
+
+def _parse_in_pool(
+    parse_one: partial,
+    items: Iterable[tuple[int, Any]],
+    workers: int | None,
+    chunksize: int,
+    ordered: bool,
+) -> Iterator[ParseResult]:
+    import multiprocessing
+    # (The pool is terminated if the results stop being read.)
+    with multiprocessing.Pool(processes=workers) as pool:
+        imap = pool.imap if ordered is True else pool.imap_unordered
+        yield from imap(parse_one, items, chunksize=chunksize)
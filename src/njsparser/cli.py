@@ -1,4 +1,4 @@
-import requests
+from pathlib import Path
 import typer
 from rich.console import Console
 
@@ -16,8 +16,15 @@ def analyze(
         show_default=False,
     ),
     force_api: bool = False,
+    manifest_cache: Path = typer.Option(
+        None,
+        help="A directory where the build manifests are kept, so that they "
+             "are fetched only once per build.",
+    ),
 ):
     """Scan the given website to find any interesting exploitable data."""
+    # (Imported here, so that `--help` doesn't wait for it.)
+    import requests
     if not url or not url.strip():
         console.print("[red]Error: URL is required.[/red]")
         raise typer.Exit(2)
@@ -25,7 +32,7 @@ def analyze(
     assert main_response.status_code == 200, main_response.status_code
     domain = main_response.url.split("/", 3).pop(2)
     base_url = f"https://{domain}"
-    value = utils.make_tree(value=main_response.text)
+    value = utils.Page(value=main_response.text)
     assert tools.has_nextjs(value=value) is True, "page doesn't have nextjs"
     assert (
         build_id := tools.find_build_id(value=value)
@@ -51,12 +58,14 @@ def analyze(
         content_type=is_api_exposed_response.headers.get("Content-Type"),
         text=is_api_exposed_response.text,
     )
-    build_manifest_path = parser.get_build_manifest_path(
-        build_id=build_id, base_path=base_path
+    def get_build_manifest(url: str) -> str:
+        build_manifest_resp = requests.get(url)
+        assert build_manifest_resp.status_code == 200, build_manifest_resp.status_code
+        return build_manifest_resp.text
+    build_manifest = parser.ManifestCache(path=manifest_cache).fetch(
+        base_url, build_id, get=get_build_manifest, base_path=base_path
     )
-    build_manifest_resp = requests.get(f"{base_url}{build_manifest_path}")
-    assert build_manifest_resp.status_code == 200, build_manifest_resp.status_code
-    build_manifest = parser.parse_buildmanifest(script=build_manifest_resp.text)
+    assert build_manifest is not None, "can't parse the build manifest"
     sorted_pages = build_manifest.get("sortedPages") or []
     if sorted_pages:
         print("Pages:")
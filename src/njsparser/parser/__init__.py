@@ -1,5 +1,6 @@
-from .flight_data import has_flight_data, get_flight_data
+from .flight_data import has_flight_data, get_flight_data, get_flight_data_from_rsc, FlightDataParser, LazyFD, FlightRowTable
 from .next_data import has_next_data, get_next_data
 from .urls import get_next_static_urls, get_base_path
-from .manifests import parse_buildmanifest, get_build_manifest_path
+from .manifests import parse_buildmanifest, get_build_manifest_path, ManifestCache
+from .js_pool import JSWorkerPool, JSEvaluationError
 from .types import *
\ No newline at end of file
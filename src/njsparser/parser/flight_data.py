@@ -1,17 +1,30 @@
 """Part of the lib to interract with the nextjs data located looking like `self.__next_f.push(1, "...")`"""
 
-from typing import List, Union, TypeVar
+from typing import List, Union, TypeVar, Iterator, Iterable, Type
+from collections.abc import Mapping
+from itertools import compress, repeat
+from array import array
 import orjson
 import re
+import os
+import mmap
 import base64
+import time
 from enum import Enum
 
-from ..utils import make_tree, _supported_tree
-from .types import resolve_type, Element, TE
+from ..utils import _supported_tree, _backend, Page, get_scripts, _value_size, _map_file, _select_backend
+from ..stats import ParseStats, _collect, _current_stats, _stage
+from .types import _resolve, _text_row, _encode_row_value, Element, TE, Validation, _get_value_classes, _validation
 
 _raw_f_data = List[Union[list[int], list[int, str]]]
 _re_f_init = re.compile(r'\(self\.__next_f\s?=\s?self\.__next_f\s?\|\|\s?\[\]\)\.push\((\[.+?\])\)')
 _re_f_payload = re.compile(r'self\.__next_f\.push\((\[.+)\)$')
+_re_b_f_init = re.compile(_re_f_init.pattern.encode())
+_re_b_f_payload = re.compile(_re_f_payload.pattern.encode())
+# The start of a `<script>` whose content starts like a flight data one.
+_re_b_f_script = re.compile(rb'<script[^>]*>\s*(?=\(?self\.__next_f)')
+
+_only = Iterable[Type[Element] | str] | None
 
 def has_flight_data(value: _supported_tree) -> bool:
     """Tells if a given page contains any flight data.
@@ -22,29 +35,81 @@ def has_flight_data(value: _supported_tree) -> bool:
     Returns:
         bool: True if the page contains any flight data.
     """
-    scripts = make_tree(value=value).xpath('//script/text()')
-    return any([_re_f_init.search(script) for script in scripts])
+    return any(_re_f_init.search(script) for script in get_scripts(value=value))
 
-def get_raw_flight_data(value: _supported_tree) -> _raw_f_data | None:
+def get_raw_flight_data(
+    value: _supported_tree,
+    *,
+    backend: _backend = None,
+) -> _raw_f_data | None:
     """Will return the raw flight data, under the same format as the array shown when
     doing `console.log(self.__next_f);` in the console of a website containing nextjs
     flight data.
 
     Args:
         value (_supported_tree): The page to get the data from.
+        backend (_backend, optional): `"lxml"` builds the tree of the page
+            and reads its scripts. `"scan"` finds the flight data scripts
+            directly in the str or bytes page, without building any tree,
+            which is a lot faster on big pages. Ignored if `value` is a
+            `Page`. Defaults to `"lxml"`, or `"scan"` if `value` is a path
+            or an `mmap` (the file is then mapped in memory, and only the
+            flight data scripts are copied out of it).
+
+    Raises:
+        ValueError: Unknown backend.
+        TypeError: The `"scan"` backend was given an lxml tree.
 
     Returns:
         _raw_f_data | None: The `self.__next_f` array, or None if nothing found.
     """
+    if isinstance(value, Page):
+        return value.raw_flight_data
+    backend = _select_backend(value=value, backend=backend)
+    if backend == "lxml":
+        return _raw_flight_data_from_scripts(scripts=get_scripts(value=value))
+    elif isinstance(value, os.PathLike):
+        with _map_file(path=value) as mapped:
+            return get_raw_flight_data(value=mapped, backend="scan")
+    else:
+        return _raw_flight_data_from_scripts(scripts=_scan_flight_data_scripts(value=value))
+
+def _scan_flight_data_scripts(value: bytes | str | mmap.mmap) -> Iterator[bytes]:
+    """Yields the content of the scripts that start like a flight data script,
+    searching for them directly in the bytes of the page.
+
+    Args:
+        value (bytes | str | mmap.mmap): The page.
+
+    Raises:
+        TypeError: The page is neither a str, bytes or mmap.
+
+    Yields:
+        bytes: The content of the scripts.
+    """
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, (bytes, mmap.mmap)):
+        raise TypeError( 'the "scan" backend waited a `str`, `bytes` or `mmap`, '
+                         'got `%s`' % type(value).__name__ )
+    for match in _re_b_f_script.finditer(value):
+        if (end := value.find(b"</script", match.end())) == -1:
+            end = len(value)
+        yield value[match.end():end]
+
+def _raw_flight_data_from_scripts(scripts: Iterator[str | bytes]) -> _raw_f_data | None:
     result, found_init = [], False
-    for script in make_tree(value=value).xpath('//script/text()'):
-        script: str = script.strip()
-        if found_init is False and \
-            (flight_data_init_match := _re_f_init.match(script)):
-            found_init = True
-            result.append(orjson.loads(flight_data_init_match.groups()[0]))
-        if is_matching := _re_f_payload.match(script):
-            result.append(orjson.loads(is_matching.groups()[0]))
+    with _stage("raw_flight_data"):
+        for script in scripts:
+            script: str | bytes = script.strip()
+            init_regex, payload_regex = (_re_b_f_init, _re_b_f_payload) \
+                if isinstance(script, bytes) else (_re_f_init, _re_f_payload)
+            if found_init is False and \
+                (flight_data_init_match := init_regex.match(script)):
+                found_init = True
+                result.append(orjson.loads(flight_data_init_match.groups()[0]))
+            if is_matching := payload_regex.match(script):
+                result.append(orjson.loads(is_matching.groups()[0]))
     return result or None
 
 class Segment(int, Enum):
@@ -70,17 +135,59 @@ def decode_raw_flight_data(raw_flight_data: _raw_f_data) -> List[str]:
     Returns:
         List[str]: The chunks of flight data.
     """
+    return [
+        base64.b64decode(chunk).decode() if is_binary else chunk
+        for is_binary, chunk in _decode_segments(raw_flight_data=raw_flight_data)
+    ]
+
+def _decode_to_buffer(raw_flight_data: _raw_f_data) -> bytearray:
+    """Decodes the raw flight data directly into the encoded flight data,
+    without the decoded chunks having to be joined then encoded. The buffer
+    is made once, of the size of the chunks, then filled: only one chunk is
+    encoded (or decoded from base64) at a time besides it."""
+    chunks = _decode_segments(raw_flight_data=raw_flight_data)
+    size = 0
+    for is_binary, chunk in chunks:
+        if is_binary:
+            size += len(chunk) // 4 * 3 - chunk[-2:].count("=")
+        else:
+            size += len(chunk) if chunk.isascii() else len(chunk.encode())
+    buffer, offset = bytearray(size), 0
+    with memoryview(buffer) as view:
+        for is_binary, chunk in chunks:
+            data = base64.b64decode(chunk) if is_binary else chunk.encode()
+            if offset + len(data) > size:
+                # (The size was wrong, the base64 has spaces or no padding.)
+                break
+            view[offset:offset + len(data)] = data
+            offset += len(data)
+        else:
+            data = None
+    if data is not None:
+        return _join_to_buffer(chunks)
+    del buffer[offset:]
+    return buffer
+
+def _join_to_buffer(chunks: list[tuple[bool, str]]) -> bytearray:
+    "Same as `_decode_to_buffer`, growing the buffer chunk by chunk."
+    buffer = bytearray()
+    for is_binary, chunk in chunks:
+        buffer += base64.b64decode(chunk) if is_binary else chunk.encode()
+    return buffer
+
+def _decode_segments(raw_flight_data: _raw_f_data) -> list[tuple[bool, str]]:
+    """The chunks of flight data, each with whether it is of a binary segment
+    (then it is still in base64)."""
     try:
         for seg in raw_flight_data:
             if seg[0] == Segment.is_bootstrap:
                 initial_server_data_buffer = []
             elif seg[0] == Segment.is_not_bootstrap:
-                initial_server_data_buffer.append(seg[1])
+                initial_server_data_buffer.append((False, seg[1]))
             elif seg[0] == Segment.is_form_state:
                 initial_form_state_data = seg[1]
             elif seg[0] == Segment.is_binary:
-                decoded_chunk = base64.b64decode(seg[1].encode())
-                initial_server_data_buffer.append(decoded_chunk.decode())
+                initial_server_data_buffer.append((True, seg[1]))
             else:
                 raise KeyError(f'Unknown segment type {seg[0]=}')
     except UnboundLocalError as error:
@@ -111,95 +218,776 @@ def decode_raw_flight_data(raw_flight_data: _raw_f_data) -> List[str]:
 
 
 FD = dict[int, TE]
+_row = tuple[int | None, str | None, int, int]
+
+# The value of a non `"T"` row, up to its first `"\n"` that is not in one of
+# its JSON strings. Strings are matched as a whole (with their escapes), so it
+# is linear, and it stops at the opening quote of a string that doesn't end
+# in the buffer.
+_row_value = re.compile(rb'[^"\n]*(?:"[^"\\]*(?:\\.[^"\\]*)*"[^"\n]*)*', re.DOTALL)
+# The rest of a string we are in, up to its closing quote.
+_string_rest = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*', re.DOTALL)
+_hex_chars = re.compile(rb"[0-9a-f]*")
+_value_class_chars = re.compile(rb"[A-Z]*")
+
+def _scan_rows(
+    buffer: bytes | bytearray,
+    pos: int = 0,
+    final: bool = True,
+    resume: tuple[int, bool] | None = None,
+) -> tuple[list[_row], int, tuple[int, bool] | None]:
+    """Splits the encoded flight data into rows, in a single forward pass.
+    A `"T"` row ends after the number of bytes announced in it, and any other
+    row at the first `"\\n"` that is outside of its JSON strings and followed
+    by the start of a row (its hex index and `":"`), or at the end of the data.
+
+    Args:
+        buffer (bytes | bytearray): The encoded flight data.
+        pos (int, optional): The position the first row starts at. Defaults
+            to 0.
+        final (bool, optional): If `False`, the buffer might be completed
+            later, so a row reaching the end of it is not considered complete.
+            Defaults to True.
+        resume (tuple[int, bool] | None, optional): Where the end of the row
+            at `pos` was already searched up to, and if it is inside a string,
+            as returned by a previous call on the same (since completed)
+            buffer. Defaults to None.
+
+    Returns:
+        tuple[list[_row], int, tuple[int, bool] | None]: The rows (index,
+            class, value start and value end), the position of the first
+            incomplete row (the end of the buffer if there is none) and where
+            to resume searching for its end.
+    """
+    rows, length = [], len(buffer)
+    append, find = rows.append, buffer.find
+    row_value, string_rest = _row_value.match, _string_rest.match
+    while pos < length:
+        # The index is the hex string before the first `":"`, if it is empty
+        # we will set it to `None`. Without `":"`, there is no other row.
+        if (index_string_end := find(b":", pos)) == -1:
+            break
+        index = int(buffer[pos:index_string_end], 16) if index_string_end != pos else None
+        # The class is made of upper letters, since they look like `"HL"`,
+        # `"I"`, `"T"`, ... . If the string is empty, we will set it to `None`.
+        start = _value_class_chars.match(buffer, index_string_end + 1).end()
+        if start == length and final is False:
+            break
+        value_class = buffer[index_string_end + 1:start].decode() or None
+
+        # If the class is `"T"`, if will right after it have the hex size of
+        # the text it contains, in bytes. It is then separated to the content
+        # with a `","`.
+        if value_class == "T":
+            if (text_length_string_end := find(b",", start)) == -1:
+                break
+            end = text_length_string_end + 1 + int(buffer[start:text_length_string_end], 16)
+            if end > length and final is False:
+                break
+            append((index, value_class, text_length_string_end + 1, end))
+            pos, resume = end, None
+            continue
+
+        scan, in_string = (start, False) if resume is None else resume
+        resume = None
+        while True:
+            if in_string:
+                scan = string_rest(buffer, scan).end()
+                if scan < length and buffer[scan] == 0x22: # `"`
+                    scan, in_string = scan + 1, False
+                    continue
+            else:
+                # Most values have no escape, the `"\n"` is then outside of
+                # their strings if there is an even number of quotes before it.
+                newline = find(b"\n", scan)
+                if newline != -1 and find(b"\\", scan, newline) == -1 \
+                    and not buffer.count(b'"', scan, newline) & 1:
+                    scan = newline
+                else:
+                    scan = row_value(buffer, scan).end()
+                if scan < length:
+                    if buffer[scan] == 0x22: # the string doesn't end in the buffer
+                        scan, in_string = scan + 1, True
+                        continue
+                    # A `"\n"`, the row ends if a row starts after it.
+                    index_end = _hex_chars.match(buffer, scan + 1).end()
+                    if index_end < length:
+                        if buffer[index_end] == 0x3a: # `:`
+                            end, next_pos = scan, scan + 1
+                            break
+                        scan = index_end
+                        continue
+            # We reached the end of the data, the value extends to it
+            # (excluding the final `"\n"`).
+            if final is False:
+                return rows, pos, (scan, in_string)
+            end, next_pos = length - 1 if buffer.endswith(b"\n") else length, length
+            break
+        append((index, value_class, start, end))
+        pos = next_pos
+    return rows, pos, None
+
+def _tokenize(buffer: bytes | bytearray) -> list[_row]:
+    "The (index, class, value start, value end) of every row of the flight data."
+    return _scan_rows(buffer)[0]
+
+def _resolve_row(
+    raw_value: bytes | memoryview,
+    value_class: str | None,
+    index: int | None,
+    validate: Validation | None = None,
+) -> Element:
+    if value_class == "T":
+        return _text_row(raw_value, index, validate)
+    return _resolve(orjson.loads(raw_value), value_class, index, validate)
+
+def _add_element(indexed_result: FD, element: Element):
+    if element.index is None:
+        indexed_result.setdefault(None, []).append(element)
+    else:
+        indexed_result[element.index] = element
 
-_split_points = re.compile(rb"(?<!\\)\n[a-f0-9]*:")
-def parse_decoded_raw_flight_data(decoded_raw_flight_data: List[str]) -> FD:
+def parse_decoded_raw_flight_data(
+    decoded_raw_flight_data: List[str] | bytes | bytearray,
+    *,
+    only: _only = None,
+    validate: Validation | None = None,
+) -> FD:
+    """Parses the decoded flight data into its elements.
+
+    Args:
+        decoded_raw_flight_data (List[str] | bytes | bytearray): The chunks
+            of flight data, from `decode_raw_flight_data(...)`, or the encoded
+            flight data.
+        only (_only, optional): The element classes (or their names) you are
+            interested in. The rows that cannot give any of them are skipped
+            without being parsed. Defaults to None (every row is parsed).
+        validate (Validation, optional): How much the elements are checked,
+            see `njsparser.parser.types.Validation`. Defaults to
+            `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+
+    Returns:
+        FD: The flight data elements, by index. Elements without index are
+            listed in order under the `None` key.
+    """
     # Here we join, then encode the decoded raw flight data. It is important to encode
     # it, otherwise some values in string will take way more characters, and the text
     # size announced in `"T"` will not be pointing to the correct text end.
-    compiled_raw_flight_data = "".join(decoded_raw_flight_data).encode()
-    indexed_result, pos = {}, 0
-    while True:
-        # We find the position of the first `:`. If it is `-1`, it means we are at
-        # the end of the data, nothing else to parse in the remaining at least, so
-        # we break there. Otherwise we can determine the size of the index hex string
-        # that is between the current pos and the found `:` pos, then parse it into
-        # an actual int. Then update the pos to be right after the `:`.
-        index_string_end = compiled_raw_flight_data.find(b":", pos)
-        if index_string_end == -1:
-            break
-        index_string_raw = compiled_raw_flight_data[pos:index_string_end]
-        if index_string_raw:
-            index = int(index_string_raw, 16)
-        else:
-            index = None
-        pos = index_string_end + 1
+    if isinstance(decoded_raw_flight_data, (bytes, bytearray)):
+        compiled_raw_flight_data = decoded_raw_flight_data
+    else:
+        compiled_raw_flight_data = "".join(decoded_raw_flight_data).encode()
+    value_classes = None if only is None else _get_value_classes(only)
+    return _parse_rows(compiled_raw_flight_data, value_classes, validate)
 
-        # We iterate until the character is not alphabetic nor upper. This allows to
-        # iterate only as long as we are on the class, since they look like `"HF"`,
-        # `"I"`, `"T"`, ... . If the string is empty, we will set it to `None`.
-        value_class = ""
-        while (char := chr(compiled_raw_flight_data[pos])).isalpha() and char.isupper():
-            value_class += char
-            pos += 1
-        value_class = value_class or None
-        
-        # If the class is `"T"`, if will right after it have the hex size of the text
-        # it contains. It is then separated to the content with a `","`. We find the
-        # comma, select the size hex string (`text_length_hex`), then turn it into an
-        # `int`. Then we select the text with the size we just calculated.
+def _parse_rows(
+    buffer: bytes | bytearray,
+    value_classes: set[str | None] | None,
+    validate: Validation | None,
+) -> FD:
+    "Parses the rows of the given classes (None for all) of the encoded flight data."
+    if (stats := _current_stats.get()) is not None:
+        return _parse_with_stats(buffer, value_classes, validate, stats)
+    indexed_result = {}
+    # The values are read from views of the data, never copied.
+    with memoryview(buffer) as view:
+        for index, value_class, start, end in _tokenize(buffer):
+            if value_classes is not None and value_class not in value_classes:
+                continue
+            _add_element(indexed_result, _resolve_row(view[start:end], value_class, index, validate))
+    return indexed_result
+
+def _parse_with_stats(
+    buffer: bytes | bytearray,
+    value_classes: set[str | None] | None,
+    validate: Validation | None,
+    stats: ParseStats,
+) -> FD:
+    "Same as `parse_decoded_raw_flight_data`, reporting to the stats."
+    perf_counter = time.perf_counter
+    indexed_result, json_time, resolve_time = {}, 0., 0.
+    stats.bytes_out += len(buffer)
+    start_time = perf_counter()
+    view = memoryview(buffer)
+    for index, value_class, start, end in _tokenize(buffer):
+        if value_classes is not None and value_class not in value_classes:
+            continue
+        if end - start > stats.largest_row:
+            stats.largest_row, stats.largest_row_index = end - start, index
+        row_start = perf_counter()
+        # (The texts are decoded, if they are, with the elements.)
+        value = view[start:end] if value_class == "T" else orjson.loads(view[start:end])
+        row_loaded = perf_counter()
         if value_class == "T":
-            text_length_string_end = compiled_raw_flight_data.find(b",", pos)
-            text_length_hex = compiled_raw_flight_data[pos:text_length_string_end]
-            text_length = int(text_length_hex, 16)
-            text_start = text_length_string_end + 1 # (+1 for the comma)
-            raw_value = compiled_raw_flight_data[text_start:text_start+text_length].decode()
-            pos = text_start + text_length
-        
-        # Otherwise, we will search for the next time we have a non escaped `"\n"`,
-        # followed by the hex string of the index, with `":"` (using the regex
-        # `_split_points`).
+            element = _text_row(value, index, validate)
         else:
-            # If we have a match, we select the position of the start of it, and will
-            # use it as the end position of the current value.
-            if data_end_match := _split_points.search(string=compiled_raw_flight_data, pos=pos):
-                data_end = data_end_match.start()
-                raw_value = compiled_raw_flight_data[pos:data_end]
-                pos = data_end + 1
-            # Otherwise, it means we are reaching the end of the string, so the value
-            # will extend to the end of it, and so will its end pos.
-            else:
-                raw_value = compiled_raw_flight_data[pos:-1]
-                pos += len(raw_value)
+            element = _resolve(value, value_class, index, validate)
+        resolve_time += perf_counter() - row_loaded
+        json_time += row_loaded - row_start
+        name = type(element).__name__
+        stats.rows[name] = stats.rows.get(name, 0) + 1
+        _add_element(indexed_result, element)
+    view.release()
+    stats.add_time("split", perf_counter() - start_time - json_time - resolve_time)
+    stats.add_time("json", json_time)
+    stats.add_time("resolve", resolve_time)
+    return indexed_result
 
-        if value_class != "T":
-            value = orjson.loads(raw_value)
-        else:
-            value = raw_value
-        
-        resolved = resolve_type(
-            value=value,
-            value_class=value_class,
-            index=index,
+class LazyFD(Mapping):
+    """Flight data that is parsed lazily. On creation, the rows are only
+    indexed (index, class and position in the data). A row is decoded and its
+    element made only the first time it is accessed, then kept. It can be used
+    anywhere flight data (`FD`) is used, so searching in it only pays for the
+    rows that are actually looked at.
+
+    ```py
+    >>> fd = get_flight_data(html, lazy=True)
+    >>> fd
+    LazyFD(<0/47 resolved>)
+    >>> fd[0]
+    RSCPayload(...)
+    >>> fd
+    LazyFD(<1/47 resolved>)
+    ```
+    """
+
+    def __init__(
+        self,
+        buffer: bytes,
+        *,
+        only: _only = None,
+        validate: Validation | None = None,
+    ):
+        """Indexes the rows of the flight data.
+
+        Args:
+            buffer (bytes): The encoded flight data (the joined output of
+                `decode_raw_flight_data(...)`, or the body of a RSC response).
+            only (_only, optional): The element classes (or their names) you
+                are interested in. The rows that cannot give any of them are
+                not indexed. Defaults to None.
+            validate (Validation, optional): How much the elements are
+                checked, see `njsparser.parser.types.Validation`. Defaults to
+                `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+        """
+        self._buffer = buffer
+        self._validate = validate
+        self._rows: dict[int | None, tuple | list[tuple]] = {}
+        self._resolved: FD = {}
+        value_classes = None if only is None else _get_value_classes(only)
+        with _stage("split"):
+            for index, value_class, start, end in _tokenize(buffer):
+                if value_classes is not None and value_class not in value_classes:
+                    continue
+                if index is None:
+                    self._rows.setdefault(None, []).append((value_class, start, end))
+                else:
+                    self._rows[index] = (value_class, start, end)
+
+    @classmethod
+    def from_decoded(
+        cls,
+        decoded_raw_flight_data: List[str],
+        *,
+        only: _only = None,
+        validate: Validation | None = None,
+    ) -> "LazyFD":
+        """Creates the lazy flight data from the output of `decode_raw_flight_data(...)`.
+
+        Args:
+            decoded_raw_flight_data (List[str]): The chunks of flight data.
+            only (_only, optional): See `LazyFD.__init__`. Defaults to None.
+            validate (Validation, optional): See `LazyFD.__init__`.
+
+        Returns:
+            LazyFD: The lazy flight data.
+        """
+        return cls(
+            buffer="".join(decoded_raw_flight_data).encode(),
+            only=only,
+            validate=validate,
         )
-        if index is None:
-            if index not in indexed_result:
-                indexed_result[index] = []
-            indexed_result[index].append(resolved)
+
+    def __repr__(self):
+        return f"LazyFD(<{len(self._resolved)}/{len(self)} resolved>)"
+
+    def __getitem__(self, key: int | None) -> Element | list[Element]:
+        if key in self._resolved:
+            return self._resolved[key]
+        row = self._rows[key]
+        if key is None:
+            element = [self._resolve_row(key, *item) for item in row]
         else:
-            indexed_result[index] = resolved
+            element = self._resolve_row(key, *row)
+        self._resolved[key] = element
+        return element
 
-    return indexed_result
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, key):
+        return key in self._rows
+
+    def _resolve_row(self, index: int | None, value_class: str | None, start: int, end: int):
+        return _resolve_row(memoryview(self._buffer)[start:end], value_class, index, self._validate)
+
+    def _values_of(self, classes: Iterable[Type[Element]]) -> Iterator[Element | list[Element]]:
+        """The elements of the rows that can give one of the classes (see
+        `_get_value_classes`), made as they are reached. The other rows are
+        skipped unresolved, so are the rows without index."""
+        if (value_classes := _get_value_classes(classes)) is None:
+            yield from self.values()
+            return
+        for key, row in self._rows.items():
+            if key is not None and row[0] in value_classes:
+                yield self[key]
+
+    def __reduce__(self):
+        # Pickled as its rows, the elements are made again as they are accessed.
+        return _unpickle_flight_data, (self._encode(), self._validate)
+
+    def _encode(self) -> bytes:
+        "The rows of the flight data (only the indexed ones), as in a RSC response."
+        parts, buffer = [], self._buffer
+        for index, rows in self._rows.items():
+            for value_class, start, end in rows if index is None else (rows,):
+                parts.append(_row_head(index, value_class, end - start))
+                parts.append(buffer[start:end])
+                if value_class != "T":
+                    parts.append(b"\n")
+        return b"".join(parts)
+
+def _row_head(index: int | None, value_class: str | None, size: int) -> bytes:
+    "The start of a row, up to its value."
+    head = b":" if index is None else b"%x:" % index
+    if value_class == "T":
+        return head + b"T%x," % size
+    return head if value_class is None else head + value_class.encode()
+
+def _encode_flight_data(flight_data: FD | LazyFD) -> bytes | None:
+    """Encodes the flight data back into rows, as in a RSC response (that
+    `LazyFD` can read).
+
+    Args:
+        flight_data (FD | LazyFD): The flight data.
+
+    Returns:
+        bytes | None: The rows, or None if an element of the flight data
+            would not be made back the same from its row (it was not made from
+            one, see `njsparser.parser.types._encode_row_value`).
+    """
+    if isinstance(flight_data, LazyFD):
+        return flight_data._encode()
+    parts = []
+    for index, elements in flight_data.items():
+        if index is not None and (type(index) is not int or index < 0):
+            return None
+        for element in elements if index is None else (elements,):
+            value_class = element.value_class
+            if value_class is not None and not (value_class and _value_class_chars.fullmatch(value_class.encode())):
+                return None
+            elif element.index != index or (raw := _encode_row_value(element)) is None:
+                return None
+            parts.append(_row_head(index, value_class, len(raw)))
+            parts.append(raw)
+            if value_class != "T":
+                parts.append(b"\n")
+    return b"".join(parts)
+
+def _unpickle_flight_data(buffer: bytes, validate: Validation | None) -> LazyFD:
+    "Makes back flight data pickled as its rows."
+    return LazyFD(buffer, validate=validate)
+
+class FlightRowTable:
+    """The rows of flight data as columns. The index, class, position and
+    length of every row are kept in compact arrays over the encoded flight
+    data, without parsing any of them. The rows can then be filtered, and only
+    the selected ones made into elements. It suits pages with a lot of rows
+    you only look at a few of.
+
+    ```py
+    >>> table = FlightRowTable.from_decoded(decode_raw_flight_data(raw))
+    >>> table
+    FlightRowTable(<47 rows>)
+    >>> table.filter(tags=["I"], min_length=1000).materialize()
+    {3: Module(...), 12: Module(...)}
+    ```
+
+    The columns are `array.array`, so they can also be read by NumPy without
+    copy, like `numpy.frombuffer(table.lengths, dtype=numpy.int64)`.
+    """
+
+    def __init__(self, buffer: bytes, *, validate: Validation | None = None):
+        """Splits the flight data into rows.
+
+        Args:
+            buffer (bytes): The encoded flight data (the joined output of
+                `decode_raw_flight_data(...)`, or the body of a RSC response).
+            validate (Validation, optional): How much the elements are
+                checked, see `njsparser.parser.types.Validation`. Defaults to
+                `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+        """
+        self.buffer = buffer
+        "The encoded flight data."
+        self.validate = validate
+        self.tag_names: list[str | None] = []
+        """The class of the rows (`"I"`, `"HL"`, ..., None) of each tag id."""
+        self.indexes = array("q")
+        "The index of each row (-1 if it has none)."
+        self.tags = array("H")
+        "The tag id of each row, see `tag_names`."
+        self.offsets = array("q")
+        "Where the value of each row starts in the buffer."
+        self.lengths = array("q")
+        "The size of the value of each row, in bytes."
+        with _stage("split"):
+            tag_ids = {}
+            for index, value_class, start, end in _tokenize(buffer):
+                if (tag := tag_ids.get(value_class)) is None:
+                    tag = tag_ids[value_class] = len(self.tag_names)
+                    self.tag_names.append(value_class)
+                self.indexes.append(-1 if index is None else index)
+                self.tags.append(tag)
+                self.offsets.append(start)
+                self.lengths.append(end - start)
+
+    @classmethod
+    def from_decoded(
+        cls,
+        decoded_raw_flight_data: List[str],
+        *,
+        validate: Validation | None = None,
+    ) -> "FlightRowTable":
+        """Creates the table from the output of `decode_raw_flight_data(...)`.
+
+        Args:
+            decoded_raw_flight_data (List[str]): The chunks of flight data.
+            validate (Validation, optional): See `FlightRowTable.__init__`.
+
+        Returns:
+            FlightRowTable: The table.
+        """
+        return cls(buffer="".join(decoded_raw_flight_data).encode(), validate=validate)
+
+    def __repr__(self):
+        return f"FlightRowTable(<{len(self)} rows>)"
+
+    def __len__(self):
+        return len(self.indexes)
+
+    def __iter__(self) -> Iterator[tuple[int | None, str | None, int, int]]:
+        "Yields the index, class, value start and value end of each row."
+        tag_names = self.tag_names
+        for index, tag, offset, length in zip(self.indexes, self.tags, self.offsets, self.lengths):
+            yield None if index == -1 else index, tag_names[tag], offset, offset + length
+
+    def select(self, mask: Iterable[bool]) -> "FlightRowTable":
+        """Returns a table of the rows for which the mask is true. It shares
+        the buffer of this one.
+
+        Args:
+            mask (Iterable[bool]): A boolean for each row.
+
+        Returns:
+            FlightRowTable: The selected rows.
+        """
+        table = object.__new__(type(self))
+        table.buffer, table.validate, table.tag_names = self.buffer, self.validate, self.tag_names
+        mask = bytes(map(bool, mask))
+        for name in ("indexes", "tags", "offsets", "lengths"):
+            column = getattr(self, name)
+            setattr(table, name, array(column.typecode, compress(column, mask)))
+        return table
+
+    def filter(
+        self,
+        *,
+        tags: Iterable[str | None] | None = None,
+        only: _only = None,
+        min_length: int | None = None,
+        max_length: int | None = None,
+    ) -> "FlightRowTable":
+        """Returns a table of the rows matching all of the given conditions.
+
+        Args:
+            tags (Iterable[str | None] | None, optional): The classes of the
+                rows to keep, like `["I", "HL"]` (None for rows without).
+                Defaults to None.
+            only (_only, optional): The element classes (or their names) to
+                keep the rows that can give them. Defaults to None.
+            min_length (int | None, optional): Keeps the rows with values of
+                at least this many bytes. Defaults to None.
+            max_length (int | None, optional): Keeps the rows with values of
+                at most this many bytes. Defaults to None.
+
+        Returns:
+            FlightRowTable: The selected rows.
+        """
+        masks = []
+        for value_classes in (tags, None if only is None else _get_value_classes(only)):
+            if value_classes is not None:
+                value_classes = set(value_classes)
+                keep = [name in value_classes for name in self.tag_names]
+                masks.append(map(keep.__getitem__, self.tags))
+        if min_length is not None:
+            masks.append(map(min_length.__le__, self.lengths))
+        if max_length is not None:
+            masks.append(map(max_length.__ge__, self.lengths))
+        if not masks:
+            return self.select(repeat(True, len(self)))
+        return self.select(map(all, zip(*masks)))
+
+    def materialize(self) -> FD:
+        """Makes the elements of the rows.
+
+        Returns:
+            FD: The elements by index. Elements without index are listed in
+                order under the `None` key.
+        """
+        indexed_result = {}
+        with memoryview(self.buffer) as view:
+            for index, value_class, start, end in self:
+                _add_element(
+                    indexed_result,
+                    _resolve_row(view[start:end], value_class, index, self.validate),
+                )
+        return indexed_result
+
+class FlightDataParser:
+    """An incremental (push) parser of flight data. Feed it the flight data
+    as it arrives (from a `text/x-component` response, or from the chunks of
+    `self.__next_f` of an html being downloaded), and it returns the elements
+    of every row as soon as it is complete. Only the unfinished end of the data
+    is kept in memory.
+
+    ```py
+    >>> parser = FlightDataParser()
+    >>> for chunk in response.iter_content(chunk_size=None):
+    ...     for element in parser.feed(chunk):
+    ...         ...
+    >>> remaining = parser.close()
+    ```
+    """
+
+    def __init__(self, *, only: _only = None, validate: Validation | None = None):
+        """Creates the parser.
+
+        Args:
+            only (_only, optional): The element classes (or their names) you
+                are interested in. The rows that cannot give any of them are
+                skipped without being parsed. Defaults to None.
+            validate (Validation, optional): How much the elements are
+                checked, see `njsparser.parser.types.Validation`. Defaults to
+                `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+        """
+        self._validate = validate
+        self._value_classes = None if only is None else _get_value_classes(only)
+        self._buffer = bytearray()
+        self._resume = None
+        self.form_state = None
+        "The form state, if a `Segment.is_form_state` segment was fed."
+        self.closed = False
+        "If the parser was closed."
+
+    def __repr__(self):
+        return f"FlightDataParser(<{len(self._buffer)} bytes pending>)"
+
+    def feed(self, data: bytes | str) -> list[Element]:
+        """Feeds some flight data to the parser.
+
+        Args:
+            data (bytes | str): The next part of the flight data.
+
+        Raises:
+            ValueError: The parser is closed.
+
+        Returns:
+            list[Element]: The elements of the rows completed by this data.
+        """
+        if self.closed is True:
+            raise ValueError("Cannot feed a closed parser.")
+        self._buffer += data.encode() if isinstance(data, str) else data
+        return self._parse(final=False)
+
+    def feed_segment(self, segment: list) -> list[Element]:
+        """Feeds a segment of `self.__next_f` (an item of the output of
+        `get_raw_flight_data(...)`) to the parser, decoding it like
+        `decode_raw_flight_data(...)` does.
+
+        Args:
+            segment (list): The segment, like `[1, "..."]`.
+
+        Raises:
+            KeyError: Unknown segment type.
+
+        Returns:
+            list[Element]: The elements of the rows completed by this segment.
+        """
+        if segment[0] == Segment.is_bootstrap:
+            return []
+        elif segment[0] == Segment.is_not_bootstrap:
+            return self.feed(segment[1])
+        elif segment[0] == Segment.is_form_state:
+            self.form_state = segment[1]
+            return []
+        elif segment[0] == Segment.is_binary:
+            return self.feed(base64.b64decode(segment[1].encode()))
+        else:
+            raise KeyError(f'Unknown segment type {segment[0]=}')
+
+    def close(self) -> list[Element]:
+        """Tells the parser there is no more data to come.
+
+        Returns:
+            list[Element]: The elements of the remaining rows.
+        """
+        if self.closed is True:
+            return []
+        self.closed = True
+        result = self._parse(final=True)
+        self._buffer.clear()
+        return result
+
+    def _parse(self, final: bool) -> list[Element]:
+        buffer, result = self._buffer, []
+        rows, pos, resume = _scan_rows(buffer, final=final, resume=self._resume)
+        # The view is released before the buffer is resized.
+        with memoryview(buffer) as view:
+            for index, value_class, start, end in rows:
+                if self._value_classes is not None and value_class not in self._value_classes:
+                    continue
+                # (The texts cannot keep views of the buffer, it is resized.)
+                result.append(_resolve_row(
+                    bytes(view[start:end]) if value_class == "T" else view[start:end],
+                    value_class,
+                    index,
+                    self._validate,
+                ))
+        # The row we are on is incomplete, the next data will resume searching
+        # for its end where it stopped.
+        self._resume = None if resume is None else (resume[0] - pos, resume[1])
+        del buffer[:pos]
+        return result
+
+def get_flight_data_from_rsc(
+    value: bytes | str,
+    *,
+    lazy: bool = None,
+    only: _only = None,
+    validate: Validation | None = None,
+) -> FD:
+    """Returns the flight data of a raw RSC response, which is the body of the
+    response to a request made with the `RSC: 1` header, or to an url with a
+    `?_rsc=` query (`Content-Type: text/x-component`). It doesn't need the
+    html page, nor any decoding of its scripts.
+
+    Args:
+        value (bytes | str): The body of the RSC response.
+        lazy (bool, optional): If `True`, returns a `LazyFD`. Defaults to
+            `False`.
+        only (_only, optional): The element classes (or their names) you are
+            interested in. The rows that cannot give any of them are skipped
+            without being parsed. Defaults to None.
+        validate (Validation, optional): How much the elements are checked,
+            see `njsparser.parser.types.Validation`. Defaults to
+            `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+
+    Returns:
+        FD | LazyFD: The flight data.
+    """
+    buffer = value.encode() if isinstance(value, str) else value
+    if lazy is True:
+        return LazyFD(buffer=buffer, only=only, validate=validate)
+    return parse_decoded_raw_flight_data(buffer, only=only, validate=validate)
+
+def _page_flight_data(page: Page, only: _only = None, validate: Validation | None = None) -> FD | None:
+    """The flight data of the page, parsed once for each `only` and validation.
+    If the page's flight data was already parsed with the rows asked for (and
+    the same validation), its elements are given again instead."""
+    if (buffer := page.flight_data_buffer) is None:
+        return
+    if (value_classes := None if only is None else _get_value_classes(only)) is not None:
+        value_classes = frozenset(value_classes)
+    validate = _validation(validate)
+    for (parsed_classes, parsed_validate), flight_data in page._parsed_flight_data.items():
+        if parsed_validate != validate:
+            continue
+        elif parsed_classes == value_classes:
+            return flight_data
+        elif parsed_classes is None or (value_classes is not None and value_classes <= parsed_classes):
+            return _only_rows(flight_data, value_classes)
+    flight_data = _parse_rows(buffer, value_classes, validate)
+    page._parsed_flight_data[value_classes, validate] = flight_data
+    return flight_data
+
+def _only_rows(flight_data: FD, value_classes: frozenset[str | None]) -> FD:
+    "The elements of the flight data given by rows of the given classes."
+    result = {}
+    for index, element in flight_data.items():
+        if index is None:
+            if elements := [item for item in element if item.value_class in value_classes]:
+                result[None] = elements
+        elif element.value_class in value_classes:
+            result[index] = element
+    return result
 
-def get_flight_data(value: _supported_tree):
+def get_flight_data(
+    value: _supported_tree,
+    *,
+    backend: _backend = None,
+    lazy: bool = None,
+    only: _only = None,
+    validate: Validation | None = None,
+    stats: ParseStats | None = None,
+):
     """Returns the flight data of the page (the data contained in `self.__next_f`).
 
     Args:
         value (_supported_tree): The page to get the data from.
+        backend (_backend, optional): How to find the flight data scripts in
+            the page, see `get_raw_flight_data`. Defaults to `"lxml"`.
+        lazy (bool, optional): If `True`, returns a `LazyFD` that parses each
+            row only when it is accessed. Defaults to `False`.
+        only (_only, optional): The element classes (or their names) you are
+            interested in. The rows that cannot give any of them are skipped
+            without being parsed. Defaults to None (every row is parsed).
+        validate (Validation, optional): How much the elements are checked,
+            see `njsparser.parser.types.Validation`. Defaults to
+            `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+        stats (ParseStats, optional): Stats to report the parsing to (timings,
+            sizes, rows, ...), see `njsparser.ParseStats`. Defaults to None.
 
     Returns:
-        dict[int, Any] | None: The flight data, if it exists, otherwise, None.
+        dict[int, Any] | LazyFD | None: The flight data, if it exists, otherwise,
+            None.
     """
-    if (raw_flight_data := get_raw_flight_data(value=value)) is not None:
-        decoded_raw_flight_data = decode_raw_flight_data(raw_flight_data=raw_flight_data)
-        return parse_decoded_raw_flight_data(decoded_raw_flight_data=decoded_raw_flight_data)
\ No newline at end of file
+    if stats is not None:
+        with _collect(stats):
+            stats.bytes_in += _value_size(value=value)
+            return get_flight_data(
+                value=value, backend=backend, lazy=lazy, only=only, validate=validate
+            )
+    if isinstance(value, Page) and lazy is not True:
+        return _page_flight_data(page=value, only=only, validate=validate)
+    # The segments are decoded directly into the encoded flight data, that
+    # the rows are then read from.
+    if isinstance(value, Page):
+        buffer = value.flight_data_buffer
+    elif (raw_flight_data := get_raw_flight_data(value=value, backend=backend)) is not None:
+        with _stage("decode"):
+            buffer = _decode_to_buffer(raw_flight_data=raw_flight_data)
+    else:
+        return
+    if buffer is None:
+        return
+    elif lazy is True:
+        return LazyFD(buffer=buffer, only=only, validate=validate)
+    else:
+        return parse_decoded_raw_flight_data(
+            decoded_raw_flight_data=buffer,
+            only=only,
+            validate=validate,
+        )
\ No newline at end of file
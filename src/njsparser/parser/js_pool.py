@@ -0,0 +1,217 @@
+"""Evaluates JS in a pool of worker processes running SpiderMonkey."""
+
+from typing import Any
+import importlib.util
+import threading
+import queue
+import sys
+
+__all__ = (
+    "JSEvaluationError",
+    "JSWorkerPool",
+)
+
+# How long a worker may take to start its JS engine, in seconds.
+_start_timeout = 60.
+
+class JSEvaluationError(RuntimeError):
+    "The JS raised an error, or its worker died (e.g. out of memory) while evaluating it."
+
+def _plain(value: Any, null: Any) -> Any:
+    """The value given by pythonmonkey, with plain dicts, lists, strings and
+    numbers (its proxies can't be pickled, nor dumped by orjson)."""
+    if isinstance(value, dict):
+        return {str(key): _plain(item, null) for key, item in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_plain(item, null) for item in value]
+    elif value is null:
+        return None
+    elif isinstance(value, str):
+        return str(value)
+    elif isinstance(value, bool):
+        return bool(value)
+    elif isinstance(value, int):
+        return int(value)
+    elif isinstance(value, float):
+        return float(value)
+    return value
+
+def _serve(connection, memory_limit: int | None):
+    "Evaluates the scripts received from the connection, until it is closed."
+    if memory_limit is not None:
+        import resource
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    try:
+        import pythonmonkey
+        pythonmonkey.eval("0")
+    except BaseException as error:
+        connection.send(("error", f"{type(error).__name__}: {error}"))
+        return
+    connection.send(("ok", None))
+    null = getattr(pythonmonkey, "null", None)
+    while True:
+        try:
+            script = connection.recv()
+        except EOFError:
+            return
+        try:
+            connection.send(("ok", _plain(pythonmonkey.eval(script), null)))
+        except Exception as error:
+            connection.send(("error", f"{type(error).__name__}: {error}"))
+
+class _Worker:
+    "A worker process, and the connection to it."
+
+    def __init__(self, context, memory_limit: int | None):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child, memory_limit), daemon=True)
+        self.process.start()
+        child.close()
+        self.started = False
+        self.evaluations = 0
+
+    def receive(self, timeout: float | None) -> tuple[str, Any]:
+        if not self.connection.poll(timeout):
+            raise TimeoutError(f"The JS didn't finish in {timeout}s.")
+        try:
+            return self.connection.recv()
+        except EOFError:
+            raise JSEvaluationError(f"The worker died (exit code {self.process.exitcode}).") from None
+
+    def evaluate(self, script: str, timeout: float | None) -> tuple[str, Any]:
+        if not self.started:
+            status, value = self.receive(timeout=_start_timeout)
+            if status != "ok":
+                raise JSEvaluationError(f"The worker couldn't start its JS engine ({value}).")
+            self.started = True
+        try:
+            self.connection.send(script)
+        except OSError:
+            raise JSEvaluationError(f"The worker died (exit code {self.process.exitcode}).") from None
+        self.evaluations += 1
+        return self.receive(timeout=timeout)
+
+    def close(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+class JSWorkerPool:
+    """A pool of worker processes evaluating JS with SpiderMonkey (needs
+    `pythonmonkey`, `pip install njsparser[js]`). The workers start their
+    engine once, and are then reused. A script that takes too long gets its
+    worker killed (and replaced), and the memory of the workers can be
+    limited, so that a broken or hostile script can't hang or crash the
+    current process. It can be used from several threads.
+
+    ```py
+    >>> with JSWorkerPool(workers=2, timeout=5) as pool:
+    ...     parse_buildmanifest(script, pool=pool)
+    ```
+    """
+
+    def __init__(
+        self,
+        workers: int = 1,
+        *,
+        timeout: float | None = 10.,
+        memory_limit: int | None = None,
+        max_evaluations: int | None = 100,
+    ):
+        """Starts the workers.
+
+        Args:
+            workers (int, optional): How many processes evaluate the scripts.
+                Defaults to 1.
+            timeout (float | None, optional): How long a script may run, in
+                seconds, None for no limit. Defaults to 10.
+            memory_limit (int | None, optional): How much memory (address
+                space, in bytes) a worker may use, None for no limit. Only
+                on unix. SpiderMonkey reserves a lot of address space, so
+                keep it above 1GB. Defaults to None.
+            max_evaluations (int | None, optional): How many scripts a worker
+                evaluates before being replaced by a new one, None to never
+                replace it. Defaults to 100.
+
+        Raises:
+            ValueError: Invalid number of workers, or `memory_limit` on windows.
+            ImportError: pythonmonkey isn't installed.
+        """
+        if workers < 1:
+            raise ValueError(f"Needs at least one worker, got {workers}.")
+        if memory_limit is not None and sys.platform == "win32":
+            raise ValueError("`memory_limit` is only supported on unix.")
+        if importlib.util.find_spec("pythonmonkey") is None:
+            raise ImportError("`JSWorkerPool` needs pythonmonkey (`pip install njsparser[js]`).")
+        import multiprocessing
+        # (Forking a process which may run SpiderMonkey or threads isn't safe.)
+        self._context = multiprocessing.get_context("spawn")
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.max_evaluations = max_evaluations
+        self._idle: queue.Queue[_Worker] = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        for _ in range(workers):
+            self._idle.put(self._start())
+
+    def _start(self) -> _Worker:
+        return _Worker(context=self._context, memory_limit=self.memory_limit)
+
+    def evaluate(self, script: str, *, timeout: float | None = None) -> Any:
+        """Evaluates the script in one of the workers (waiting for one to be
+        free).
+
+        Args:
+            script (str): The JS to evaluate.
+            timeout (float | None, optional): How long it may run, in seconds.
+                Defaults to None (the `timeout` of the pool).
+
+        Raises:
+            ValueError: The pool is closed.
+            TimeoutError: The script took too long (its worker is replaced).
+            JSEvaluationError: The script raised an error, or its worker died.
+
+        Returns:
+            Any: The value of the script (objects as dicts, arrays as lists,
+                `null` and `undefined` as None).
+        """
+        if self._closed:
+            raise ValueError("The pool is closed.")
+        timeout = self.timeout if timeout is None else timeout
+        worker = self._idle.get()
+        healthy = False
+        try:
+            status, value = worker.evaluate(script=script, timeout=timeout)
+            healthy = True
+        finally:
+            if not healthy or (
+                self.max_evaluations is not None
+                and worker.evaluations >= self.max_evaluations
+            ):
+                worker.close()
+                worker = None if self._closed else self._start()
+            with self._lock:
+                if self._closed and worker is not None:
+                    worker.close()
+                elif worker is not None:
+                    self._idle.put(worker)
+        if status != "ok":
+            raise JSEvaluationError(value)
+        return value
+
+    def close(self):
+        "Stops the workers (those evaluating a script are stopped when they finish)."
+        with self._lock:
+            self._closed = True
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
@@ -1,19 +1,364 @@
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Literal
+import threading
+import orjson
+import math
+import sys
 import re
-from typing import Any
-import pythonmonkey
+import os
 
-from ..utils import logger, join
+from ..utils import join
+from ..stats import _warn, _sample
 from .urls import _NS
+from .js_pool import JSWorkerPool, JSEvaluationError, _plain
 
 _build_manifest_name, _ssg_manifest_name = "_buildManifest.js", "_ssgManifest.js"
 _build_manifest_path, _ssg_manifest_path = f"/{_build_manifest_name}", f"/{_ssg_manifest_name}"
 _manifest_paths = (_build_manifest_path, _ssg_manifest_path)
 
-def parse_buildmanifest(script: str) -> dict[str, Any]:
+_js_backend = Literal["python", "pythonmonkey"]
+
+# The tokens of the JS the build manifests are written in (spaces and
+# comments are skipped). Anything else is a token of its own character, and
+# the end of the script an empty token.
+_re_js_token = re.compile(r"""
+    (?:\s+|//[^\n]*|/\*.*?\*/)*
+    (
+        "(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*'
+      | 0[xX][0-9a-fA-F]+|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?
+      | [A-Za-z_$][\w$]*
+      | &&|[{}\[\]():,.;=+!-]
+      | .|$
+    )
+""", re.VERBOSE | re.DOTALL)
+_re_js_escape = re.compile(r"\\(u\{[0-9a-fA-F]+\}|u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|\r\n|.)", re.DOTALL)
+_js_escapes = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+# The globals the manifests may use, with their values.
+_js_globals = {"undefined": None, "NaN": math.nan, "Infinity": math.inf}
+_js_literals = {"true": True, "false": False, "null": None}
+_js_unary = frozenset(("!", "-", "void"))
+# How deep the expressions (and function calls) may be nested, how many nodes
+# may be evaluated, and how long the strings made may be, so that a hostile
+# script can't make the evaluation recurse, or grow, without bound.
+_js_max_depth = 64
+_js_max_steps = 1_000_000
+_js_max_string = 1 << 20
+# What follows the manifest in the scripts.
+_build_manifest_cb = ("self", ".", "__BUILD_MANIFEST_CB", "&&", "self", ".", "__BUILD_MANIFEST_CB", "(", ")")
+
+class _UnsupportedScript(ValueError):
+    "The script uses some JS that `_evaluate_build_manifest` doesn't support."
+
+class _ScriptOverLimit(ValueError):
+    """The script is too nested or long to evaluate (see `_js_max_depth`). It
+    is only evaluated by SpiderMonkey in a `JSWorkerPool` then."""
+
+class _JSFunction:
+    "A JS function returning an expression, and the variables it sees."
+    __slots__ = ("params", "body", "env")
+
+    def __init__(self, params: list[str], body: tuple, env: dict[str, Any]):
+        self.params, self.body, self.env = params, body, env
+
+def _is_js_name(token: str) -> bool:
+    "Tells if the token is a name (variable, key or keyword)."
+    return token[:1].isascii() and (token[0].isalpha() or token[0] in "_$")
+
+def _js_unescape(match: re.Match) -> str:
+    escape = match.group(1)
+    if escape[0] in "ux" and len(escape) > 1:
+        return chr(int(escape[1:].strip("{}"), 16))
+    elif escape in ("\n", "\r\n", "\r", "\u2028", "\u2029"):
+        return "" # (Line continuation.)
+    return _js_escapes.get(escape, escape)
+
+def _js_string(token: str) -> str:
+    value = token[1:-1]
+    if "\\" in value:
+        value = _re_js_escape.sub(_js_unescape, value)
+        # (The surrogate pairs of `\uXXXX\uXXXX` are joined.)
+        value = value.encode("utf-16", "surrogatepass").decode("utf-16")
+    return value
+
+def _js_number(token: str) -> int | float:
+    if token[:2] in ("0x", "0X"):
+        return int(token, 16)
+    elif token.isdigit():
+        return int(token)
+    return float(token)
+
+def _js_to_string(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    elif isinstance(value, bool):
+        return "true" if value else "false"
+    elif isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        elif math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        elif value.is_integer() and abs(value) < 1e21:
+            return str(int(value))
+        return repr(value)
+    elif isinstance(value, int):
+        return str(value)
+    # (`null` and `undefined` are both None, so they can't be told apart.)
+    raise _UnsupportedScript(f"can't make a string of {type(value).__name__}")
+
+def _js_truthy(value: Any) -> bool:
+    if isinstance(value, (dict, list, _JSFunction)):
+        return True
+    elif isinstance(value, float) and math.isnan(value):
+        return False
+    return bool(value)
+
+class _JSParser:
+    """Parses the JS expressions of the build manifests into nodes (tuples
+    starting by their kind): literals, objects, arrays, variables, `void`,
+    `!`, `-`, `+`, and functions returning an expression, called."""
+
+    def __init__(self, tokens: list[str]):
+        # (They end with the empty token.)
+        self.tokens, self.pos, self.depth = tokens, 0, 0
+
+    def expect(self, text: str):
+        if (token := self.tokens[self.pos]) != text:
+            raise _UnsupportedScript(f"expected {text!r}, got {token!r}")
+        self.pos += 1
+
+    def expression(self) -> tuple:
+        node = self.operand()
+        if self.tokens[self.pos] != "+":
+            return node
+        # (The operands of `a + b + c` are added from left to right.)
+        operands = [node]
+        while self.tokens[self.pos] == "+":
+            self.pos += 1
+            operands.append(self.operand())
+        return ("add", operands)
+
+    def operand(self) -> tuple:
+        "A value, with the `!`, `-` or `void` before it, and the calls after it."
+        self.depth += 1
+        if self.depth > _js_max_depth:
+            raise _ScriptOverLimit(f"expressions nested more than {_js_max_depth} times")
+        token = self.tokens[self.pos]
+        if token in _js_unary:
+            self.pos += 1
+            node = (token, self.operand())
+        else:
+            node = self.primary()
+            while self.tokens[self.pos] == "(":
+                node = ("call", node, self.list(")"))
+        self.depth -= 1
+        return node
+
+    def list(self, close: str) -> list[tuple]:
+        "The comma separated expressions up to `close` (the opening one is next)."
+        self.pos += 1
+        tokens, items = self.tokens, []
+        while tokens[self.pos] != close:
+            # (An array hole is `undefined`.)
+            items.append(("value", None) if close == "]" and tokens[self.pos] == "," else self.expression())
+            if tokens[self.pos] != close:
+                self.expect(",")
+        self.pos += 1
+        return items
+
+    def primary(self) -> tuple:
+        token = self.tokens[self.pos]
+        self.pos += 1
+        first = token[:1]
+        if first in ("\"", "'") and len(token) > 1:
+            return ("value", _js_string(token))
+        elif first.isdigit() or (first == "." and len(token) > 1):
+            return ("value", _js_number(token))
+        elif token == "{":
+            return self.object()
+        elif token == "[":
+            self.pos -= 1
+            return ("array", self.list("]"))
+        elif token == "(":
+            node = self.expression()
+            self.expect(")")
+            return node
+        elif token == "function":
+            return self.function()
+        elif token in _js_literals:
+            return ("value", _js_literals[token])
+        elif _is_js_name(token):
+            return ("name", token)
+        raise _UnsupportedScript(f"unexpected {token!r}")
+
+    def object(self) -> tuple:
+        tokens, items = self.tokens, []
+        while tokens[self.pos] != "}":
+            key = tokens[self.pos]
+            self.pos += 1
+            if key[:1] in ("\"", "'") and len(key) > 1:
+                key = _js_string(key)
+            elif key[:1].isdigit():
+                key = _js_to_string(_js_number(key))
+            elif not _is_js_name(key):
+                raise _UnsupportedScript(f"unexpected key {key!r}")
+            self.expect(":")
+            items.append((key, self.expression()))
+            if tokens[self.pos] != "}":
+                self.expect(",")
+        self.pos += 1
+        return ("object", items)
+
+    def function(self) -> tuple:
+        if _is_js_name(self.tokens[self.pos]):
+            self.pos += 1 # (Its name.)
+        params = []
+        for node in self.list(")"):
+            if node[0] != "name":
+                raise _UnsupportedScript("unsupported function parameter")
+            params.append(node[1])
+        self.expect("{")
+        self.expect("return")
+        body = self.expression()
+        if self.tokens[self.pos] == ";":
+            self.pos += 1
+        self.expect("}")
+        return ("function", params, body)
+
+class _JSEvaluator:
+    """Evaluates the nodes of `_JSParser`, within `_js_max_depth` nested
+    nodes (and calls) and `_js_max_steps` nodes evaluated."""
+
+    def __init__(self):
+        self.steps, self.depth = 0, 0
+
+    def evaluate(self, node: tuple, env: dict[str, Any]) -> Any:
+        "The value of the node, with the variables of `env`."
+        self.steps += 1
+        if self.steps > _js_max_steps:
+            raise _ScriptOverLimit(f"more than {_js_max_steps} steps to evaluate")
+        kind = node[0]
+        if kind == "value":
+            return node[1]
+        elif kind == "name":
+            if node[1] in env:
+                return env[node[1]]
+            elif node[1] in _js_globals:
+                return _js_globals[node[1]]
+            raise _UnsupportedScript(f"unknown variable {node[1]!r}")
+        elif kind == "function":
+            return _JSFunction(params=node[1], body=node[2], env=env)
+        self.depth += 1
+        if self.depth > _js_max_depth:
+            raise _ScriptOverLimit(f"nodes (and calls) nested more than {_js_max_depth} times")
+        value = self.evaluate_nested(kind, node, env)
+        self.depth -= 1
+        return value
+
+    def evaluate_nested(self, kind: str, node: tuple, env: dict[str, Any]) -> Any:
+        "The value of the node containing others."
+        evaluate = self.evaluate
+        if kind == "object":
+            return {key: evaluate(value, env) for key, value in node[1]}
+        elif kind == "array":
+            return [evaluate(item, env) for item in node[1]]
+        elif kind == "void":
+            evaluate(node[1], env)
+            return None
+        elif kind == "!":
+            return not _js_truthy(evaluate(node[1], env))
+        elif kind == "-":
+            value = evaluate(node[1], env)
+            if type(value) not in (int, float):
+                raise _UnsupportedScript(f"can't negate {type(value).__name__}")
+            return -value
+        elif kind == "add":
+            operands = iter(node[1])
+            left = evaluate(next(operands), env)
+            for operand in operands:
+                left = _js_add(left, evaluate(operand, env))
+            return left
+        elif kind == "call":
+            function = evaluate(node[1], env)
+            if not isinstance(function, _JSFunction):
+                raise _UnsupportedScript(f"can't call {type(function).__name__}")
+            args = [evaluate(arg, env) for arg in node[2]]
+            # (The missing arguments are `undefined`.)
+            args += [None] * (len(function.params) - len(args))
+            return evaluate(function.body, function.env | dict(zip(function.params, args)))
+        raise _UnsupportedScript(f"unknown node {kind!r}")
+
+def _js_add(left: Any, right: Any) -> Any:
+    "`left + right`, for strings and numbers."
+    if isinstance(left, str) or isinstance(right, str):
+        value = _js_to_string(left) + _js_to_string(right)
+        if len(value) > _js_max_string:
+            raise _ScriptOverLimit(f"string of more than {_js_max_string} characters")
+        return value
+    elif type(left) in (int, float) and type(right) in (int, float):
+        return left + right
+    raise _UnsupportedScript(f"can't add {type(left).__name__} and {type(right).__name__}")
+
+def _evaluate_build_manifest(script: str) -> dict[str, Any]:
+    """Evaluates the build manifest script, written in the few JS the build
+    manifests use (`self.__BUILD_MANIFEST=` an object, or a function called
+    at once returning it, followed by the `self.__BUILD_MANIFEST_CB` call).
+
+    Raises:
+        _UnsupportedScript: The script uses some other JS.
+        _ScriptOverLimit: The script is too nested or long to evaluate.
+    """
+    tokens = _re_js_token.findall(script)
+    if tokens[:4] != ["self", ".", "__BUILD_MANIFEST", "="]:
+        raise _UnsupportedScript("not assigning `self.__BUILD_MANIFEST`")
+    parser = _JSParser(tokens=tokens[4:])
+    node = parser.expression()
+    rest = tuple(token for token in parser.tokens[parser.pos:] if token not in (";", ""))
+    if rest not in ((), _build_manifest_cb, (",", *_build_manifest_cb)):
+        raise _UnsupportedScript("unexpected statements after the manifest")
+    return _JSEvaluator().evaluate(node, env={})
+
+def _evaluate_with_pythonmonkey(script: str, pool: JSWorkerPool | None) -> Any:
+    "Evaluates the build manifest script with SpiderMonkey (in the pool if given)."
+    func = f"""(function() {{self={{}};{script.removesuffix(";")};return self.__BUILD_MANIFEST}})();"""
+    if pool is not None:
+        try:
+            return pool.evaluate(script=func)
+        except (JSEvaluationError, TimeoutError) as error:
+            _warn("invalid_build_manifest", "Could not parse the given build manifest `%s` (%s)", _sample(script), error)
+            return None
+    # (Importing pythonmonkey starts a JS engine, so it is only done when needed.)
+    import pythonmonkey
+    try:
+        return _plain(pythonmonkey.eval(func), null=getattr(pythonmonkey, "null", None))
+    except pythonmonkey.SpiderMonkeyError:
+        _warn("invalid_build_manifest", "Could not parse the given build manifest `%s`", _sample(script))
+
+def parse_buildmanifest(
+    script: str,
+    *,
+    backend: _js_backend = None,
+    pool: JSWorkerPool | None = None,
+) -> dict[str, Any]:
     """Parses the buildmanifest script (`"/_buildManifest.js"`).
 
     Args:
         script (str): The content of the script.
+        backend (_js_backend, optional): `"python"` evaluates the few JS the
+            build manifests are written in (literals, string concatenations
+            and functions called at once). `"pythonmonkey"` evaluates it with
+            SpiderMonkey (`pip install njsparser[js]`). Defaults to
+            `"python"`, then `"pythonmonkey"` (if installed) for scripts
+            using other JS.
+        pool (JSWorkerPool | None, optional): The workers that evaluate the
+            script with SpiderMonkey (with a timeout, out of the current
+            process), rather than the current process. The scripts too nested
+            or long for `"python"` are only given to SpiderMonkey if there is
+            a pool. Defaults to None.
+
+    Raises:
+        ValueError: Not a build manifest, or unknown backend.
+        ImportError: `"pythonmonkey"` backend without pythonmonkey installed.
 
     Returns:
         dict[str, Any] | None: The content of the script, or nothing if no matches.
@@ -22,12 +367,26 @@ def parse_buildmanifest(script: str) -> dict[str, Any]:
     if s.startswith("self.__BUILD_MANIFEST") is False:
         raise ValueError( 'Invalid build manifest (not starting by '
                           '`"self.__BUILD_MANIFEST"`).' )
-    func = f"""(function() {{self={{}};{s.removesuffix(";")};return self.__BUILD_MANIFEST}})();"""
+    if backend == "pythonmonkey":
+        return _evaluate_with_pythonmonkey(script=s, pool=pool)
+    elif backend is not None and backend != "python":
+        raise ValueError(f"Unknown backend {backend!r}, use 'python' or 'pythonmonkey'.")
     try:
-        return pythonmonkey.eval(func)
-    except pythonmonkey.SpiderMonkeyError:
-        logger.warning(f'Could not parse the given build manifest `{s}`')
-    
+        return _evaluate_build_manifest(script=s)
+    except (_ScriptOverLimit, RecursionError) as error:
+        # (A hostile script may as well exhaust SpiderMonkey, so it is only
+        # evaluated with a timeout and a memory limit.)
+        if backend is None and pool is not None:
+            return _evaluate_with_pythonmonkey(script=s, pool=pool)
+        _warn("invalid_build_manifest", "Could not parse the given build manifest `%s` (%s)", _sample(s), error)
+    except _UnsupportedScript as error:
+        if backend is None:
+            try:
+                return _evaluate_with_pythonmonkey(script=s, pool=pool)
+            except ImportError:
+                pass
+        _warn("invalid_build_manifest", "Could not parse the given build manifest `%s` (%s)", _sample(s), error)
+
 def get_build_manifest_path(build_id: str, base_path: str = None):
     """Gives the path of the build manifest based on the given build id
     and base path.
@@ -42,3 +401,137 @@ def get_build_manifest_path(build_id: str, base_path: str = None):
     """
     base_path = "" if base_path is None else base_path
     return join(base_path, _NS, build_id, _build_manifest_name)
+
+class ManifestCache:
+    """Keeps the build manifests by site and build id (a build manifest
+    never changes for a build), in memory, and in a directory if given, so
+    that they are fetched and evaluated only once for a build, even between
+    runs. It can be used from several threads.
+
+    ```py
+    >>> cache = ManifestCache("manifests")
+    >>> manifest = cache.fetch(base_url, build_id, base_path=base_path, get=lambda url: requests.get(url).text)
+    ```
+
+    The manifests given are shared, they must not be modified.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None, *, maxsize: int | None = 128):
+        """Creates the cache.
+
+        Args:
+            path (str | os.PathLike | None, optional): The directory where the
+                manifests are kept (as json files), created if needed. None to
+                keep them in memory only. Defaults to None.
+            maxsize (int | None, optional): How many manifests are kept in
+                memory (the least recently used are forgotten), None for no
+                limit. Defaults to 128.
+        """
+        self.path = None if path is None else Path(path)
+        self.maxsize = maxsize
+        self._manifests: OrderedDict[tuple[str, str, str], dict[str, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _key(base_url: str, build_id: str, base_path: str | None) -> tuple[str, str, str]:
+        return (base_url.rstrip("/"), join(base_path) if base_path else "", build_id)
+
+    def _file(self, key: tuple[str, str, str]) -> Path:
+        # (hashlib is slow to import, and only needed with a directory.)
+        import hashlib
+        return self.path / f"{hashlib.sha256(orjson.dumps(key)).hexdigest()[:32]}.json"
+
+    def _remember(self, key: tuple[str, str, str], manifest: dict[str, Any]):
+        with self._lock:
+            self._manifests[key] = manifest
+            self._manifests.move_to_end(key)
+            if self.maxsize is not None and len(self._manifests) > self.maxsize:
+                self._manifests.popitem(last=False)
+
+    def get(self, base_url: str, build_id: str, *, base_path: str | None = None) -> dict[str, Any] | None:
+        """Gives the build manifest of the build of the site, if it is kept.
+
+        Args:
+            base_url (str): The url of the site (`"https://nextjs.org"`).
+            build_id (str): The build id of the site.
+            base_path (str | None, optional): The base path of the site (see
+                `get_build_manifest_path`). Defaults to None.
+
+        Returns:
+            dict[str, Any] | None: The build manifest, or None if not kept.
+        """
+        key = self._key(base_url=base_url, build_id=build_id, base_path=base_path)
+        with self._lock:
+            if (manifest := self._manifests.get(key)) is not None:
+                self._manifests.move_to_end(key)
+                return manifest
+        if self.path is None:
+            return None
+        try:
+            manifest = orjson.loads(self._file(key).read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+        self._remember(key=key, manifest=manifest)
+        return manifest
+
+    def set(self, base_url: str, build_id: str, manifest: dict[str, Any], *, base_path: str | None = None):
+        """Keeps the build manifest of the build of the site (see `get`). It
+        is kept as plain dicts and lists (the values of pythonmonkey are
+        converted).
+
+        Raises:
+            ValueError: The manifest is empty, or not a dict.
+        """
+        self._keep(base_url=base_url, build_id=build_id, manifest=manifest, base_path=base_path)
+
+    def _keep(self, base_url: str, build_id: str, manifest: dict[str, Any], base_path: str | None) -> dict[str, Any]:
+        "Same as `set`, giving the manifest kept."
+        if not isinstance(manifest, dict) or not manifest:
+            raise ValueError(f"Not a build manifest, got {_sample(manifest)}.")
+        # (pythonmonkey is only looked for if it was imported, as its values
+        # can't come from anywhere else.)
+        manifest = _plain(manifest, null=getattr(sys.modules.get("pythonmonkey"), "null", None))
+        key = self._key(base_url=base_url, build_id=build_id, base_path=base_path)
+        self._remember(key=key, manifest=manifest)
+        if self.path is not None:
+            file = self._file(key)
+            # (Written then renamed, so that a file is never read half written.)
+            temporary = file.with_name(f"{file.name}.{os.getpid()}.{threading.get_ident()}")
+            temporary.write_bytes(orjson.dumps(manifest))
+            os.replace(temporary, file)
+        return manifest
+
+    def fetch(
+        self,
+        base_url: str,
+        build_id: str,
+        get: Callable[[str], str],
+        *,
+        base_path: str | None = None,
+        **kwargs,
+    ) -> dict[str, Any] | None:
+        """Gives the build manifest of the build of the site, fetching and
+        parsing it only if it isn't kept yet.
+
+        Args:
+            base_url (str): The url of the site (`"https://nextjs.org"`).
+            build_id (str): The build id of the site.
+            get (Callable[[str], str]): Gives the content of the script at
+                the given url.
+            base_path (str | None, optional): The base path of the site (see
+                `get_build_manifest_path`). Defaults to None.
+            **kwargs: Given to `parse_buildmanifest`.
+
+        Returns:
+            dict[str, Any] | None: The build manifest, or None if it couldn't
+                be parsed (it isn't kept then, nor if it is empty).
+        """
+        if (manifest := self.get(base_url, build_id, base_path=base_path)) is not None:
+            return manifest
+        path = get_build_manifest_path(build_id=build_id, base_path=base_path)
+        manifest = parse_buildmanifest(get(base_url.rstrip("/") + path), **kwargs)
+        if isinstance(manifest, dict) and manifest:
+            return self._keep(base_url=base_url, build_id=build_id, manifest=manifest, base_path=base_path)
+        return manifest
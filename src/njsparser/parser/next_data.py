@@ -1,21 +1,64 @@
 import orjson
-from typing import Any
+import re
+import os
+import mmap
+from typing import Any, Iterator
 
-from ..utils import _supported_tree, make_tree
+from ..utils import _supported_tree, _backend, make_tree, Page, _map_file, _select_backend
+from ..stats import _stage
 
-def get_next_data(value: _supported_tree) -> dict[str, Any]:
+# The start of the `<script id='__NEXT_DATA__'>`.
+_re_b_next_data_script = re.compile(rb'<script(?:\s[^>]*)?\sid=["\']?__NEXT_DATA__\b[^>]*>')
+
+def get_next_data(value: _supported_tree, *, backend: _backend = None) -> dict[str, Any]:
     """Returns the dict content of the `<script id='__NEXT_DATA__'>`, if it exists.
 
     Args:
         value (_supported_tree): The page to get the value from.
+        backend (_backend, optional): `"lxml"` builds the tree of the page
+            and reads the script. `"scan"` finds the script directly in the
+            str or bytes page. Ignored if `value` is a `Page`. Defaults to
+            `"lxml"`, or `"scan"` if `value` is a path or an `mmap` (the file
+            is then mapped in memory, and only the script is copied out of
+            it).
+
+    Raises:
+        ValueError: Unknown backend.
 
     Returns:
         dict[str, Any] | None: The dict content of the script, if there is, otherwise
             None.
     """
-    if len(nextdata := make_tree(value=value).xpath("//script[@id='__NEXT_DATA__']/text()")):
-        assert len(nextdata) == 1, f"invalid {len(nextdata)=}"
-        return orjson.loads(nextdata.pop().strip())
+    if isinstance(value, Page):
+        return value.next_data
+    backend = _select_backend(value=value, backend=backend)
+    if backend == "lxml":
+        return _next_data_from_texts(
+            texts=make_tree(value=value).xpath("//script[@id='__NEXT_DATA__']/text()")
+        )
+    elif isinstance(value, os.PathLike):
+        with _map_file(path=value) as mapped:
+            return get_next_data(value=mapped, backend="scan")
+    else:
+        return _next_data_from_texts(texts=list(_scan_next_data_scripts(value=value)))
+
+def _scan_next_data_scripts(value: bytes | str | mmap.mmap) -> Iterator[bytes]:
+    "Yields the content of the `__NEXT_DATA__` scripts, found in the bytes of the page."
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, (bytes, mmap.mmap)):
+        raise TypeError( 'the "scan" backend waited a `str`, `bytes` or `mmap`, '
+                         'got `%s`' % type(value).__name__ )
+    for match in _re_b_next_data_script.finditer(value):
+        if (end := value.find(b"</script", match.end())) == -1:
+            end = len(value)
+        yield value[match.end():end]
+
+def _next_data_from_texts(texts: list[str | bytes]) -> dict[str, Any] | None:
+    if len(texts):
+        assert len(texts) == 1, f"invalid {len(texts)=}"
+        with _stage("next_data"):
+            return orjson.loads(texts[0].strip())
     
 def has_next_data(value: _supported_tree):
     """Tells if the given page contains a `<script id='__NEXT_DATA__'>`.
@@ -26,4 +69,4 @@ def has_next_data(value: _supported_tree):
     Returns:
         bool: True if it contain any `__NEXT_DATA__` script, otherwise, False.
     """
-    return get_next_data(value=value) is not None
\ No newline at end of file
+    return get_next_data(value=value) is not None
@@ -1,13 +1,30 @@
-from typing import Any, Literal, Type, TypeVar, TypedDict
-from lxml import etree
-from pydantic.dataclasses import dataclass
-from dataclasses import is_dataclass
+from typing import Any, ClassVar, Iterable, Literal, Type, TypeVar, TypedDict, get_type_hints
+from dataclasses import dataclass, is_dataclass, fields, InitVar
+from functools import cache
 from enum import Enum
+import orjson
 
-from ..utils import logger, join
+from ..utils import join
+from ..stats import _warn_unknown_class
 from .urls import _N
 
 ENABLE_TYPE_VERIF = True
+"The default validation when none is given: `\"fast\"` if True, else `\"off\"`."
+
+LAZY_TEXT_SIZE: int | None = 64 * 1024
+"""The `"T"` rows of at least this many bytes give `Text` elements that are
+only decoded when their value is first accessed (and are not checked). They
+keep a view of the flight data (so the whole of it stays in memory). None to
+always decode them. With the `"strict"` validation, they are always decoded
+(and validated) right away."""
+
+Validation = Literal["off", "fast", "strict"]
+"""How much the elements are checked when made:
+- `"off"`: not at all.
+- `"fast"`: their values have the structure their class expects.
+- `"strict"`: same as `"fast"`, and their fields are validated with pydantic
+  (see `validate_element`), so large texts aren't decoded lazily (see
+  `LAZY_TEXT_SIZE`)."""
 
 __all__ = (
     "Element",
@@ -26,13 +43,37 @@ __all__ = (
     "RSCPayload",
     "Error",
     "resolve_type",
+    "validate_element",
+    "Validation",
     "T",
 )
 
 TE = TypeVar('TE', bound='Element')
 
-@dataclass(frozen=True)
-class Element:
+def _validation(validate: Validation | None) -> Validation:
+    "The validation used when `validate` is given (None for the default one)."
+    if validate is None:
+        return "fast" if ENABLE_TYPE_VERIF is True else "off"
+    return validate
+
+# The elements are frozen dataclasses with `__slots__`: pages give thousands of them,
+# so they must be cheap to make and small in memory. Only `Element` is a dataclass,
+# its subclasses only add properties and checks (in `_check`) to it, and have empty
+# `__slots__` (except `Text`, that can be decoded lazily). Their annotations are the
+# types `validate_element` checks.
+class _ElementType(type):
+    "The type of the elements, giving their `value_class` on the classes too."
+
+    @property
+    def value_class(cls) -> str | None:
+        """The class of the flight data rows giving the elements of this
+        class (`HintPreload.value_class == "HL"`). On an element, it is the
+        class of its row. `Element` has none, so that `value_class` stays a
+        field without default."""
+        return cls._value_class
+
+@dataclass(frozen=True, slots=True)
+class Element(metaclass=_ElementType):
     "An element contained in flight data"
     value: Any
     "The value of the element."
@@ -40,8 +81,32 @@ class Element:
     "The class of the value."
     index: int | None = None
     "The index of the item in the flight data."
+    validate: InitVar[Validation | None] = None
+    "How much the element is checked, see `Validation`. Defaults to `ENABLE_TYPE_VERIF`."
+    _value_class: ClassVar[str | None]
+    "The class of the flight data rows giving this element."
+
+    def __post_init__(self, validate: Validation | None):
+        validate = _validation(validate)
+        if validate == "off":
+            return
+        self._check()
+        if validate == "strict":
+            validate_element(self)
+        elif validate != "fast":
+            raise ValueError(f'Unknown validation {validate!r}, use "off", "fast" or "strict".')
+
+    def _check(self):
+        pass
+
+    def __reduce_ex__(self, protocol: int):
+        # Pickled as its encoded value (like in a flight data row), which is
+        # smaller and faster to load than its fields. (`super()` cannot be used
+        # in a dataclass with slots.)
+        if (raw := _encode_value(self)) is None:
+            return object.__reduce_ex__(self, protocol)
+        return _unpickle_element, (type(self), raw, self.value_class, self.index)
 
-@dataclass(frozen=True)
 class HintPreload(Element):
     """Represents a `"HL"` object. It is used to place some `<link>` tags into
     the head of the document. Here are some examples of values:
@@ -78,15 +143,15 @@ class HintPreload(Element):
     ```
     """
     value: list
-    value_class = "HL"
+    _value_class = "HL"
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert isinstance(self.value, list)
-            assert 2 <= len(self.value) <= 3
-            assert isinstance(self.href, str)
-            assert isinstance(self.type_name, str)
-            assert self.attrs is None or isinstance(self.attrs, dict)
+    def _check(self):
+        assert isinstance(self.value, list)
+        assert 2 <= len(self.value) <= 3
+        assert isinstance(self.href, str)
+        assert isinstance(self.type_name, str)
+        assert self.attrs is None or isinstance(self.attrs, dict)
 
     @property
     def href(self) -> str:
@@ -133,7 +198,6 @@ class HintPreload(Element):
     #                                         'supported, please open an issue about it.' )
     #     return etree.tostring(element, method="html").decode("utf-8")
 
-@dataclass(frozen=True)
 class Module(Element):
     """Represents a `"I"` object. It is used to import some modules (list of
     scripts). Here is an usage example:
@@ -163,19 +227,19 @@ class Module(Element):
     ```
     """
     value: list | dict
-    value_class = "I"
-
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert isinstance(self.value, (list, dict))
-            assert 3 <= len(self.value) <= 4
-            assert isinstance(self.module_id, int)
-            if isinstance(self.value, list):
-                assert isinstance(self.value[1], list)
-                assert len(self.value[1]) % 2 == 0
-            else:
-                assert isinstance(self.value["chunks"], list)
-            assert isinstance(self.module_name, str)
+    _value_class = "I"
+    __slots__ = ()
+
+    def _check(self):
+        assert isinstance(self.value, (list, dict))
+        assert 3 <= len(self.value) <= 4
+        assert isinstance(self.module_id, int)
+        if isinstance(self.value, list):
+            assert isinstance(self.value[1], list)
+            assert len(self.value[1]) % 2 == 0
+        else:
+            assert isinstance(self.value["chunks"], list)
+        assert isinstance(self.module_name, str)
 
     @property
     def module_id(self) -> int:
@@ -227,7 +291,10 @@ class Module(Element):
         else:
             return False
     
-@dataclass(frozen=True)
+# The slots of the fields, for `Text` that hides `value` behind a property.
+# (On the class, `value_class` is the one of `_ElementType`.)
+_value_slot, _value_class_slot, _index_slot = Element.value, vars(Element)["value_class"], Element.index
+
 class Text(Element):
     """Represents a `"T"` flight element. It simply contains text.
     
@@ -243,11 +310,44 @@ class Text(Element):
     ```
     """
     value: str
-    value_class = "T"
+    _value_class = "T"
+    __slots__ = ("_raw",)
+
+    @classmethod
+    def _from_raw(cls, raw: bytes | memoryview, index: int | None = None) -> "Text":
+        """Makes the text of a `"T"` row without decoding it, it is decoded
+        the first time its value is accessed. It is not checked.
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert isinstance(self.value, str)
+        Args:
+            raw (bytes | memoryview): The encoded text (a view of the flight
+                data is kept as is, without copy).
+            index (int | None, optional): The index of the row. Defaults to None.
+
+        Returns:
+            Text: The text.
+        """
+        self = object.__new__(cls)
+        _value_slot.__set__(self, None)
+        _value_class_slot.__set__(self, cls._value_class)
+        _index_slot.__set__(self, index)
+        object.__setattr__(self, "_raw", raw)
+        return self
+
+    @property
+    def value(self) -> str:
+        if (value := _value_slot.__get__(self)) is None and self._raw is not None:
+            value = str(self._raw, "utf-8")
+            _value_slot.__set__(self, value)
+        return value
+
+    @value.setter
+    def value(self, value: str):
+        # Only used by `Element.__init__` (the element is frozen).
+        _value_slot.__set__(self, value)
+        object.__setattr__(self, "_raw", None)
+
+    def _check(self):
+        assert isinstance(self.value, str)
 
     @property
     def text(self) -> str:
@@ -257,8 +357,25 @@ class Text(Element):
             str: The text content.
         """
         return self.value
+
+    @property
+    def raw(self) -> bytes:
+        """The encoded text, without decoding it if it was not yet.
+
+        Returns:
+            bytes: The utf-8 text.
+        """
+        return self.value.encode() if self._raw is None else bytes(self._raw)
+
+    @property
+    def size(self) -> int:
+        """The size of the encoded text, without decoding it if it was not yet.
+
+        Returns:
+            int: The size in bytes.
+        """
+        return len(self.value.encode()) if self._raw is None else len(self._raw)
     
-@dataclass(frozen=True)
 class Data(Element):
     """Represents data in the flight content. It will only be used if the value
     is None. Otherwise it's only here for inherithence of other data objects of
@@ -280,18 +397,17 @@ class Data(Element):
     {}
     ```"""
     value: list
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert is_flight_data_obj(self.value)
-            assert self.content is None or isinstance(self.content, dict)
+    def _check(self):
+        assert is_flight_data_obj(self.value)
+        assert self.content is None or isinstance(self.content, dict)
 
     @property
     def content(self) -> dict[str, Any] | None:
         return self.value[3]
     
-@dataclass(frozen=True)
 class EmptyData(Element):
     """Represents flight data that is empty (`None`).
     
@@ -305,13 +421,12 @@ class EmptyData(Element):
     None
     """
     value: None
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert self.value is None
+    def _check(self):
+        assert self.value is None
 
-@dataclass(frozen=True)
 class SpecialData(Element):
     """Represents any special data in the page. It looks like a string starting
     with a `"$"` character, such as `"$Sreact.suspense"`.
@@ -323,14 +438,13 @@ class SpecialData(Element):
     ```
     """
     value: str
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert isinstance(self.value, str)
-            assert self.value.startswith("$")
+    def _check(self):
+        assert isinstance(self.value, str)
+        assert self.value.startswith("$")
 
-@dataclass(frozen=True)
 class HTMLElement(Element):
     # https://github.com/facebook/react/blob/1c9b138714a69cd136a3d82769b1fd9a4b318953/packages/react-client/src/ReactFlightClient.js#L1324-L1526
     """Represents a `None` object containing HTML. It is used to store HTML. Here
@@ -358,14 +472,14 @@ class HTMLElement(Element):
     ```
     """
     value: list
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert is_flight_data_obj(self.value)
-            assert isinstance(self.tag, str)
-            assert self.href is None or isinstance(self.tag, str)
-            assert isinstance(self.attrs, dict)
+    def _check(self):
+        assert is_flight_data_obj(self.value)
+        assert isinstance(self.tag, str)
+        assert self.href is None or isinstance(self.tag, str)
+        assert isinstance(self.attrs, dict)
 
     @property
     def tag(self) -> str:
@@ -394,7 +508,6 @@ class HTMLElement(Element):
         """
         return self.value[3]
     
-@dataclass(frozen=True)
 class DataContainer(Element):
     """Represents a list of `Data`. Example:
     ```py
@@ -415,24 +528,23 @@ class DataContainer(Element):
     {}
     """
     value: list
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
+    def __post_init__(self, validate: Validation | None):
         object.__setattr__(
             self,
             "value",
             [
-                resolve_type(
-                    value=item,
-                    value_class=None,
-                    index=None,
-                ) for item in self.value
+                _resolve(item, None, None, validate)
+                for item in self.value
             ]
         )
-        if ENABLE_TYPE_VERIF is True:
-            assert all(is_dataclass(item) for item in self.value)
+        super().__post_init__(validate)
+
+    def _check(self):
+        assert all(is_dataclass(item) for item in self.value)
 
-@dataclass(frozen=True)
 class DataParent(Element):
     """Represents an object that has only one key, a `"children"` key.
     
@@ -460,20 +572,19 @@ class DataParent(Element):
     {"profile": {}}
     """
     value: list
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
+    def __post_init__(self, validate: Validation | None):
         self.value[3].__setitem__(
             "children",
-            resolve_type(
-                value=self.value[3]["children"],
-                value_class=None,
-                index=None,
-            )
+            _resolve(self.value[3]["children"], None, None, validate)
         )
-        if ENABLE_TYPE_VERIF is True:
-            assert is_flight_data_obj(self.value)
-            assert is_dataclass(self.children)
+        super().__post_init__(validate)
+
+    def _check(self):
+        assert is_flight_data_obj(self.value)
+        assert is_dataclass(self.children)
 
     @property
     def children(self) -> "AnyElement":
@@ -484,7 +595,6 @@ class DataParent(Element):
         """
         return self.value[3]["children"]
 
-@dataclass(frozen=True)
 class URLQuery(Element):
     """Represents the values to be set in a url. Example:
 
@@ -503,13 +613,13 @@ class URLQuery(Element):
     '624dc255c12744f2fdaf90c8'
     ```"""
     value: list
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert len(self.value) == 3
-            assert isinstance(self.key, str)
-            assert isinstance(self.val, str)
+    def _check(self):
+        assert len(self.value) == 3
+        assert isinstance(self.key, str)
+        assert isinstance(self.val, str)
 
     @property
     def key(self) -> str:
@@ -551,7 +661,6 @@ class RSCPayloadVersion(int, Enum):
     old = 0
     new = 1
     
-@dataclass(frozen=True)
 class RSCPayload(Element):
     """Represents the RCSPayload, which is the payload containing infos about the
     page. It contains a tree that, read by nextjs and react, will load the whole
@@ -560,12 +669,12 @@ class RSCPayload(Element):
     https://github.com/vercel/next.js/blob/965fe24d91d08567751339756e51f2cf9d0e3188/packages/next/src/server/app-render/types.ts#L224-L243
     """
     value: dict | list
-    value_class = None
+    _value_class = None
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert is_flight_data_obj(self.value) or isinstance(self.value, dict)
-            assert isinstance(self.build_id, str)
+    def _check(self):
+        assert is_flight_data_obj(self.value) or isinstance(self.value, dict)
+        assert isinstance(self.build_id, str)
 
     def _version(self) -> RSCPayloadVersion:
         if isinstance(self.value, list) and len(self.value) == 4:
@@ -588,7 +697,6 @@ class RSCPayload(Element):
             case RSCPayloadVersion.old:
                 return self.value[3]["buildId"]
             
-@dataclass(frozen=True)
 class Error(Element):
     """Represents a `"E"` (error) flight element. It contains an error.
     
@@ -601,13 +709,13 @@ class Error(Element):
     'NEXT_NOT_FOUND'
     ```"""
     value: dict
-    value_class = "E"
+    _value_class = "E"
+    __slots__ = ()
 
-    def __post_init__(self):
-        if ENABLE_TYPE_VERIF is True:
-            assert isinstance(self.value, dict)
-            assert "digest" in self.value
-            assert isinstance(self.digest, str)
+    def _check(self):
+        assert isinstance(self.value, dict)
+        assert "digest" in self.value
+        assert isinstance(self.digest, str)
 
     @property
     def digest(self) -> str:
@@ -621,20 +729,178 @@ class Error(Element):
 _element_keys = set(["value", "value_class", "index"])
 _dumped_element_keys = _element_keys.union({"cls"})
 _types: dict[str, Type[Element]] = {
-    item.value_class: item for item in [
+    item._value_class: item for item in [
         HintPreload,
         Module,
         Text,
         Error,
     ]
 }
+
+def _list_class(value: list) -> Type[Element]:
+    if (
+        len(value) == 4
+        and value[0] == "$"
+        and type(value[1]) is str
+        and (value[2] is None or type(value[2]) is str)
+    ):
+        if value[1].startswith("$"):
+            content = value[3]
+            if content is None:
+                return Data
+            elif "buildId" in content:
+                return RSCPayload
+            elif len(content) == 1 and "children" in content:
+                return DataParent
+            else:
+                return Data
+        else:
+            return HTMLElement
+    elif len(value) == 3 and value[2] == "d" and all(type(item) is str for item in value):
+        return URLQuery
+    else:
+        return DataContainer
+
+# The class of the values of each shape (row class, value type) for which
+# the shape is enough to know it. It is filled by `_find_class` as the shapes
+# are met.
+_shape_classes: dict[tuple[str | None, type], Type[Element]] = {}
+
+def _find_class(value: Any, value_class: str | None, index: int | None) -> Type[Element] | None:
+    if value_class is not None:
+        if (cls := _types.get(value_class)) is not None:
+            _shape_classes[(value_class, type(value))] = cls
+        return cls
+    elif isinstance(value, list):
+        return _list_class(value)
+    elif value is None:
+        _shape_classes[(None, type(None))] = EmptyData
+        return EmptyData
+    elif isinstance(value, dict) and index == 0:
+        return RSCPayload
+    elif isinstance(value, str) and value.startswith("$"):
+        return SpecialData
+
+def _resolve(
+    value: Any,
+    value_class: str | None,
+    index: int | None,
+    validate: Validation | None = None,
+) -> "AnyElement":
+    """Same as `resolve_type`, for values that are not dumped elements (the
+    values of the flight data rows, and their children)."""
+    if (cls := _shape_classes.get((value_class, type(value)))) is None:
+        if (cls := _find_class(value, value_class, index)) is None:
+            if isinstance(value, Element):
+                return value
+            elif index == 0:
+                raise ValueError( 'Data at index 0 did not find any object '
+                                  'to store its RSCPayload.' )
+            _warn_unknown_class(value_class, value)
+            cls = Element
+    return cls(value, value_class, index, validate)
+
+def _text_row(raw: bytes | memoryview, index: int | None, validate: Validation | None = None) -> Text:
+    "Makes the text of a `\"T\"` row, decoded lazily if it is large (and not strictly validated)."
+    if validate != "strict" and LAZY_TEXT_SIZE is not None and len(raw) >= LAZY_TEXT_SIZE:
+        return Text._from_raw(raw, index)
+    return _resolve(str(raw, "utf-8"), "T", index, validate)
+
+def _remade_class(value: Any, value_class: str | None, index: int | None) -> Type[Element] | None:
+    "The class of the element `_resolve` makes for the value, None if it makes none."
+    if (cls := _shape_classes.get((value_class, type(value)))) is None:
+        if (cls := _find_class(value, value_class, index)) is None:
+            if isinstance(value, Element) or index == 0:
+                return None
+            cls = Element
+    return cls
+
+def _nested_value(obj: Any) -> Any:
+    # The elements nested in a value are made back from their values (with
+    # `_resolve`), so they must be the ones it makes.
+    if (
+        isinstance(obj, Element)
+        and obj.value_class is None
+        and obj.index is None
+        and type(obj) is _remade_class(obj.value, None, None)
+    ):
+        return obj.value
+    raise TypeError
+
+def _encode_value(element: Element) -> bytes | None:
+    """The value of the element encoded like in a flight data row (JSON, or
+    the text of a `Text`), or None if the element cannot be made back the same
+    from it (its value isn't JSON, or it contains elements that `_resolve`
+    wouldn't make). Tuples are encoded as lists."""
+    if type(element) is Text:
+        return element.raw if element.value_class == "T" else None
+    try:
+        return orjson.dumps(
+            element.value,
+            default=_nested_value,
+            option=(
+                orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_SUBCLASS
+            ),
+        )
+    except orjson.JSONEncodeError:
+        return None
+
+def _encode_row_value(element: Element) -> bytes | None:
+    """Same as `_encode_value`, if a row of the element's class and index
+    with this value gives back the same element (`_resolve_row`)."""
+    if type(element) is Text:
+        return _encode_value(element)
+    elif type(element) is not _remade_class(element.value, element.value_class, element.index):
+        return None
+    return _encode_value(element)
+
+def _unpickle_element(
+    cls: Type[Element],
+    raw: bytes,
+    value_class: str | None,
+    index: int | None,
+) -> "AnyElement":
+    "Makes back an element pickled with its encoded value (it is not checked again)."
+    if cls is Text:
+        return _text_row(raw, index, "off")
+    return cls(orjson.loads(raw), value_class, index, "off")
+
+def _load_dumped(value: Any, validate: Validation | None) -> Any:
+    "Makes back the elements that were dumped as dicts in the given value."
+    if isinstance(value, list):
+        return [_load_dumped(item, validate) for item in value]
+    elif isinstance(value, dict):
+        if _element_keys <= value.keys():
+            return _load_element(**value, validate=validate)
+        return {key: _load_dumped(item, validate) for key, item in value.items()}
+    return value
+
+def _load_element(
+    value: Any,
+    value_class: str | None,
+    index: int | None,
+    cls: Type[Element] | str | None = None,
+    validate: Validation | None = None,
+) -> "AnyElement":
+    value = _load_dumped(value, validate)
+    if cls is None:
+        return _resolve(value, value_class, index, validate)
+    elif isinstance(cls, str):
+        cls = _tl2obj[cls]
+    return cls(value=value, value_class=value_class, index=index, validate=validate)
+
 def resolve_type(
     value: Any,
     value_class: str | None,
     index: int,
     cls: Type[Element] = None,
+    validate: Validation | None = None,
 ) -> "AnyElement":
-    """Find the appropriate dataclass object to init the given value.
+    """Find the appropriate dataclass object to init the given value. The
+    value can also be a dumped element (see `njsparser.tools.default`), or
+    contain some.
 
     Args:
         value (Any): The value of the flight data item.
@@ -642,49 +908,87 @@ def resolve_type(
         index (int): The index the flight data.
         cls (Type[Element], optional): The class to use for the element.
             Default on None, will find it by itself.
+        validate (Validation, optional): How much the element (and the
+            elements it contains) are checked. Defaults to
+            `ENABLE_TYPE_VERIF`.
 
     Returns:
         Element: The appropriate element.
     """
-    if isinstance(value, dict) and _element_keys <= set(value.keys()):
-        return resolve_type(**value)
-    elif cls is not None and isinstance(cls, str):
-        cls = _tl2obj[cls]
-    else:
-        if value_class is None:
-            if isinstance(value, list):
-                if is_flight_data_obj(value=value):
-                    if value[1].startswith("$"):
-                        if value[3] is None:
-                            cls = Data
-                        elif "buildId" in value[3]:
-                            cls = RSCPayload
-                        elif len(value[3]) == 1 and "children" in value[3]:
-                            cls = DataParent
-                        else:
-                            cls = Data
-                    else:
-                        cls = HTMLElement
-                elif len(value) == 3 and value[2] == "d" and all(isinstance(item, str) for item in value):
-                    cls = URLQuery
-                else:
-                    cls = DataContainer
-            elif value is None:
-                cls = EmptyData
-            elif isinstance(value, dict) and index == 0:
-                cls = RSCPayload
-            elif isinstance(value, str) and value.startswith("$"):
-                cls = SpecialData
-        elif value_class in _types:
-            cls = _types[value_class]
-    if cls is None:
-        if index == 0:
-            raise ValueError( 'Data at index 0 did not find any object '
-                              'to store its RSCPayload.' )
-        logger.warning( "Couldn't find an appropriate type for given "
-                       f"class `{value_class}`. Giving `Element`." )
-        cls = Element
-    return cls(value=value, value_class=value_class, index=index)
+    if isinstance(value, dict) and _element_keys <= value.keys():
+        return _load_element(**value, validate=validate)
+    elif cls is not None:
+        return _load_element(value, value_class, index, cls, validate)
+    return _resolve(value, value_class, index, validate)
+
+@cache
+def _get_field_validators(cls: Type[Element]) -> list[tuple[str, Any]]:
+    from pydantic import TypeAdapter
+    type_hints = get_type_hints(cls)
+    return [(field.name, TypeAdapter(type_hints[field.name])) for field in fields(cls)]
+
+def validate_element(element: Element) -> Element:
+    """Strictly validates the types of the fields of the element, using the
+    annotations of its class, with pydantic (which is not used when making
+    the elements).
+
+    Args:
+        element (Element): The element to validate.
+
+    Raises:
+        pydantic.ValidationError: A field doesn't have the expected type.
+
+    Returns:
+        Element: The same element.
+    """
+    for name, validator in _get_field_validators(type(element)):
+        validator.validate_python(getattr(element, name), strict=True)
+    return element
+
+def _get_classes(classes: Iterable[Type[Element] | str]) -> set[Type[Element]]:
+    """Returns the element classes for the given classes or class names.
+
+    Args:
+        classes (Iterable[Type[Element] | str]): The classes, or their names.
+
+    Raises:
+        KeyError: A class name is not known.
+
+    Returns:
+        set[Type[Element]]: The classes.
+    """
+    result = set()
+    for cls in classes:
+        if is_dataclass(cls):
+            result.add(cls)
+        elif cls in _tl2obj:
+            result.add(_tl2obj[cls])
+        else:
+            raise KeyError(
+                f'The class filter "{cls}" is not present in the list '
+                f"of conversion: {list(_tl2obj.keys())}."
+            )
+    return result
+
+def _get_value_classes(classes: Iterable[Type[Element] | str]) -> set[str | None] | None:
+    """Returns the classes of the flight data rows (`"HL"`, `"I"`, `None`, ...)
+    that can give an element of one of the given classes. Other rows can be
+    skipped without being parsed.
+
+    Args:
+        classes (Iterable[Type[Element] | str]): The element classes, or their
+            names.
+
+    Returns:
+        set[str | None] | None: The row classes, or None if any row can (when
+            `Element`, given to unknown rows, is asked for).
+    """
+    value_classes = set()
+    for cls in _get_classes(classes):
+        if cls is Element:
+            return None
+        value_classes.add(cls._value_class)
+    return value_classes
 
 class T(dict[str, Type[TE]]):
     Element = Element
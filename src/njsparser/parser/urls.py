@@ -1,6 +1,6 @@
 from urllib.parse import urlparse
 
-from ..utils import make_tree, _supported_tree
+from ..utils import make_tree, _supported_tree, Page
 
 _N = "/_next"
 _NS = f"{_N}/static/"
@@ -15,6 +15,8 @@ def get_next_static_urls(value: _supported_tree):
     Returns:
         list[str] | None: The list of paths, or None if none are found.
     """
+    if isinstance(value, Page):
+        return value.next_static_urls
     tree = make_tree(value=value)
     result: list[str] = [
         *tree.xpath(f"//*[contains(@href, '{_NS}')]/@href"),
@@ -61,10 +63,19 @@ def get_base_path(value: _supported_tree | list[str], *, remove_domain: bool = N
     """
     if isinstance(value, list):
         assert all(isinstance(item, str) for item in value)
-        paths = value
+        result = _base_path_from_paths(paths=value)
+    elif isinstance(value, Page):
+        if (result := value.base_path) is None:
+            return
     else:
         if (paths := get_next_static_urls(value=value)) is None:
             return
+        result = _base_path_from_paths(paths=paths)
+    if remove_domain is True and (host := urlparse(url=result).hostname) is not None:
+        result = result.split(host, 1).pop()
+    return result
+
+def _base_path_from_paths(paths: list[str]) -> str:
     global_index = None
     for path in paths:
         assert (index := path.rfind(_NS)) >= 0, \
@@ -74,7 +85,4 @@ def get_base_path(value: _supported_tree | list[str], *, remove_domain: bool = N
         assert index == global_index, \
             f"{index=} of '{_NS}' in {path=} is != {global_index=}"
     
-    result = paths[0][:global_index]
-    if remove_domain is True and (host := urlparse(url=result).hostname) is not None:
-        result = result.split(host, 1).pop()
-    return result
\ No newline at end of file
+    return paths[0][:global_index]
\ No newline at end of file
@@ -0,0 +1,173 @@
+"""Optional instrumentation of the parsing: how long each stage took, how
+much data went through it, and what it found. Also where the warnings of the
+parser are counted and logged (optionally rate-limited)."""
+
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Any
+import logging
+import threading
+import time
+
+__all__ = (
+    "ParseStats",
+    "WARNING_INTERVAL",
+)
+
+WARNING_INTERVAL: float | None = None
+"""The minimum time (in seconds) between two logs of the same warning (for
+example an unknown row class), the ones in between are only counted and
+reported by the next log. None to log every warning. They are always counted
+in the `ParseStats`, if given."""
+
+@dataclass
+class ParseStats:
+    """Collects stats about the parsing of pages. Give it as `stats` to
+    `njsparser.get_flight_data`, `njsparser.BeautifulFD` or
+    `njsparser.find_build_id`. The same stats can be given to several calls,
+    they then add up.
+
+    ```py
+    >>> stats = ParseStats()
+    >>> fd = BeautifulFD(html, stats=stats)
+    >>> stats.as_dict()
+    {'timings': {'make_tree': 0.0031, 'scripts': 0.0002, 'raw_flight_data': 0.0004, 'decode': 0.0, 'split': 0.0011, 'json': 0.0004, 'resolve': 0.0009}, 'bytes_in': 294139, 'bytes_out': 25611, 'rows': {'HintPreload': 12, 'Module': 29, ...}, 'fallbacks': 0, 'largest_row': 3207, 'largest_row_index': 0}
+    ```
+
+    The stages timed are:
+    - `"make_tree"`: lxml parsing the html.
+    - `"scripts"`: finding the scripts of the tree.
+    - `"raw_flight_data"`: finding and loading the `self.__next_f` segments
+        in the scripts (and in the page, with the `"scan"` backend).
+    - `"decode"`: decoding the segments (base64, ...) into the flight data.
+    - `"split"`: splitting the flight data into rows.
+    - `"json"`: loading the values of the rows.
+    - `"resolve"`: making the elements of the rows (`resolve_type`).
+    - `"next_data"`: loading the `__NEXT_DATA__` script.
+
+    Rows of lazy flight data (`lazy=True`) are not counted, as they are
+    parsed after the call returned.
+
+    The warnings of the parser (elements of unknown classes, page without
+    build id, ...) are counted in the stats, see `WARNING_INTERVAL` for their
+    logging.
+    """
+    timings: dict[str, float] = field(default_factory=dict)
+    "The time spent in each stage, in seconds."
+    bytes_in: int = 0
+    "The size of the pages given (0 for lxml trees)."
+    bytes_out: int = 0
+    "The size of the flight data found in the pages, in bytes."
+    rows: dict[str, int] = field(default_factory=dict)
+    "How many rows gave each class of element."
+    fallbacks: int = 0
+    "How many elements (nested ones included) were made as `Element`, as no other class fitted them."
+    largest_row: int = 0
+    "The size of the value of the largest row, in bytes."
+    largest_row_index: int | None = None
+    "The index of the largest row."
+    unknown_classes: dict[str, int] = field(default_factory=dict)
+    "How many elements (nested ones included) of each unknown row class were made as `Element`."
+    unknown_samples: dict[str, str] = field(default_factory=dict)
+    "The (shortened) repr of a value of each unknown row class."
+    warnings: dict[str, int] = field(default_factory=dict)
+    "How many times each other warning happened."
+
+    @contextmanager
+    def stage(self, name: str):
+        """Adds the time spent in the block to the timing of the stage.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    def add_time(self, name: str, duration: float):
+        self.timings[name] = self.timings.get(name, 0.) + duration
+
+    def as_dict(self) -> dict[str, Any]:
+        """Returns the stats as a dict, to export them.
+
+        Returns:
+            dict[str, Any]: The stats.
+        """
+        return asdict(self)
+
+# The stats of the parsing being done, so the stages deep in the parser can
+# report to them without having them passed around. It is only read once per
+# stage (never per row), so the parser costs the same when there are none.
+_current_stats: ContextVar[ParseStats | None] = ContextVar("_current_stats", default=None)
+
+@contextmanager
+def _collect(stats: ParseStats):
+    "Makes the given stats the current ones within the block."
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+def _stage(name: str):
+    "Times the block in the current stats, if there are."
+    if (stats := _current_stats.get()) is None:
+        return nullcontext()
+    return stats.stage(name)
+
+_logger = logging.getLogger("njsparser")
+# The last time each warning was logged, and how many were not logged since.
+_last_logs: dict[str, tuple[float, int]] = {}
+_last_logs_lock = threading.Lock()
+
+def _log(key: str, message: str, *args: Any):
+    """Logs the warning (`message % args`, only made if it is logged), unless
+    the same one was logged too recently (see `WARNING_INTERVAL`)."""
+    if WARNING_INTERVAL is None:
+        _logger.warning(message, *args)
+        return
+    now = time.monotonic()
+    with _last_logs_lock:
+        last, skipped = _last_logs.get(key, (None, 0))
+        if last is not None and now - last < WARNING_INTERVAL:
+            _last_logs[key] = (last, skipped + 1)
+            return
+        if len(_last_logs) >= 1024:
+            _last_logs.clear()
+        _last_logs[key] = (now, 0)
+    if skipped:
+        message += " (%d more since the last time, not logged)"
+        args += (skipped,)
+    _logger.warning(message, *args)
+
+def _sample(value: Any, length: int = 200) -> str:
+    sample = repr(value)
+    return sample if len(sample) <= length else sample[:length - 3] + "..."
+
+def _warn(key: str, message: str, *args: Any):
+    """Counts the warning in the current stats (if there are) and logs it.
+
+    Args:
+        key (str): The kind of warning, the same for all the similar ones.
+        message (str): The message to log, formatted with `args`.
+    """
+    if (stats := _current_stats.get()) is not None:
+        stats.warnings[key] = stats.warnings.get(key, 0) + 1
+    _log(key, message, *args)
+
+def _warn_unknown_class(value_class: str | None, value: Any):
+    "Reports an element made as `Element`, as no class fitted it."
+    key = str(value_class)
+    if (stats := _current_stats.get()) is not None:
+        stats.fallbacks += 1
+        stats.unknown_classes[key] = stats.unknown_classes.get(key, 0) + 1
+        if key not in stats.unknown_samples:
+            stats.unknown_samples[key] = _sample(value)
+    _log(
+        "unknown_class:" + key,
+        "Couldn't find an appropriate type for given class `%s`. Giving `Element`.",
+        value_class,
+    )
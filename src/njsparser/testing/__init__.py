@@ -0,0 +1 @@
+"Tools to test (and benchmark) njsparser and code using it."
@@ -0,0 +1,314 @@
+"""Generates synthetic nextjs pages, with seeded randomness, to test and
+benchmark the parser at any scale without needing real pages.
+
+```py
+>>> from njsparser.testing.synth import generate
+>>> page = generate(rows=1_000, seed=1, binary=.1, unicode=.3)
+>>> fd = njsparser.get_flight_data(page.html)
+>>> all(type(fd[index]) is cls for index, cls in page.classes.items())
+True
+```
+"""
+
+from dataclasses import dataclass
+from typing import Any, Type
+import random
+import base64
+import orjson
+
+from ..parser.types import (
+    Element,
+    HintPreload,
+    Module,
+    Text,
+    Data,
+    EmptyData,
+    SpecialData,
+    HTMLElement,
+    DataContainer,
+    DataParent,
+    URLQuery,
+    RSCPayload,
+    Error,
+    _get_classes,
+)
+from ..parser.flight_data import Segment
+
+__all__ = (
+    "SynthPage",
+    "generate",
+)
+
+_default_mix: dict[Type[Element], float] = {
+    Module: 30,
+    HintPreload: 8,
+    Text: 2,
+    Error: 1,
+    Data: 15,
+    DataContainer: 15,
+    DataParent: 10,
+    HTMLElement: 15,
+    SpecialData: 2,
+    EmptyData: 1,
+    URLQuery: 1,
+}
+_value_classes = {Module: "I", HintPreload: "HL", Text: "T", Error: "E"}
+# The classes that can be nested in containers and parents.
+_nested = (HTMLElement, Data, DataParent, DataContainer, SpecialData, EmptyData, URLQuery)
+_leaves = (HTMLElement, Data, SpecialData, EmptyData, URLQuery)
+_words = (
+    "next", "react", "page", "layout", "user", "profile", "server", "client",
+    "static", "chunk", "data", "flight", "stream", "props", "title", "link",
+)
+_unicode_words = (
+    "café", "naïve", "Straße", "Жизнь", "Ελληνικά", "中文字符", "日本語",
+    "한국어", "עברית", "العربية", "🙂", "🚀✨", "👩‍💻",
+)
+_tags = ("div", "span", "a", "p", "section", "li", "ul", "img", "button", "h2")
+_specials = ("$Sreact.suspense", "$Sreact.fragment", "$undefined", "$@1", "$D2024-01-01")
+
+@dataclass
+class SynthPage:
+    "A generated page."
+    html: str
+    "The html of the page."
+    flight_data: str
+    "The decoded flight data of the page (it is also a raw RSC response)."
+    classes: dict[int, Type[Element]]
+    "The class each row of the flight data gives, by index."
+    build_id: str
+    "The build id of the page."
+    next_data: dict[str, Any] | None
+    "The content of the `__NEXT_DATA__` script of the page, if it has one."
+
+class _Generator:
+    def __init__(self, rng: random.Random, unicode: float):
+        self.rng = rng
+        self.unicode = unicode
+
+    def word(self) -> str:
+        if self.unicode and self.rng.random() < self.unicode:
+            return self.rng.choice(_unicode_words)
+        return self.rng.choice(_words)
+
+    def text(self, words: int) -> str:
+        return " ".join(self.word() for _ in range(words))
+
+    def hash(self, length: int = 16) -> str:
+        return "%0*x" % (length, self.rng.getrandbits(length * 4))
+
+    def ref(self) -> str:
+        return f"$L{self.rng.randrange(1, 0x1000):x}"
+
+    def props(self) -> dict[str, Any]:
+        props = {"className": self.text(2)}
+        if self.rng.random() < .5:
+            props["children"] = self.text(self.rng.randrange(1, 12))
+        if self.rng.random() < .3:
+            props["href"] = f"/{self.word()}/{self.hash(8)}"
+        return props
+
+    def value(self, cls: Type[Element], depth: int) -> Any:
+        "Gives a value that resolves to the given class."
+        rng = self.rng
+        if cls is Module:
+            chunks = []
+            for _ in range(rng.randrange(1, 4)):
+                chunks += [str(rng.randrange(100, 99999)), f"static/chunks/{rng.randrange(100, 9999)}-{self.hash()}.js"]
+            if rng.random() < .5:
+                return [rng.randrange(1, 99999), chunks, rng.choice(("default", "", "*"))]
+            return {
+                "id": str(rng.randrange(1, 99999)),
+                "chunks": [f"{chunks[x]}:{chunks[x + 1]}" for x in range(0, len(chunks), 2)],
+                "name": rng.choice(("default", "", "*")),
+                "async": rng.random() < .5,
+            }
+        elif cls is HintPreload:
+            if rng.random() < .5:
+                return [f"/_next/static/css/{self.hash()}.css", "style"]
+            return [
+                f"/_next/static/media/{self.hash()}-s.p.woff2",
+                "font",
+                {"crossOrigin": "", "type": "font/woff2"},
+            ]
+        elif cls is Text:
+            # Texts can contain anything, including html and newlines followed
+            # by something looking like the start of a row.
+            lines = [self.text(rng.randrange(1, 40)) for _ in range(rng.randrange(1, 6))]
+            if rng.random() < .3:
+                lines.append(f"<p>{self.text(8)}</p></script>")
+            if rng.random() < .3:
+                lines.append(f'{rng.randrange(1, 0x100):x}:["$","div",null,{{}}]')
+            return "\n".join(lines)
+        elif cls is Error:
+            return {"digest": rng.choice(("NEXT_NOT_FOUND", str(rng.randrange(10 ** 9))))}
+        elif cls is Data:
+            if rng.random() < .1:
+                return ["$", self.ref(), None, None]
+            return ["$", self.ref(), None, self.props()]
+        elif cls is HTMLElement:
+            key = None if rng.random() < .7 else self.hash(4)
+            props = self.props()
+            if depth > 0 and rng.random() < .5:
+                props["children"] = [
+                    self.value(HTMLElement, depth - 1)
+                    for _ in range(rng.randrange(1, 4))
+                ]
+            return ["$", rng.choice(_tags), key, props]
+        elif cls is DataParent:
+            return ["$", self.ref(), None, {"children": self.nested(depth - 1)}]
+        elif cls is DataContainer:
+            return [self.nested(depth - 1) for _ in range(rng.randrange(1, 5))]
+        elif cls is SpecialData:
+            return rng.choice(_specials)
+        elif cls is EmptyData:
+            return None
+        elif cls is URLQuery:
+            return [self.word(), self.hash(8), "d"]
+        else:
+            raise ValueError(f"Cannot generate a row giving a `{cls.__name__}`.")
+
+    def nested(self, depth: int) -> Any:
+        return self.value(self.rng.choice(_nested if depth > 0 else _leaves), depth)
+
+    def next_data(self, size: int, build_id: str) -> dict[str, Any]:
+        items, length = [], 0
+        while length < size:
+            items.append({"id": self.hash(8), "title": self.text(6), "body": self.text(30)})
+            length += len(orjson.dumps(items[-1]))
+        return {
+            "props": {"pageProps": {"items": items}, "__N_SSP": True},
+            "page": "/",
+            "query": {},
+            "buildId": build_id,
+            "isFallback": False,
+            "gssp": True,
+            "scriptLoader": [],
+        }
+
+def _script(segment: list) -> str:
+    # Like react does, `<` is escaped so that the script cannot be closed by
+    # its content.
+    payload = orjson.dumps(segment).decode().replace("<", "\\u003c")
+    return f"<script>self.__next_f.push({payload})</script>"
+
+def generate(
+    *,
+    rows: int | None = 100,
+    size: int | None = None,
+    seed: int | None = None,
+    mix: dict[Type[Element] | str, float] | None = None,
+    depth: int = 3,
+    binary: float = 0.,
+    unicode: float = 0.,
+    chunk_size: int = 2048,
+    next_data_size: int | None = None,
+) -> SynthPage:
+    """Generates a nextjs page containing flight data. Its payload (the
+    `RSCPayload`) is at index 0, followed by the rows.
+
+    Args:
+        rows (int | None, optional): How many rows to generate (besides the
+            payload), None for no limit (then `size` is needed). Defaults to
+            100.
+        size (int | None, optional): Stops generating rows once the page is
+            about this many characters long. Defaults to None.
+        seed (int | None, optional): The seed of the randomness. Defaults to
+            None.
+        mix (dict[Type[Element] | str, float] | None, optional): The weight
+            of each class (or class name) in the rows. Can be `Module`,
+            `HintPreload`, `Text`, `Error`, `Data`, `DataContainer`,
+            `DataParent`, `HTMLElement`, `SpecialData`, `EmptyData` and
+            `URLQuery`. Defaults to a mix looking like real pages.
+        depth (int, optional): How deep containers, parents and html elements
+            can be nested. Defaults to 3.
+        binary (float, optional): The part of the scripts that are binary
+            (`Segment.is_binary`, base64) segments. Defaults to 0.
+        unicode (float, optional): The part of the words that are non ascii
+            (accents, non latin scripts, emojis, ...). Defaults to 0.
+        chunk_size (int, optional): How many characters of flight data each
+            script has. Defaults to 2048.
+        next_data_size (int | None, optional): If given, the page also has a
+            `__NEXT_DATA__` script of about this size. Defaults to None.
+
+    Raises:
+        ValueError: A class of the mix cannot be generated, or neither
+            `rows` nor `size` is given.
+
+    Returns:
+        SynthPage: The page.
+    """
+    if rows is None and size is None:
+        raise ValueError("Give `rows` or `size`, the page would never end.")
+    rng = random.Random(seed)
+    generator = _Generator(rng=rng, unicode=unicode)
+    if mix is None:
+        mix = _default_mix
+    weights = {}
+    for cls, weight in mix.items():
+        (cls,) = _get_classes([cls])
+        if cls not in _default_mix:
+            raise ValueError(f"Cannot generate a row giving a `{cls.__name__}`.")
+        weights[cls] = weight
+    population, weights = list(weights), list(weights.values())
+
+    build_id = generator.hash(21)
+    head = (
+        '<!DOCTYPE html><html lang="en"><head><meta charSet="utf-8"/>'
+        f'<link rel="stylesheet" href="/_next/static/css/{generator.hash()}.css"/>'
+        f'<script src="/_next/static/chunks/webpack-{generator.hash()}.js" async=""></script>'
+        f'<script src="/_next/static/chunks/main-app-{generator.hash()}.js" async=""></script>'
+        '</head><body><div id="__next"></div>'
+    )
+    payload = {
+        "P": None,
+        "b": build_id,
+        "p": "",
+        "c": ["", ""],
+        "i": False,
+        "f": [[["", {"children": ["__PAGE__", {}]}, "$undefined", "$undefined", True]]],
+        "m": "$undefined",
+        "G": ["$5", []],
+        "s": False,
+        "S": True,
+    }
+    flight_data = ["0:" + orjson.dumps(payload).decode() + "\n"]
+    classes: dict[int, Type[Element]] = {0: RSCPayload}
+    length, index = len(head) + len(flight_data[0]), 1
+    while (rows is None or index <= rows) and (size is None or length < size):
+        cls = rng.choices(population, weights)[0]
+        value = generator.value(cls, depth)
+        if cls is Text:
+            row = f"{index:x}:T{len(value.encode()):x},{value}"
+        else:
+            row = f"{index:x}:{_value_classes.get(cls, '')}{orjson.dumps(value).decode()}\n"
+        flight_data.append(row)
+        classes[index] = cls
+        length += len(row)
+        index += 1
+    flight_data = "".join(flight_data)
+
+    html = [head, "<script>(self.__next_f=self.__next_f||[]).push([0])</script>"]
+    # Rows are split across the scripts, like in real pages.
+    for start in range(0, len(flight_data), chunk_size):
+        chunk = flight_data[start:start + chunk_size]
+        if binary and rng.random() < binary:
+            html.append(_script([Segment.is_binary, base64.b64encode(chunk.encode()).decode()]))
+        else:
+            html.append(_script([Segment.is_not_bootstrap, chunk]))
+    next_data = None
+    if next_data_size is not None:
+        next_data = generator.next_data(size=next_data_size, build_id=build_id)
+        html.append(
+            '<script id="__NEXT_DATA__" type="application/json">'
+            + orjson.dumps(next_data).decode().replace("<", "\\u003c")
+            + "</script>"
+        )
+    html.append("</body></html>")
+    return SynthPage(
+        html="".join(html),
+        flight_data=flight_data,
+        classes=classes,
+        build_id=build_id,
+        next_data=next_data,
+    )
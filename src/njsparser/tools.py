@@ -1,21 +1,36 @@
 from typing import Type, List, Iterable, Callable, Generator, overload, Any
-from typing_extensions import Self
+try:
+    from typing import Self
+except ImportError: # python < 3.11
+    from typing_extensions import Self
 from dataclasses import is_dataclass, asdict
 
-from .utils import _supported_tree, make_tree, logger
+from .utils import _supported_tree, _backend, Page, _value_size, _is_page
+from .stats import ParseStats, _collect, _warn
 from .parser.next_data import has_next_data, get_next_data
-from .parser.flight_data import has_flight_data, get_flight_data, FD, TE
+from .parser.flight_data import (
+    has_flight_data,
+    get_flight_data,
+    get_flight_data_from_rsc,
+    _encode_flight_data,
+    _unpickle_flight_data,
+    _only,
+    LazyFD,
+    FD,
+    TE,
+)
 from .parser.types import (
     RSCPayload,
     Element,
     DataContainer,
     T,
-    _tl2obj,
+    _get_classes,
     resolve_type,
     DataParent,
+    Validation,
     _dumped_element_keys,
 )
-from .parser.urls import get_next_static_urls, get_base_path, _NS
+from .parser.urls import _NS
 from .parser.manifests import _manifest_paths
 
 __all__ = (
@@ -38,7 +53,10 @@ def has_nextjs(value: _supported_tree):
     Returns:
         bool: True if it contains any nextjs data, otherwise, False.
     """
-    return any([has_next_data(value=value), has_flight_data(value=value)])
+    # (The page is parsed once for both.)
+    if isinstance(value, Page) is False:
+        value = Page(value=value)
+    return has_next_data(value=value) or has_flight_data(value=value)
 
 
 C = Callable[[Element], bool]
@@ -94,7 +112,13 @@ def finditer_in_flight_data(
         return
     if class_filters is not None and isinstance(class_filters, set) is False:
         class_filters = set(class_filters)
-    for value in flight_data.values():
+    if class_filters is not None and isinstance(flight_data, LazyFD):
+        # (Only the rows that can give the classes are resolved, the list of
+        # rows without index can't be one of them.)
+        values = flight_data._values_of(class_filters)
+    else:
+        values = flight_data.values()
+    for value in values:
         if recursive is not False and type(value) is DataContainer:
             yield from finditer_in_flight_data(
                 flight_data=dict(enumerate(value.value)),
@@ -231,22 +255,32 @@ def find_in_flight_data(
         return item
 
 
-def find_build_id(value: _supported_tree) -> str | None:
+def find_build_id(value: _supported_tree, *, stats: ParseStats | None = None) -> str | None:
     """Searches and return (or not) the build id of the given page.
 
     Args:
         value (_supported_tree): The page to find the build id from.
+        stats (ParseStats, optional): Stats to report the parsing to, see
+            `njsparser.ParseStats`. Defaults to None.
 
     Returns:
         str | None: Either the buildId if it was found, or None if it didn't.
     """
-    tree = make_tree(value=value)
+    if stats is not None:
+        with _collect(stats):
+            stats.bytes_in += _value_size(value=value)
+            return find_build_id(value=value)
+    if isinstance(value, Page) is False:
+        value = Page(value=value)
+    return value.build_id
+
 
+def _find_build_id(page: Page) -> str | None:
     # Searches through the static next urls, and if we find anything that ends
     # with `"/_buildManifest.js"` or `"/_ssgManifest.js"`, we can extract the
     # build id from it.
-    if (next_static_urls := get_next_static_urls(value=tree)) is not None:
-        base_path = get_base_path(value=next_static_urls, remove_domain=False)
+    if (next_static_urls := page.next_static_urls) is not None:
+        base_path = page.base_path
         for next_static_url in next_static_urls:
             sliced_su = next_static_url.removeprefix(base_path).removeprefix(_NS)
             for manifest_path in _manifest_paths:
@@ -254,21 +288,23 @@ def find_build_id(value: _supported_tree) -> str | None:
                     return sliced_su.removesuffix(manifest_path)
 
     # We search for the buildId directly into the `__NEXT_DATA__` script.
-    if (next_data := get_next_data(value=tree)) is not None:
+    if (next_data := page.next_data) is not None:
         if "buildId" in next_data:
             return next_data["buildId"]
         else:
-            logger.warning(
+            _warn(
+                "next_data_without_build_id",
                 "Found a next_data dict in the page, "
                 "but did't contain any `buildId` key."
             )
 
     # We search for the builId in the flight data.
-    elif (flight_data := get_flight_data(value=tree)) is not None:
+    elif (flight_data := page.flight_data) is not None:
         if (found := find_in_flight_data(flight_data, [RSCPayload])) is not None:
             return found.build_id
         else:
-            logger.warning(
+            _warn(
+                "flight_data_without_build_id",
                 "Found flight data in the page, but "
                 "couldnt find the build id. If are certain"
                 " there is one, open an issue with your "
@@ -285,13 +321,39 @@ class BeautifulFD:
     >>> fd.find()
     """
 
-    def __init__(self, value: FD | _supported_tree):
+    def __init__(
+        self,
+        value: FD | _supported_tree,
+        *,
+        backend: _backend = None,
+        lazy: bool = None,
+        only: _only = None,
+        validate: Validation | None = None,
+        stats: ParseStats | None = None,
+    ):
         """Creates the BeautifulFD object.
 
         Args:
             value (FD | _supported_tree): The string/bytes HTML, or lxml _Element
-                object, or the already made flight data (using the method at
+                object, or `Page`, or the path (or `mmap`) of an html file, or
+                the already made flight data (using the method at
                 `njsparser.get_flight_data`).
+            backend (_backend, optional): How to find the flight data scripts in
+                the page, see `njsparser.parser.flight_data.get_raw_flight_data`.
+                Defaults to `"lxml"`.
+            lazy (bool, optional): If `True`, the rows of the flight data are
+                only parsed when they are looked at (see
+                `njsparser.parser.flight_data.LazyFD`). Defaults to `False`.
+            only (_only, optional): The element classes (or their names) you
+                are interested in. The rows of the page's flight data that
+                cannot give any of them are skipped without being parsed, so
+                searching for other classes will not find them. Defaults to
+                None.
+            validate (Validation, optional): How much the elements are
+                checked, see `njsparser.parser.types.Validation`. Defaults to
+                `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+            stats (ParseStats, optional): Stats to report the parsing of the
+                page to, see `njsparser.ParseStats`. Defaults to None.
 
         Raises:
             TypeError: The given `value` type is not supported.
@@ -310,15 +372,22 @@ class BeautifulFD:
                     isinstance(value, dict)
                     and set(value.keys()) == _dumped_element_keys
                 ):
-                    value = resolve_type(**value)
+                    value = resolve_type(**value, validate=validate)
                 elif is_dataclass(value) is False:
                     raise TypeError(
                         f"Given key {key} in flight data dict is neither "
                         "a digit string, neither an int."
                     )
                 flight_data[key] = value
-        elif isinstance(value, _supported_tree):
-            flight_data = get_flight_data(value=value)
+        elif _is_page(value):
+            flight_data = get_flight_data(
+                value=value,
+                backend=backend,
+                lazy=lazy,
+                only=only,
+                validate=validate,
+                stats=stats,
+            )
         else:
             raise TypeError(f'Given type "{type(value)}" is unsupported')
         self._flight_data = flight_data
@@ -339,6 +408,13 @@ class BeautifulFD:
         if self:
             yield from self._flight_data.items()
 
+    def __reduce_ex__(self, protocol: int):
+        # Pickled as the rows of its flight data, whose elements are then made
+        # again only as they are accessed (see `LazyFD`, that pickles the same).
+        if isinstance(self._flight_data, dict) and (buffer := _encode_flight_data(self._flight_data)) is not None:
+            return _unpickle_beautiful_fd, (buffer,)
+        return object.__reduce_ex__(self, protocol)
+
     def as_list(self) -> list[Element]:
         """Returns the flight data as a list instead of a dict.
 
@@ -348,7 +424,13 @@ class BeautifulFD:
         return list(self._flight_data.values()) if self else []
 
     @classmethod
-    def from_list(cls, l: list[Element | dict], *, via_enumerate: bool = None) -> Self:
+    def from_list(
+        cls,
+        l: list[Element | dict],
+        *,
+        via_enumerate: bool = None,
+        validate: Validation | None = None,
+    ) -> Self:
         """Will load a from a list of flight data elements, or list of dict
         representing them. If you dumped the `BeautifulFD` with the `.as_list()`
         method, this is what you want to load it back in.
@@ -358,6 +440,9 @@ class BeautifulFD:
             via_enumerate (bool, optional): If objects do not contain their own
                 indexes, it will use their position in the given list as index
                 if set to `True`. Defaults to `False`.
+            validate (Validation, optional): How much the elements loaded
+                from dicts are checked. Defaults to
+                `njsparser.parser.types.ENABLE_TYPE_VERIF`.
 
         Raises:
             ValueError: Objects do not contain their own indexes, and `via_enumerate`
@@ -367,7 +452,10 @@ class BeautifulFD:
             Self: The BeautifulFD object.
         """
         if all(isinstance(item, dict) and "cls" in item for item in l):
-            l = [resolve_type(value=item, value_class=None, index=None) for item in l]
+            l = [
+                resolve_type(value=item, value_class=None, index=None, validate=validate)
+                for item in l
+            ]
         if all(isinstance(item.index, int) for item in l):
             value = {item.index: item for item in l}
         elif via_enumerate is not True:
@@ -381,6 +469,42 @@ class BeautifulFD:
             value = dict(enumerate(l))
         return cls(value=value)
 
+    @classmethod
+    def from_rsc(
+        cls,
+        value: bytes | str,
+        *,
+        lazy: bool = None,
+        only: _only = None,
+        validate: Validation | None = None,
+    ) -> Self:
+        """Loads the flight data from a raw RSC response (the body of a request
+        made with the `RSC: 1` header, or to an url with a `?_rsc=` query).
+
+        ```py
+        >>> response = requests.get(url, headers={"RSC": "1"})
+        >>> fd = BeautifulFD.from_rsc(response.content)
+        ```
+
+        Args:
+            value (bytes | str): The body of the RSC response.
+            lazy (bool, optional): If `True`, the rows are only parsed when
+                they are looked at. Defaults to `False`.
+            only (_only, optional): The element classes (or their names) you
+                are interested in, see `BeautifulFD.__init__`. Defaults to
+                None.
+            validate (Validation, optional): How much the elements are
+                checked. Defaults to `njsparser.parser.types.ENABLE_TYPE_VERIF`.
+
+        Returns:
+            Self: The BeautifulFD object.
+        """
+        self = cls.__new__(cls)
+        self._flight_data = get_flight_data_from_rsc(
+            value=value, lazy=lazy, only=only, validate=validate
+        )
+        return self
+
     @overload
     def find_iter(
         self,
@@ -423,18 +547,7 @@ class BeautifulFD:
         if class_filters is None:
             new_class_filters = None
         else:
-            new_class_filters = set()
-            for cls in class_filters:
-                if is_dataclass(cls):
-                    new_class_filters.add(cls)
-                else:
-                    if cls in _tl2obj:
-                        new_class_filters.add(_tl2obj[cls])
-                    else:
-                        raise KeyError(
-                            f'The class filter "{cls}" is not present in the list '
-                            f"of conversion: {list(_tl2obj.keys())}."
-                        )
+            new_class_filters = _get_classes(class_filters)
         yield from finditer_in_flight_data(
             flight_data=self._flight_data,
             class_filters=new_class_filters,
@@ -533,6 +646,12 @@ class BeautifulFD:
             return item
 
 
+def _unpickle_beautiful_fd(buffer: bytes) -> BeautifulFD:
+    "Makes back a `BeautifulFD` pickled as its rows (its elements were already checked)."
+    self = BeautifulFD.__new__(BeautifulFD)
+    self._flight_data = _unpickle_flight_data(buffer, "off")
+    return self
+
 def default(obj: Any):
     """The `default` function for json dumpers.
 
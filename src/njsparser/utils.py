@@ -1,30 +1,254 @@
-from lxml import etree
+from contextlib import contextmanager
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Iterator, Literal, Union
 import logging
+import mmap
+import sys
+import os
+
+if TYPE_CHECKING:
+    from lxml import etree
+
+from .stats import _stage
 
 logger = logging.getLogger("njsparser")
 
-_supported_tree = etree._Element | str | bytes
+def __getattr__(name: str):
+    # `etree` can still be imported from here, lxml being imported then.
+    if name == "etree":
+        from lxml import etree
+        return etree
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class Page:
+    """A page that is parsed only once. Everything derived from it (tree,
+    scripts, static urls, next data, flight data, build id, ...) is computed
+    the first time it is accessed, then cached. Every function of the lib
+    accepting a page also accepts a `Page`, and will use its cache.
+
+    ```py
+    >>> page = Page(response.content)
+    >>> has_nextjs(page)
+    True
+    >>> find_build_id(page)
+    '4mSOwJptzzPemGzzI8AOo'
+    >>> BeautifulFD(page).find([T.RSCPayload])
+    RSCPayload(...)
+    ```
+    """
+
+    def __init__(self, value: "etree._Element | str | bytes | os.PathLike | mmap.mmap"):
+        """Creates the page.
+
+        Args:
+            value (etree._Element | str | bytes | os.PathLike | mmap.mmap): Str
+                or bytes html page, or an etree, or the path of an html file,
+                or an `mmap` of one (given to lxml by chunks, never read
+                whole, see `make_tree`).
+
+        Raises:
+            TypeError: The value isn't a string, bytes, etree, path or mmap.
+        """
+        if not isinstance(value, (str, bytes, os.PathLike, mmap.mmap)) and not _is_tree(value):
+            raise TypeError( 'waited a `str`, `bytes`, `etree._Element`, path or `mmap`, '
+                             'got `%s`' % type(value).__name__ )
+        self.value = value
+
+    def __repr__(self):
+        return f"Page(<{type(self.value).__name__}>)"
+
+    @cached_property
+    def tree(self) -> "etree._Element":
+        "The lxml tree of the page."
+        return make_tree(value=self.value)
+
+    @cached_property
+    def _script_elements(self) -> "list[etree._Element]":
+        tree = self.tree
+        with _stage("scripts"):
+            return tree.xpath("//script")
+
+    @cached_property
+    def scripts(self) -> list[str]:
+        "The text content of every `<script>` of the page."
+        return [script.text for script in self._script_elements if script.text]
+
+    @cached_property
+    def next_static_urls(self) -> list[str] | None:
+        "See `njsparser.get_next_static_urls`."
+        from .parser.urls import get_next_static_urls
+        return get_next_static_urls(value=self.tree)
+
+    @cached_property
+    def base_path(self) -> str | None:
+        "See `njsparser.get_base_path` (the domain is not removed)."
+        from .parser.urls import _base_path_from_paths
+        if self.next_static_urls is not None:
+            return _base_path_from_paths(paths=self.next_static_urls)
+
+    @cached_property
+    def next_data(self) -> dict[str, Any] | None:
+        "See `njsparser.get_next_data`."
+        from .parser.next_data import _next_data_from_texts
+        return _next_data_from_texts(texts=[
+            script.text for script in self._script_elements
+            if script.get("id") == "__NEXT_DATA__" and script.text
+        ])
+
+    @cached_property
+    def raw_flight_data(self):
+        "See `njsparser.parser.flight_data.get_raw_flight_data`."
+        from .parser.flight_data import _raw_flight_data_from_scripts
+        return _raw_flight_data_from_scripts(scripts=self.scripts)
+
+    @cached_property
+    def decoded_flight_data(self) -> list[str] | None:
+        "See `njsparser.parser.flight_data.decode_raw_flight_data`."
+        from .parser.flight_data import decode_raw_flight_data
+        if (raw_flight_data := self.raw_flight_data) is not None:
+            with _stage("decode"):
+                return decode_raw_flight_data(raw_flight_data=raw_flight_data)
+
+    @cached_property
+    def flight_data_buffer(self) -> bytearray | None:
+        """The encoded flight data (the decoded flight data, joined and
+        encoded, that the rows are read from). The raw flight data isn't
+        kept with it (it is found again if asked for), so that the page
+        only holds one copy of the flight data."""
+        from .parser.flight_data import _raw_flight_data_from_scripts, _decode_to_buffer
+        if (raw_flight_data := self.__dict__.pop("raw_flight_data", None)) is None:
+            raw_flight_data = _raw_flight_data_from_scripts(scripts=self.scripts)
+        if raw_flight_data is not None:
+            with _stage("decode"):
+                return _decode_to_buffer(raw_flight_data=raw_flight_data)
+
+    @cached_property
+    def _parsed_flight_data(self) -> dict:
+        # The flight data parsed from `flight_data_buffer`, by the classes of
+        # the rows parsed (None for all of them) and validation, so that
+        # `get_flight_data` (and `BeautifulFD`) with `only=` reuse it.
+        return {}
+
+    @cached_property
+    def flight_data(self):
+        "See `njsparser.get_flight_data`."
+        from .parser.flight_data import _page_flight_data
+        return _page_flight_data(page=self)
+
+    @cached_property
+    def build_id(self) -> str | None:
+        "See `njsparser.find_build_id`."
+        from .tools import _find_build_id
+        return _find_build_id(page=self)
+
+# (lxml is only imported when a page is parsed, as it is slow to import.)
+_supported_tree = Union["etree._Element", str, bytes, Page, os.PathLike, mmap.mmap]
+_backend = Literal["lxml", "scan"]
+# How much of a file (or mmap) is given to lxml at once.
+_chunk_size = 1 << 20
+
+def _is_tree(value: Any) -> bool:
+    "Tells if the value is an lxml tree (there is none if lxml wasn't imported)."
+    return (etree := sys.modules.get("lxml.etree")) is not None and isinstance(value, etree._Element)
+
+def _is_page(value: Any) -> bool:
+    "Tells if the value is one of the `_supported_tree`."
+    return isinstance(value, (str, bytes, Page, os.PathLike, mmap.mmap)) or _is_tree(value)
+
 def make_tree(value: _supported_tree):
     """Returns an lxml etree for the give str or bytes, and returns
     the etree if the given argument is already one.
 
     Args:
-        value (_supported_tree): Str or bytes html page, or an etree.
+        value (_supported_tree): Str or bytes html page, or an etree, or
+            a `Page` (its cached tree will be returned), or the path of an
+            html file, or an `mmap` of one (they are given to lxml by chunks,
+            never read whole).
 
     Raises:
-        TypeError: The tree isn't a string, bytes or etree.
+        TypeError: The tree isn't a string, bytes, etree, path or mmap.
 
     Returns:
         etree._Element: The tree.
     """
-    if isinstance(value, etree._Element):
+    if _is_tree(value):
         return value
+    elif isinstance(value, Page):
+        return value.tree
     elif isinstance(value, (str, bytes)):
-        return etree.HTML(value)
+        from lxml import etree
+        with _stage("make_tree"):
+            return etree.HTML(value)
+    elif isinstance(value, os.PathLike):
+        with open(value, "rb") as file, _stage("make_tree"):
+            return _tree_from_chunks(chunks=iter(lambda: file.read(_chunk_size), b""))
+    elif isinstance(value, mmap.mmap):
+        with _stage("make_tree"):
+            return _tree_from_chunks(chunks=(
+                value[pos:pos + _chunk_size] for pos in range(0, len(value), _chunk_size)
+            ))
     else:
-        raise TypeError( 'waited a `str`, `bytes` or `etree._Element`, '
+        raise TypeError( 'waited a `str`, `bytes`, `etree._Element`, path or `mmap`, '
                          'got `%s`' % type(value).__name__ )
 
+def _tree_from_chunks(chunks: Iterator[bytes]) -> "etree._Element | None":
+    "Same as `etree.HTML`, over the chunks of the page."
+    from lxml import etree
+    parser, empty = etree.HTMLParser(), True
+    for chunk in chunks:
+        parser.feed(chunk)
+        empty = False
+    # (Like `etree.HTML`, an empty page has no tree.)
+    return None if empty else parser.close()
+
+@contextmanager
+def _map_file(path: os.PathLike) -> Iterator[mmap.mmap | bytes]:
+    "Maps the file in memory (read only). An empty file gives empty bytes."
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b""
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+def _select_backend(value: _supported_tree, backend: _backend | None) -> _backend:
+    """The backend to read the page with, if none is given: `"scan"` for a
+    path or an `mmap` (see `_map_file`), otherwise `"lxml"`.
+
+    Raises:
+        ValueError: Unknown backend.
+    """
+    if backend is None:
+        return "scan" if isinstance(value, (os.PathLike, mmap.mmap)) else "lxml"
+    elif backend not in ("lxml", "scan"):
+        raise ValueError(f'Unknown backend {backend!r}, use "lxml" or "scan".')
+    return backend
+
+def get_scripts(value: _supported_tree) -> list[str]:
+    """Returns the text content of every `<script>` of the page.
+
+    Args:
+        value (_supported_tree): The page to get the scripts from.
+
+    Returns:
+        list[str]: The scripts contents.
+    """
+    if isinstance(value, Page):
+        return value.scripts
+    tree = make_tree(value=value)
+    with _stage("scripts"):
+        return tree.xpath('//script/text()')
+
+def _value_size(value: _supported_tree) -> int:
+    "The size of the given page, 0 for lxml trees."
+    if isinstance(value, Page):
+        return _value_size(value=value.value)
+    elif isinstance(value, (str, bytes, mmap.mmap)):
+        return len(value)
+    elif isinstance(value, os.PathLike):
+        return os.path.getsize(value)
+    return 0
+
 def join(*args: str):
     """Joins the args to make an url path (for some reasons os.path.join
     is shit for this and excludes some parts).
@@ -34,4 +258,4 @@ def join(*args: str):
     """
     l = [""]
     l += [arg.strip("/") for arg in args if arg]
-    return "/".join(l)
\ No newline at end of file
+    return "/".join(l)
@@ -0,0 +1,47 @@
+from njsparser.batch import parse_many, ParseResult
+from njsparser.parser.flight_data import get_flight_data
+from njsparser.parser.next_data import get_next_data
+from njsparser.parser.types import Module, RSCPayload
+from njsparser.tools import find_build_id
+import pytest
+
+from . import *
+
+_pages = (nextjs_org_html, club_fans_html, m_soundcloud_com_html, x_com_html)
+
+def test_parse_many(tmp_path):
+    paths = []
+    for index, html in enumerate(_pages):
+        paths.append(tmp_path / f"{index}.html")
+        paths[-1].write_bytes(html)
+    expected = [find_build_id(html) for html in _pages]
+    for workers in (0, 2):
+        results = list(parse_many(paths, workers=workers, ordered=True))
+        assert [result.index for result in results] == list(range(len(_pages)))
+        assert [result.build_id for result in results] == expected
+        assert [result.path for result in results] == [str(path) for path in paths]
+        assert all(result.error is None and result.flight_data is None for result in results)
+    results = list(parse_many(paths, workers=0, fields=["next_data", "flight_data"], only=[RSCPayload]))
+    assert [result.next_data for result in results] == [get_next_data(html) for html in _pages]
+    assert [result.flight_data for result in results] == [get_flight_data(html, only=[RSCPayload]) for html in _pages]
+    results = sorted(parse_many(_pages, workers=2, chunksize=2), key=lambda result: result.index)
+    assert [result.build_id for result in results] == expected
+    assert results[0].path is None
+
+def test_parse_many_fields(tmp_path):
+    results = list(parse_many(
+        [nextjs_org_html, tmp_path / "missing.html", m_soundcloud_com_html.decode()],
+        workers=0,
+        fields=["next_data", "flight_data"],
+        only=[Module, "RSCPayload"],
+    ))
+    assert results[0].build_id is None
+    assert results[0].flight_data == get_flight_data(nextjs_org_html, only=[Module, RSCPayload])
+    assert results[1].error.startswith("FileNotFoundError")
+    assert results[2].next_data == get_next_data(m_soundcloud_com_html)
+    assert results[2].flight_data is None and results[2].error is None
+    assert ParseResult(index=0).error is None
+    with pytest.raises(ValueError):
+        parse_many([], fields=["buildid"])
+    with pytest.raises(KeyError):
+        parse_many([], only=["Modul"])
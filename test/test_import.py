@@ -0,0 +1,32 @@
+import subprocess
+import sys
+
+# The most `import njsparser` may take, in ms (about 25ms on a laptop).
+_import_budget = 150
+# The dependencies that are only imported when they are used.
+_lazy_modules = ("lxml", "pythonmonkey", "pydantic", "multiprocessing", "requests", "typer", "rich")
+
+def _import_times(*args: str) -> dict[str, int]:
+    "The cumulative import time (in µs) of each module imported by running python with the args."
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and not line.endswith("imported package"):
+            _, cumulative, name = line.removeprefix("import time:").split("|")
+            times[name.strip()] = int(cumulative)
+    return times
+
+def test_import_time():
+    times = _import_times("-c", "import njsparser")
+    assert [name for name in times if name.split(".")[0] in _lazy_modules] == []
+    assert times["njsparser"] / 1000 < _import_budget
+
+def test_cli_help_import():
+    times = _import_times("-m", "njsparser.cli", "--help")
+    assert "typer" in times
+    assert [name for name in ("pythonmonkey", "requests", "lxml", "pydantic") if name in times] == []
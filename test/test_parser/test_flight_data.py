@@ -1,8 +1,25 @@
 from njsparser.parser.flight_data import (
     has_flight_data,
     get_raw_flight_data,
-    get_flight_data
+    get_flight_data,
+    get_flight_data_from_rsc,
+    decode_raw_flight_data,
+    parse_decoded_raw_flight_data,
+    FlightDataParser,
+    LazyFD,
+    FlightRowTable,
+    _tokenize,
+    _scan_rows,
+    _decode_to_buffer,
+    _encode_flight_data,
 )
+from njsparser.parser.types import Text, HintPreload, RSCPayload, Module, Element
+from njsparser.testing.synth import generate
+from njsparser.utils import make_tree
+import random
+import re
+import mmap
+import pytest
 
 from .. import *
 
@@ -19,4 +36,231 @@ def test_get_raw_flight_data():
     assert get_raw_flight_data(value=m_soundcloud_com_html) is None
     assert get_flight_data(value=m_soundcloud_com_html) is None
     assert get_raw_flight_data(value=mintstars_com_html) is not None
-    assert get_flight_data(value=mintstars_com_html) is not None
\ No newline at end of file
+    assert get_flight_data(value=mintstars_com_html) is not None
+
+def test_FlightDataParser():
+    decoded = decode_raw_flight_data(get_raw_flight_data(value=nextjs_org_html))
+    expected = parse_decoded_raw_flight_data(decoded)
+    data = "".join(decoded).encode()
+    for chunk_size in (1, 7, 4096):
+        parser, elements = FlightDataParser(), []
+        for pos in range(0, len(data), chunk_size):
+            elements += parser.feed(data[pos:pos+chunk_size])
+        elements += parser.close()
+        assert {e.index: e for e in elements if e.index is not None} == \
+            {key: value for key, value in expected.items() if key is not None}
+    with pytest.raises(ValueError):
+        parser.feed(b"")
+
+    # Rows are given back as soon as they are complete.
+    parser = FlightDataParser()
+    assert parser.feed('1:HL["/a.css","style"]\n2:T') == [
+        HintPreload(value=["/a.css", "style"], value_class="HL", index=1),
+    ]
+    assert parser.feed("b,hello") == []
+    assert parser.feed(" world3:HL") == [Text(value="hello world", value_class="T", index=2)]
+    assert parser.feed('["/b.css","style"]\n') == []
+    assert parser.close() == [HintPreload(value=["/b.css", "style"], value_class="HL", index=3)]
+    parser = FlightDataParser()
+    assert parser.feed_segment([0]) == []
+    assert parser.feed_segment([3, "MTpUMyxow6k="]) == [Text(value="hé", value_class="T", index=1)]
+
+def test_get_flight_data_from_rsc():
+    decoded = decode_raw_flight_data(get_raw_flight_data(value=mintstars_com_html))
+    rsc = "".join(decoded)
+    assert get_flight_data_from_rsc(rsc) == parse_decoded_raw_flight_data(decoded)
+    assert get_flight_data_from_rsc(rsc.encode()) == get_flight_data(value=mintstars_com_html)
+    assert get_flight_data_from_rsc(b"") == {}
+
+def test_decode_to_buffer():
+    for html in (nextjs_org_html, mintstars_com_html):
+        raw = get_raw_flight_data(value=html)
+        buffer = _decode_to_buffer(raw)
+        assert buffer == "".join(decode_raw_flight_data(raw)).encode()
+        assert parse_decoded_raw_flight_data(buffer) == parse_decoded_raw_flight_data(decode_raw_flight_data(raw))
+    # A character can be split between two binary segments.
+    raw = [[0], [3, "MTpUMyxo"], [3, "ww=="], [3, "qQ=="]]
+    assert _decode_to_buffer(raw) == "1:T3,hé".encode()
+    assert parse_decoded_raw_flight_data(_decode_to_buffer(raw)) == \
+        {1: Text(value="hé", value_class="T", index=1)}
+    with pytest.raises(UnicodeDecodeError):
+        decode_raw_flight_data(raw)
+    # (The buffer is sized from the segments, even if their base64 has spaces.)
+    raw = [[0], [1, "1:T2,"], [3, "aMOp\n"], [1, "2:\"é\"\n"]]
+    assert _decode_to_buffer(raw) == '1:T2,hé2:"é"\n'.encode()
+    raw = [[0], [1, "1:T5,"], [3, "aGVsbG8 =="], [1, "2:\"é\"\n"]]
+    assert _decode_to_buffer(raw) == '1:T5,hello2:"é"\n'.encode()
+    page = generate(rows=300, seed=2, binary=.5, unicode=.5, chunk_size=64)
+    raw = get_raw_flight_data(value=page.html)
+    assert _decode_to_buffer(raw) == page.flight_data.encode()
+
+def test_get_raw_flight_data_scan():
+    for html in (nextjs_org_html, mintstars_com_html, club_fans_html, swag_live_html, x_com_html, m_soundcloud_com_html):
+        assert get_raw_flight_data(value=html, backend="scan") == get_raw_flight_data(value=html)
+        assert get_flight_data(value=html.decode(), backend="scan") == get_flight_data(value=html)
+    with pytest.raises(ValueError):
+        get_raw_flight_data(value=nextjs_org_html, backend="dom")
+    with pytest.raises(TypeError):
+        get_raw_flight_data(value=make_tree(value=nextjs_org_html), backend="scan")
+
+def test_get_flight_data_file(tmp_path):
+    path = tmp_path / "page.html"
+    for html in (nextjs_org_html, mintstars_com_html, x_com_html):
+        path.write_bytes(html)
+        expected = get_flight_data(value=html)
+        assert get_raw_flight_data(value=path) == get_raw_flight_data(value=html)
+        assert get_flight_data(value=path) == get_flight_data(value=path, backend="lxml") == expected
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert get_flight_data(value=mapped) == expected
+            assert get_flight_data(value=mapped, backend="lxml", lazy=True) == expected
+            assert make_tree(value=mapped).xpath("//script/text()") == \
+                make_tree(value=html).xpath("//script/text()")
+    with pytest.raises(ValueError):
+        get_flight_data(value=path, backend="dom")
+    path.write_bytes(b"")
+    assert get_flight_data(value=path) is None
+    assert make_tree(value=path) is None
+
+def test_LazyFD():
+    for html in (nextjs_org_html, mintstars_com_html):
+        fd = get_flight_data(value=html, lazy=True)
+        assert isinstance(fd, LazyFD)
+        assert len(fd._resolved) == 0
+        assert isinstance(fd[0], RSCPayload)
+        assert fd[0] is fd[0]
+        assert len(fd._resolved) == 1
+        assert list(fd) == list(get_flight_data(value=html))
+        assert fd == get_flight_data(value=html)
+    assert get_flight_data(value=x_com_html, lazy=True) is None
+    assert len(get_flight_data_from_rsc(b'0:{"b":"x"}\n', lazy=True)) == 1
+
+def test_encode_flight_data():
+    import pickle
+    rsc = b'0:{"b":"x"}\n:HL["/a.css","style"]\n:["$","div",null,{}]\n1:T3,a\nbb:I[1,["2","c.js"],"d"]\n'
+    fd = get_flight_data_from_rsc(rsc)
+    assert _encode_flight_data(fd) == rsc
+    for flight_data in (fd, get_flight_data_from_rsc(rsc, lazy=True)):
+        assert dict(LazyFD(_encode_flight_data(flight_data))) == fd
+        loaded = pickle.loads(pickle.dumps(flight_data))
+        assert type(loaded) is type(flight_data) and loaded == fd
+    # Only the indexed rows are kept.
+    lazy = get_flight_data_from_rsc(rsc, lazy=True, only=[Module])
+    assert list(pickle.loads(pickle.dumps(lazy))) == [0xb]
+    for html in (nextjs_org_html, mintstars_com_html):
+        fd = get_flight_data(value=html)
+        assert LazyFD(_encode_flight_data(fd)) == fd
+    # Elements that their row would not make back.
+    for wrong in (
+        {1: Text(value="a", value_class="T", index=2)},
+        {1: Module(value=[1, ["2", "c.js"], "d"], value_class="I", index=1), 2: HintPreload(value=["/a.css", "style"], value_class="I", index=2)},
+        {1: Element(value=[1], value_class="x", index=1)},
+        {-1: Element(value=[1], value_class=None, index=-1)},
+    ):
+        assert _encode_flight_data(wrong) is None
+
+def test_FlightRowTable():
+    decoded = decode_raw_flight_data(get_raw_flight_data(value=nextjs_org_html))
+    expected = parse_decoded_raw_flight_data(decoded)
+    table = FlightRowTable.from_decoded(decoded)
+    assert len(table) == len(expected)
+    assert list(table) == _tokenize(table.buffer)
+    assert table.materialize() == expected
+    assert table.filter().materialize() == expected
+    modules = table.filter(tags=["I"])
+    assert modules.buffer is table.buffer
+    assert modules.materialize() == \
+        {key: value for key, value in expected.items() if isinstance(value, Module)}
+    assert table.filter(only=[Module]).materialize() == modules.materialize()
+    large = table.filter(tags=["I", "HL", None], min_length=100, max_length=1000)
+    assert 0 < len(large) < len(table)
+    assert all(100 <= length <= 1000 for length in large.lengths)
+    assert all(table.tag_names[tag] in ("I", "HL", None) for tag in large.tags)
+    assert table.filter(tags=["X"]).materialize() == {}
+    assert list(table.select(index % 2 == 0 for index in range(len(table)))) == list(table)[::2]
+    table = FlightRowTable(b'1:HL["/a.css","style"]\n:{"a":1}\n')
+    assert list(table.indexes) == [1, -1]
+    assert list(table) == [(1, "HL", 4, 22), (None, None, 24, 31)]
+
+def test_get_flight_data_only():
+    full = get_flight_data(value=nextjs_org_html)
+    only = get_flight_data(value=nextjs_org_html, only=[Module, "HintPreload"])
+    assert only == {
+        key: value for key, value in full.items()
+        if isinstance(value, (Module, HintPreload))
+    }
+    assert get_flight_data(value=nextjs_org_html, only=[Element]) == full
+    assert get_flight_data(value=nextjs_org_html, only=[Module], lazy=True) == \
+        {key: value for key, value in full.items() if isinstance(value, Module)}
+    assert 0 in get_flight_data(value=nextjs_org_html, only=[RSCPayload])
+    with pytest.raises(KeyError):
+        get_flight_data(value=nextjs_org_html, only=["Modul"])
+
+def test_get_flight_data_validate():
+    expected = get_flight_data(value=nextjs_org_html)
+    for validate in ("off", "fast", "strict"):
+        assert get_flight_data(value=nextjs_org_html, validate=validate) == expected
+    assert get_flight_data(value=nextjs_org_html, validate="strict", lazy=True) == expected
+    rsc = b'1:HL["/a.css",1]\n'
+    assert get_flight_data_from_rsc(rsc, validate="off")[1].type_name == 1
+    with pytest.raises(AssertionError):
+        get_flight_data_from_rsc(rsc, validate="fast")
+
+def _split_rows(buffer: bytes) -> list[tuple]:
+    "How the rows were split before `_tokenize`, to compare with it."
+    rows, pos = [], 0
+    while (index_string_end := buffer.find(b":", pos)) != -1:
+        index = int(buffer[pos:index_string_end], 16) if buffer[pos:index_string_end] else None
+        pos = re.compile(rb"[A-Z]*").match(buffer, index_string_end + 1).end()
+        value_class = buffer[index_string_end + 1:pos].decode() or None
+        if value_class == "T":
+            if (text_length_string_end := buffer.find(b",", pos)) == -1:
+                break
+            start = text_length_string_end + 1
+            end = pos = start + int(buffer[pos:text_length_string_end], 16)
+            rows.append((index, value_class, start, end))
+        elif match := re.compile(rb"(?<!\\)\n[a-f0-9]*:").search(buffer, pos):
+            rows.append((index, value_class, pos, match.start()))
+            pos = match.start() + 1
+        else:
+            rows.append((index, value_class, pos, len(buffer) - 1 if buffer.endswith(b"\n") else len(buffer)))
+            break
+    return rows
+
+def test_tokenize():
+    rng = random.Random(0)
+    buffers = [
+        "".join(decode_raw_flight_data(get_raw_flight_data(value=html))).encode()
+        for html in (nextjs_org_html, mintstars_com_html, club_fans_html, swag_live_html)
+    ]
+    buffers += [generate(rows=200, seed=seed, unicode=.3).flight_data.encode() for seed in range(10)]
+    for buffer in buffers:
+        rows = _tokenize(buffer)
+        assert rows == _split_rows(buffer)
+        # Any part of the data is split the same way, wherever it is cut.
+        row_starts = [0] + [end + (value_class != "T") for _, value_class, _, end in rows]
+        for _ in range(20):
+            start = rng.choice(row_starts)
+            part = buffer[start:rng.randrange(start, len(buffer) + 1)]
+            assert _tokenize(part) == _split_rows(part)
+        # And the same elements come out of it, however it is streamed.
+        expected = get_flight_data_from_rsc(buffer)
+        parser, elements, pos = FlightDataParser(), [], 0
+        while pos < len(buffer):
+            chunk_size = rng.choice((1, 2, 5, 64, 4096))
+            elements += parser.feed(buffer[pos:pos + chunk_size])
+            pos += chunk_size
+        elements += parser.close()
+        assert elements == [element for elements in expected.values() for element in (
+            elements if isinstance(elements, list) else [elements]
+        )]
+
+    # Newlines in strings (that would be escaped by JSON) don't end the row.
+    assert _tokenize(b'1:["a\n2:b\\\\"]\n3:"\n4:"\n') == [(1, None, 2, 13), (3, None, 16, 21)]
+    assert _scan_rows(b'1:["a\n2:', final=False) == ([], 0, (8, True))
+    assert _scan_rows(b'1:["a\n2:b"]\n3:null', final=False, resume=(8, True)) == \
+        ([(1, None, 2, 11)], 12, (18, False))
+    parser = FlightDataParser()
+    assert parser.feed(b'1:["a\\') == []
+    assert parser.feed(b'"\\n2:b"]\n') == []
+    assert [element.index for element in parser.feed(b"2:null")] == [1]
+    assert [element.index for element in parser.close()] == [2]
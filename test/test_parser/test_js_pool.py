@@ -0,0 +1,66 @@
+from njsparser.parser.js_pool import JSWorkerPool, JSEvaluationError, _plain
+from njsparser.parser.manifests import parse_buildmanifest
+import importlib.util
+import pickle
+import pytest
+import sys
+
+from .. import *
+
+needs_pythonmonkey = pytest.mark.skipif(
+    importlib.util.find_spec("pythonmonkey") is None, reason="pythonmonkey is not installed."
+)
+
+class _StringProxy(str):
+    "Like the strings of pythonmonkey, which pickle refuses."
+_StringProxy.__qualname__ = "str"
+
+class _Float(float):
+    pass
+
+def test_plain():
+    null = object()
+    value = _plain({_StringProxy("a"): [_StringProxy("b"), null, _Float(1.5), True, (2,)]}, null)
+    assert value == {"a": ["b", None, 1.5, True, [2]]}
+    assert [type(item) for item in value["a"]] == [str, type(None), float, bool, list]
+    assert type(next(iter(value))) is str
+    assert pickle.loads(pickle.dumps(value)) == value
+
+@needs_pythonmonkey
+def test_js_worker_pool():
+    with JSWorkerPool(timeout=1, max_evaluations=2) as pool:
+        assert pool.evaluate("({a: [1, 'b', null]})") == {"a": [1, "b", None]}
+        pid = pool._idle.queue[0].process.pid
+        with pytest.raises(JSEvaluationError):
+            pool.evaluate("throw new Error('a')")
+        # (Replaced after 2 evaluations.)
+        assert pool._idle.queue[0].process.pid != pid
+        pid = pool._idle.queue[0].process.pid
+        with pytest.raises(TimeoutError):
+            pool.evaluate("while (true) {}")
+        assert pool._idle.queue[0].process.pid != pid
+        assert pool.evaluate("1 + 1", timeout=5) == 2
+        assert type(pool.evaluate("'a' + 'b'")) is str
+    with pytest.raises(ValueError):
+        pool.evaluate("1")
+
+@needs_pythonmonkey
+def test_parse_buildmanifest_pool():
+    with JSWorkerPool(timeout=1) as pool:
+        assert parse_buildmanifest(
+            nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest,
+            backend="pythonmonkey",
+            pool=pool,
+        ) == parse_buildmanifest(nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest)
+        assert parse_buildmanifest("self.__BUILD_MANIFEST={a:[1][0]}", pool=pool) == {"a": 1}
+        assert parse_buildmanifest("self.__BUILD_MANIFEST=function(){for(;;);}()", pool=pool) is None
+
+@needs_pythonmonkey
+@pytest.mark.skipif(sys.platform == "win32", reason="`memory_limit` is only supported on unix.")
+def test_js_worker_pool_memory_limit():
+    with JSWorkerPool(timeout=60, memory_limit=4 << 30) as pool:
+        assert pool.evaluate("1 + 1") == 2
+        # (Stopped by the limit, rather than running until the timeout.)
+        with pytest.raises(JSEvaluationError):
+            pool.evaluate("const a = []; for (;;) a.push(new Array(1e6).fill(1.5))")
+        assert pool.evaluate("2 + 2") == 4
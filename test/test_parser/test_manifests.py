@@ -1,8 +1,12 @@
-from njsparser.parser.manifests import parse_buildmanifest, get_build_manifest_path
+from njsparser.parser.manifests import parse_buildmanifest, get_build_manifest_path, ManifestCache
 from njsparser.tools import find_build_id
 import pytest
+import sys
 
 from .. import *
+from ..src import d
+
+_build_manifests = sorted(d.glob("*_buildManifest.js"))
 
 def test_parse_buildmanifest():
     assert parse_buildmanifest(nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest) is not None
@@ -16,5 +20,106 @@ def test_parse_buildmanifest():
     with pytest.raises(ValueError):
         parse_buildmanifest("dfsfdn")
 
+@pytest.mark.parametrize("path", _build_manifests, ids=lambda path: path.name)
+def test_parse_buildmanifest_python(path):
+    script = path.read_text()
+    manifest = parse_buildmanifest(script, backend="python")
+    assert {"/_app", "/_error"} <= set(manifest["sortedPages"])
+    pytest.importorskip("pythonmonkey")
+    assert manifest == parse_buildmanifest(script, backend="pythonmonkey")
+
+def test_parse_buildmanifest_js():
+    assert parse_buildmanifest(
+        "self.__BUILD_MANIFEST=function(e,s){return{a:[e,,s+\"/x\"+1,!0,!1,-2.5],'b\\u002Fc':{0:void 0,\"d\":null}}}(void 0,'\\x2F')"
+        ";self.__BUILD_MANIFEST_CB&&self.__BUILD_MANIFEST_CB();",
+        backend="python",
+    ) == {"a": [None, None, "//x1", True, False, -2.5], "b/c": {"0": None, "d": None}}
+    # (Some other JS.)
+    assert parse_buildmanifest("self.__BUILD_MANIFEST={a:[1][0]}", backend="python") is None
+    assert parse_buildmanifest("self.__BUILD_MANIFEST={};alert(1)", backend="python") is None
+    with pytest.raises(ValueError):
+        parse_buildmanifest("self.__BUILD_MANIFEST={}", backend="v8")
+
+def test_parse_buildmanifest_budget(caplog):
+    fan = "function(f){return function(x){return " + "+".join(["f(x)"] * 10) + "}}"
+    for script, reason in [
+        ("[" * 100_000 + "]" * 100_000, "nested"),
+        ("function(f){return f(f)}(function(g){return g(g)})", "nested"),
+        ("function(f){return f(f(f(f(f('abcd')))))}(function(s){return " + "+".join(["s"] * 16) + "})", "characters"),
+        ("function(g){return g(g(g(g(g(g(g(function(x){return x})))))))(1)}(" + fan + ")", "steps"),
+    ]:
+        caplog.clear()
+        assert parse_buildmanifest("self.__BUILD_MANIFEST=" + script, backend="python") is None
+        assert reason in caplog.text
+
+def test_parse_buildmanifest_over_limit(monkeypatch):
+    evaluated = []
+    class pythonmonkey:
+        null = None
+        class SpiderMonkeyError(Exception):
+            pass
+        @staticmethod
+        def eval(script):
+            evaluated.append(script)
+            return {"a": 1}
+    class Pool:
+        def evaluate(self, script):
+            evaluated.append(script)
+            return {"b": 1}
+    monkeypatch.setitem(sys.modules, "pythonmonkey", pythonmonkey)
+    deep = "self.__BUILD_MANIFEST=" + "[" * 1000 + "]" * 1000
+    # (Not evaluated by SpiderMonkey in the current process, without limits.)
+    assert parse_buildmanifest(deep) is None
+    assert evaluated == []
+    assert parse_buildmanifest(deep, pool=Pool()) == {"b": 1}
+    assert len(evaluated) == 1
+    # (The other unsupported scripts still are.)
+    assert parse_buildmanifest("self.__BUILD_MANIFEST={a:[1][0]}") == {"a": 1}
+    assert len(evaluated) == 2
+
 def test_get_build_manifest_path():
-    assert get_build_manifest_path(build_id=find_build_id(m_soundcloud_com_html)) == "/_next/static/1733156665/_buildManifest.js"
\ No newline at end of file
+    assert get_build_manifest_path(build_id=find_build_id(m_soundcloud_com_html)) == "/_next/static/1733156665/_buildManifest.js"
+
+def test_manifest_cache(tmp_path):
+    urls = []
+    def get(url):
+        urls.append(url)
+        return nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest
+    cache = ManifestCache(tmp_path, maxsize=1)
+    manifest = cache.fetch("https://nextjs.org/", "4mSOwJptzzPemGzzI8AOo", get=get)
+    assert urls == ["https://nextjs.org/_next/static/4mSOwJptzzPemGzzI8AOo/_buildManifest.js"]
+    assert manifest == parse_buildmanifest(nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest)
+    assert cache.fetch("https://nextjs.org", "4mSOwJptzzPemGzzI8AOo", get=get) is manifest
+    cache.fetch("https://nextjs.org", "4mSOwJptzzPemGzzI8AOo", base_path="/docs", get=get)
+    assert urls[1:] == ["https://nextjs.org/docs/_next/static/4mSOwJptzzPemGzzI8AOo/_buildManifest.js"]
+    assert len(urls) == 2
+    # (Read again from the directory, by another cache.)
+    assert ManifestCache(tmp_path).get("https://nextjs.org", "4mSOwJptzzPemGzzI8AOo") == manifest
+    assert ManifestCache(tmp_path).get("https://nextjs.org", "other") is None
+    cache = ManifestCache(maxsize=1)
+    cache.set("https://a.com", "1", {"a": 1})
+    cache.set("https://b.com", "1", {"b": 1})
+    assert cache.get("https://a.com", "1") is None
+    assert cache.get("https://b.com", "1") == {"b": 1}
+    assert cache.fetch("https://a.com", "1", get=lambda url: "self.__BUILD_MANIFEST=a") is None
+    # (An empty manifest isn't kept, so it is fetched again.)
+    assert cache.fetch("https://c.com", "1", get=lambda url: "self.__BUILD_MANIFEST={}") == {}
+    assert cache.get("https://c.com", "1") is None
+    with pytest.raises(ValueError):
+        cache.set("https://c.com", "1", {})
+    with pytest.raises(ValueError):
+        cache.set("https://c.com", "1", [1])
+
+def test_manifest_cache_pythonmonkey(tmp_path):
+    pythonmonkey = pytest.importorskip("pythonmonkey")
+    cache = ManifestCache(tmp_path)
+    cache.set("https://a.com", "1", pythonmonkey.eval("({a: ['b', null, 1.5], c: {d: 'e'}})"))
+    assert ManifestCache(tmp_path).get("https://a.com", "1") == {"a": ["b", None, 1.5], "c": {"d": "e"}}
+    manifest = cache.fetch(
+        "https://nextjs.org",
+        "4mSOwJptzzPemGzzI8AOo",
+        get=lambda url: nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest,
+        backend="pythonmonkey",
+    )
+    assert type(manifest) is dict and manifest == parse_buildmanifest(nextjs_org_4mSOwJptzzPemGzzI8AOo_buildManifest)
+    assert ManifestCache(tmp_path).get("https://nextjs.org", "4mSOwJptzzPemGzzI8AOo") == manifest
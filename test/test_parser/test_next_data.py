@@ -1,8 +1,27 @@
 from njsparser.parser.next_data import get_next_data
+import mmap
+import pytest
 
 from .. import *
 
 def test_find_nextdata():
     assert get_next_data(value=m_soundcloud_com_html) is not None
     assert get_next_data(value=x_com_html) is None
-    assert get_next_data(value=nextjs_org_html) is None
\ No newline at end of file
+    assert get_next_data(value=nextjs_org_html) is None
+
+def test_find_nextdata_scan():
+    for html in (m_soundcloud_com_html, x_com_html, nextjs_org_html, club_fans_html):
+        assert get_next_data(value=html, backend="scan") == get_next_data(value=html)
+        assert get_next_data(value=html.decode(), backend="scan") == get_next_data(value=html)
+    with pytest.raises(ValueError):
+        get_next_data(value=m_soundcloud_com_html, backend="dom")
+
+def test_find_nextdata_file(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_bytes(m_soundcloud_com_html)
+    expected = get_next_data(value=m_soundcloud_com_html)
+    assert get_next_data(value=path) == get_next_data(value=path, backend="lxml") == expected
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert get_next_data(value=mapped) == get_next_data(value=mapped, backend="lxml") == expected
+    path.write_bytes(b"")
+    assert get_next_data(value=path) is None
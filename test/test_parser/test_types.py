@@ -6,7 +6,7 @@ import orjson
 import pytest
 
 def test_Element():
-    with pytest.raises(ValueError):
+    with pytest.raises(TypeError):
         Element(value="")
     Element(value="", value_class="", index=1)
 
@@ -14,6 +14,8 @@ def test_Element():
     f = Element(value="hi", value_class=None, index=1)
     with pytest.raises(FrozenInstanceError):
         f.value = "hello"
+    assert hasattr(f, "__dict__") is False
+    assert hasattr(HintPreload(**_flightHintPreloadPayload_1), "__dict__") is False
 
 _flightHintPreloadPayload_1 = dict(
     value=[
@@ -33,8 +35,11 @@ _flightHintPreloadPayload_2 = dict(
     index=1,
 )
 def test_HintPreload():
-    with pytest.raises(ValidationError):
+    with pytest.raises(TypeError):
         HintPreload(value=["hello"])
+    # (The class of the rows, on the class as on its elements.)
+    assert HintPreload.value_class == "HL" and Module.value_class == "I" and Data.value_class is None
+    assert HintPreload(**_flightHintPreloadPayload_2).value_class == "HL"
     hl1 = HintPreload(**_flightHintPreloadPayload_1)
     assert hl1.href == href1
     assert hl1.type_name == type_name1
@@ -96,6 +101,38 @@ _flightTextPayload = dict(value=(hw := "hello world"), value_class="T", index=1)
 def test_Text():
     t = Text(**_flightTextPayload)
     assert t.value == t.text == hw
+    assert t.raw == hw.encode() and t.size == len(hw.encode())
+
+def test_Text_lazy(monkeypatch):
+    from njsparser.parser import types
+    from njsparser.parser.flight_data import get_flight_data_from_rsc, FlightDataParser
+    from njsparser.stats import ParseStats, _collect
+    rsc = "1:T6,héllo2:T2,hi".encode()
+    monkeypatch.setattr(types, "LAZY_TEXT_SIZE", 5)
+    for lazy in (
+        get_flight_data_from_rsc(rsc)[1],
+        get_flight_data_from_rsc(rsc, lazy=True)[1],
+        FlightDataParser().feed(rsc)[0],
+    ):
+        assert lazy._raw is not None and types._value_slot.__get__(lazy) is None
+        assert lazy.size == 6 and lazy.raw == "héllo".encode()
+        assert types._value_slot.__get__(lazy) is None
+        assert lazy == Text(value="héllo", value_class="T", index=1)
+        assert lazy.text == lazy.value == "héllo"
+    with _collect(ParseStats()):
+        assert get_flight_data_from_rsc(rsc)[1]._raw is not None
+    # Small texts are decoded right away.
+    assert types._value_slot.__get__(get_flight_data_from_rsc(rsc)[2]) == "hi"
+    # So are the texts validated strictly (an invalid one raises while parsing).
+    strict = get_flight_data_from_rsc(rsc, validate="strict")[1]
+    assert strict._raw is None and types._value_slot.__get__(strict) == "héllo"
+    with pytest.raises(UnicodeDecodeError):
+        get_flight_data_from_rsc(b"1:T5,h\xffllo", validate="strict")
+    assert get_flight_data_from_rsc(b"1:T5,h\xffllo")[1]._raw is not None
+    with pytest.raises(FrozenInstanceError):
+        lazy.value = "x"
+    monkeypatch.setattr(types, "LAZY_TEXT_SIZE", None)
+    assert get_flight_data_from_rsc(rsc)[1]._raw is None
 
 _flightDataPayload_1 = dict(value=["$", "$L1", None, None], value_class=None, index=1)
 _flightDataPayload_2 = dict(value=["$", "$L1", None, {}], value_class=None, index=1)
@@ -237,4 +274,70 @@ def test_resolve_type():
             value_class=None,
             index=None,
             cls="WONTEXISTSTS",
-        )
\ No newline at end of file
+        )
+    # Unknown classes give `Element`, and elements are kept as they are.
+    assert type(unknown := resolve_type(value=1, value_class="ZZ", index=1)) is Element
+    assert resolve_type(value=unknown, value_class=None, index=None) is unknown
+    # Dumped elements nested in other dumped elements are loaded back too.
+    parent = resolve_type(value=["$", "$L1", None, {"children": ["$", "div", None, {}]}], value_class=None, index=3)
+    loaded = resolve_type(**orjson.loads(orjson.dumps(parent, default=default)))
+    assert type(loaded) is DataParent
+    assert type(loaded.children) is HTMLElement
+    assert loaded == parent
+
+def test_validate_element():
+    hl = HintPreload(**_flightHintPreloadPayload_1)
+    assert validate_element(hl) is hl
+    validate_element(resolve_type(**_flightDataContainerPayload))
+    with pytest.raises(ValidationError):
+        validate_element(Text(value="hi", value_class="T", index="1"))
+    with pytest.raises(ValidationError):
+        validate_element(Data(value=["$", "$L1", None, None], value_class=None, index=True))
+
+def test_validation():
+    wrong_hl = dict(value=["/a.css", 1], value_class="HL", index=1)
+    HintPreload(**wrong_hl, validate="off")
+    with pytest.raises(AssertionError):
+        HintPreload(**wrong_hl)
+    with pytest.raises(AssertionError):
+        resolve_type(**wrong_hl, validate="fast")
+    with pytest.raises(ValidationError):
+        resolve_type(**_flightDataPayload_1 | {"index": True}, validate="strict")
+    resolve_type(**_flightDataPayload_1 | {"index": True}, validate="fast")
+    with pytest.raises(ValueError):
+        resolve_type(**_flightDataPayload_1, validate="always")
+    # The validation is given to the elements nested in containers and parents.
+    wrong_container = dict(value=[["$", "div", None, "attrs"]], value_class=None, index=1)
+    assert isinstance(DataContainer(**wrong_container, validate="off").value[0], HTMLElement)
+    with pytest.raises(AssertionError):
+        DataContainer(**wrong_container)
+    wrong_parent = lambda: dict(value=["$", "$L1", None, {"children": ["$", "div", None, "attrs"]}], value_class=None, index=1)
+    DataParent(**wrong_parent(), validate="off")
+    with pytest.raises(AssertionError):
+        DataParent(**wrong_parent(), validate="fast")
+
+def test_pickle(monkeypatch):
+    import pickle
+    from njsparser.parser import types
+    elements = [
+        HintPreload(**_flightHintPreloadPayload_1),
+        Text(**_flightTextPayload),
+        DataContainer(**_flightDataContainerPayload),
+        DataParent(**_flightDataParentPayload),
+        URLQuery(**_flightURLQuery),
+        Element(value={"a": 1}, value_class="X", index=3),
+    ]
+    for element in elements:
+        assert element.__reduce_ex__(5)[0] is types._unpickle_element
+        loaded = pickle.loads(pickle.dumps(element))
+        assert type(loaded) is type(element) and loaded == element
+    assert type(pickle.loads(pickle.dumps(elements[3])).children) is Data
+    # Elements that would not be made back the same are pickled with their fields.
+    mixed = DataContainer(value=[HintPreload(**_flightHintPreloadPayload_1)], value_class=None)
+    for element in (mixed, Text(value="hi", value_class=None), Element(value={1: 2}, value_class=None)):
+        assert element.__reduce_ex__(5)[0] is not types._unpickle_element
+        assert pickle.loads(pickle.dumps(element)) == element
+    # Large texts stay lazy.
+    monkeypatch.setattr(types, "LAZY_TEXT_SIZE", 5)
+    loaded = pickle.loads(pickle.dumps(Text(value="héllo", value_class="T", index=1)))
+    assert loaded._raw == "héllo".encode() and loaded.value == "héllo"
@@ -0,0 +1,57 @@
+from njsparser.stats import ParseStats
+from njsparser.parser.flight_data import get_flight_data
+from njsparser.tools import BeautifulFD, find_build_id
+import orjson
+
+from . import *
+
+_unknown_class_html = (
+    '<script>(self.__next_f=self.__next_f||[]).push([0])</script>'
+    '<script>self.__next_f.push([1,"0:{\\"b\\":\\"abc\\"}\\n1:Z[1]\\n2:[\\"$\\",\\"$L1\\",null,{}]\\n"])</script>'
+)
+
+def test_ParseStats():
+    stats = ParseStats()
+    fd = BeautifulFD(nextjs_org_html, stats=stats)
+    assert stats.bytes_in == len(nextjs_org_html)
+    assert 0 < stats.bytes_out < stats.bytes_in
+    assert sum(stats.rows.values()) == len(fd)
+    assert stats.rows["Module"] == len(fd.find_all(["Module"], recursive=False))
+    assert stats.largest_row_index == 0
+    assert stats.fallbacks == 0
+    assert {"make_tree", "scripts", "raw_flight_data", "decode", "split", "json", "resolve"} <= set(stats.timings)
+    assert all(duration >= 0 for duration in stats.timings.values())
+    assert orjson.loads(orjson.dumps(stats.as_dict())) == stats.as_dict()
+    # Stats add up between calls.
+    assert find_build_id(nextjs_org_html, stats=stats) == "4mSOwJptzzPemGzzI8AOo"
+    assert stats.bytes_in == 2 * len(nextjs_org_html)
+    stats = ParseStats()
+    get_flight_data(_unknown_class_html, backend="scan", stats=stats)
+    assert stats.fallbacks == 1
+    assert stats.rows == {"RSCPayload": 1, "Element": 1, "Data": 1}
+    assert "make_tree" not in stats.timings
+
+def test_warnings(caplog, monkeypatch):
+    html = (
+        '<script>(self.__next_f=self.__next_f||[]).push([0])</script>'
+        '<script>self.__next_f.push([1,"0:{\\"b\\":\\"abc\\"}\\n'
+        + "".join(f'{index:x}:WARNTEST[{index}]\\n' for index in range(1, 6))
+        + '"])</script>'
+    )
+    with caplog.at_level("WARNING", logger="njsparser"):
+        get_flight_data(html)
+    assert len([record for record in caplog.records if "WARNTEST" in record.message]) == 5
+    caplog.clear()
+    monkeypatch.setattr("njsparser.stats.WARNING_INTERVAL", 60.)
+    stats = ParseStats()
+    with caplog.at_level("WARNING", logger="njsparser"):
+        get_flight_data(html, stats=stats)
+        get_flight_data(html)
+    # Only the first one is logged, the others are only counted.
+    assert len([record for record in caplog.records if "WARNTEST" in record.message]) == 1
+    assert stats.fallbacks == 5
+    assert stats.unknown_classes == {"WARNTEST": 5}
+    assert stats.unknown_samples == {"WARNTEST": "[1]"}
+    stats = ParseStats()
+    assert find_build_id('<script id="__NEXT_DATA__">{"props": {}}</script>', stats=stats) is None
+    assert stats.warnings == {"next_data_without_build_id": 1}
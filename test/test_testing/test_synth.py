@@ -0,0 +1,35 @@
+from njsparser.testing.synth import generate
+from njsparser.parser.flight_data import get_flight_data, get_flight_data_from_rsc
+from njsparser.parser.next_data import get_next_data
+from njsparser.parser.types import Text, RSCPayload, Data
+from njsparser.tools import find_build_id
+import pytest
+
+def test_generate():
+    assert generate(rows=20, seed=1) == generate(rows=20, seed=1)
+    assert generate(rows=20, seed=1) != generate(rows=20, seed=2)
+    page = generate(rows=300, seed=1, binary=.3, unicode=.5, depth=5, next_data_size=1000)
+    assert len(page.classes) == 301
+    assert page.classes[0] is RSCPayload
+    for flight_data in (
+        get_flight_data(page.html),
+        get_flight_data(page.html.encode(), backend="scan"),
+        get_flight_data_from_rsc(page.flight_data),
+    ):
+        assert {index: type(element) for index, element in flight_data.items()} == page.classes
+    assert find_build_id(page.html) == page.build_id
+    assert get_next_data(page.html) == page.next_data
+    assert generate(rows=10, seed=1).next_data is None
+
+def test_generate_options():
+    page = generate(rows=50, seed=1, mix={"Text": 1, Data: 1}, chunk_size=7, unicode=1)
+    assert set(page.classes.values()) == {RSCPayload, Text, Data}
+    flight_data = get_flight_data(page.html)
+    assert all(type(flight_data[index]) is cls for index, cls in page.classes.items())
+    assert any(ord(char) > 0x7f for char in page.flight_data)
+    page = generate(rows=None, size=100_000, seed=1)
+    assert 100_000 <= len(page.html) < 150_000
+    with pytest.raises(ValueError):
+        generate(mix={"RSCPayload": 1})
+    with pytest.raises(ValueError):
+        generate(rows=None, size=None)
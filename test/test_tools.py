@@ -7,9 +7,11 @@ from njsparser.tools import (
     resolve_type,
 )
 from njsparser.parser.types import *
+from njsparser.parser.types import _get_classes
 from dataclasses import is_dataclass
 
 import pytest
+import mmap
 
 from . import *
 
@@ -18,6 +20,21 @@ def test_has_nextjs():
     assert has_nextjs(value=nextjs_org_html) is True
     assert has_nextjs(value=x_com_html) is False
 
+def test_has_nextjs_parses_once(monkeypatch):
+    from njsparser import utils
+    from njsparser.parser import next_data
+    trees = []
+    make_tree = utils.make_tree
+    def counted(*args, **kwargs):
+        trees.append(None)
+        return make_tree(*args, **kwargs)
+    for module in (utils, next_data):
+        monkeypatch.setattr(module, "make_tree", counted)
+    for html in (nextjs_org_html, x_com_html):
+        trees.clear()
+        has_nextjs(value=html)
+        assert len(trees) == 1
+
 # `finditer_in_flight_data` ignored since findall_in_flight_data is literally
 # a list transformer of it.
 
@@ -53,6 +70,38 @@ def test_find_build_id():
     # Recursive search here
     assert find_build_id(value=club_fans_html) == "n2xbxZXkzoS6U5w7CgB-T"
 
+def test_find_build_id_file(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_bytes(nextjs_org_html)
+    assert find_build_id(value=path) == "4mSOwJptzzPemGzzI8AOo"
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert find_build_id(value=mapped) == "4mSOwJptzzPemGzzI8AOo"
+
+def test_find_build_id_parses_once(monkeypatch):
+    from njsparser import Page, get_flight_data
+    from njsparser.parser import flight_data
+    modules = get_flight_data(nextjs_org_html, only=[Module])
+    parses = []
+    parse_rows = flight_data._parse_rows
+    def counted(*args, **kwargs):
+        parses.append(None)
+        return parse_rows(*args, **kwargs)
+    monkeypatch.setattr(flight_data, "_parse_rows", counted)
+    page = Page(nextjs_org_html)
+    # (The build id of this page is in its flight data.)
+    assert find_build_id(value=page) == "4mSOwJptzzPemGzzI8AOo"
+    assert BeautifulFD(page, only=[Module]).find([Module]) is not None
+    assert get_flight_data(page, only=["Module"], validate="fast") == modules
+    assert len(parses) == 1
+    BeautifulFD(page, only=[Module], validate="strict")
+    assert len(parses) == 2
+    # The rows parsed for `only=` are reused, but aren't enough for the build id.
+    page, parses[:] = Page(nextjs_org_html), []
+    assert get_flight_data(page, only=[Module]) is get_flight_data(page, only=["Module"])
+    assert find_build_id(value=page) == "4mSOwJptzzPemGzzI8AOo"
+    assert BeautifulFD(page).find([Module]) is not None
+    assert len(parses) == 2
+
 def test_BeautifulFD():
     with pytest.raises(TypeError):
         BeautifulFD(None)
@@ -70,4 +119,53 @@ def test_BeautifulFD():
     empty_bfd = BeautifulFD("<html></html>")
     assert bool(empty_bfd) is False
     assert len(BeautifulFD("<html></html>")) == 0
-    assert isinstance(empty_bfd.as_list(), list)
\ No newline at end of file
+    assert isinstance(empty_bfd.as_list(), list)
+
+def test_BeautifulFD_from_rsc():
+    from njsparser.parser.flight_data import get_raw_flight_data, decode_raw_flight_data
+    rsc = "".join(decode_raw_flight_data(get_raw_flight_data(value=club_fans_html))).encode()
+    fd = BeautifulFD.from_rsc(rsc)
+    assert len(fd) == len(BeautifulFD(club_fans_html))
+    assert fd.find([RSCPayload]).build_id == "n2xbxZXkzoS6U5w7CgB-T"
+    assert bool(BeautifulFD.from_rsc(b"")) is True
+
+def test_BeautifulFD_file(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_bytes(club_fans_html)
+    fd = BeautifulFD(path)
+    assert fd.find([RSCPayload]).build_id == "n2xbxZXkzoS6U5w7CgB-T"
+    assert fd.find_all() == BeautifulFD(club_fans_html).find_all()
+
+def test_BeautifulFD_lazy():
+    fd = BeautifulFD(club_fans_html, lazy=True)
+    assert fd.find([RSCPayload]).build_id == "n2xbxZXkzoS6U5w7CgB-T"
+    assert len(fd._flight_data._resolved) < len(fd)
+    assert fd.find_all() == BeautifulFD(club_fans_html).find_all()
+    for classes in ([Module], [Module, HintPreload], [HTMLElement], ["Module"]):
+        fd = BeautifulFD(nextjs_org_html, lazy=True)
+        # (Only the rows that can give the classes are resolved.)
+        assert fd.find_all(classes) == BeautifulFD(nextjs_org_html).find_all(classes)
+        rows = fd._flight_data._rows
+        value_classes = {cls._value_class for cls in _get_classes(classes)}
+        assert 0 < len(fd._flight_data._resolved) == sum(
+            1 for key, row in rows.items() if key is not None and row[0] in value_classes
+        ) < len(rows)
+
+def test_BeautifulFD_pickle():
+    import pickle
+    from njsparser.parser.flight_data import LazyFD
+    for html in (club_fans_html, nextjs_org_html):
+        fd = BeautifulFD(html)
+        loaded = pickle.loads(pickle.dumps(fd))
+        assert isinstance(loaded._flight_data, LazyFD) and len(loaded._flight_data._resolved) == 0
+        assert loaded.find_all() == fd.find_all()
+        assert pickle.loads(pickle.dumps(BeautifulFD(html, lazy=True))).find_all() == fd.find_all()
+    assert bool(pickle.loads(pickle.dumps(BeautifulFD("<html></html>")))) is False
+    # Flight data that its rows would not make back is pickled as it is.
+    fd = BeautifulFD({2: URLQuery(value=["x", "y", "d"], value_class=None, index=1)})
+    assert pickle.loads(pickle.dumps(fd))._flight_data == fd._flight_data
+
+def test_BeautifulFD_only():
+    fd = BeautifulFD(nextjs_org_html, only=[Module])
+    assert fd.find_all([Module]) == BeautifulFD(nextjs_org_html).find_all([Module])
+    assert fd.find([RSCPayload]) is None
\ No newline at end of file
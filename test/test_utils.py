@@ -12,4 +12,37 @@ def test_make_tree():
 def test_join():
     assert join("hello", "world") == "/hello/world"
     assert join("/hello///", "/world/") == "/hello/world"
-    
\ No newline at end of file
+    
+def test_Page():
+    from njsparser import (
+        Page,
+        has_nextjs,
+        find_build_id,
+        get_flight_data,
+        get_next_data,
+        get_base_path,
+        BeautifulFD,
+    )
+    from njsparser.parser.flight_data import get_raw_flight_data
+    from . import nextjs_org_html, m_soundcloud_com_html, x_com_html
+
+    with pytest.raises(TypeError):
+        Page(value=1)
+    page = Page(value=nextjs_org_html)
+    assert make_tree(value=page) is page.tree
+    assert page.scripts is page.scripts
+    assert has_nextjs(value=page) is True
+    assert find_build_id(value=page) == find_build_id(value=nextjs_org_html)
+    assert get_flight_data(value=page) is page.flight_data
+    assert get_flight_data(value=page) == get_flight_data(value=nextjs_org_html)
+    # (The raw flight data isn't kept with the buffer.)
+    assert "raw_flight_data" not in vars(page)
+    assert page.raw_flight_data == get_raw_flight_data(value=nextjs_org_html)
+    assert len(BeautifulFD(page)) == len(page.flight_data)
+    page = Page(value=m_soundcloud_com_html)
+    assert get_next_data(value=page) == get_next_data(value=m_soundcloud_com_html)
+    assert get_base_path(value=page, remove_domain=True) == ""
+    assert get_base_path(value=page) == "https://m.sndcdn.com"
+    page = Page(value=x_com_html)
+    assert has_nextjs(value=page) is False
+    assert find_build_id(value=page) is None